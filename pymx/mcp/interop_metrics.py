@@ -0,0 +1,346 @@
+# pymx/mcp/interop_metrics.py
+
+# CLR 边界调用统计 (可选开启)。
+#
+# 每次 GetProperty / GetValues / GetUnitsOfType / Create[...] 等调用都要穿越
+# Python <-> .NET 边界，这才是工具调用的主要开销。开启后：
+#   - mendix_context 中的 CurrentApp 与各服务被替换为计数代理，代理返回的
+#     .NET 对象 (untyped 根、Unit、元素、属性...) 同样被代理，因此整棵对象图
+#     上的方法调用、属性读写都会被计数并计时；
+#   - 每次 MCP 工具调用建立独立的统计 (contextvar)，边界调用归属到当前工具；
+#   - 字符串结果的工具在末尾附加统计摘要，最近的调用记录通过
+#     model://metrics/interop 资源查看。
+#
+# 关闭时恢复原始服务对象，工具包装变为直通。
+
+import contextvars
+import functools
+import time
+from collections import defaultdict, deque
+
+_PRIMITIVES = (str, int, float, bool, bytes, type(None))
+_RECENT_CALLS = 50
+_FOOTER_TOP = 6
+_OUTSIDE = "(outside tool calls)"
+
+_enabled = False
+_active_call = contextvars.ContextVar("pymx_interop_call", default=None)
+_recent = deque(maxlen=_RECENT_CALLS)
+_per_tool = {}
+_outside_metrics = None
+
+
+class CallMetrics:
+    """一次工具调用的边界调用统计：成员 -> 次数 / 累计耗时"""
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.calls = 1
+        self.started_at = time.time()
+        self.wall_seconds = 0.0
+        self.counts = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def record(self, label, elapsed):
+        self.counts[label] += 1
+        self.seconds[label] += elapsed
+
+    def merge(self, other):
+        self.calls += other.calls
+        for label, count in other.counts.items():
+            self.counts[label] += count
+            self.seconds[label] += other.seconds[label]
+        self.wall_seconds += other.wall_seconds
+
+    @property
+    def crossings(self):
+        return sum(self.counts.values())
+
+    @property
+    def interop_seconds(self):
+        return sum(self.seconds.values())
+
+    def breakdown(self):
+        """按累计耗时降序的 [(成员, 次数, 秒)]"""
+        return sorted(((label, self.counts[label], self.seconds[label]) for label in self.counts),
+                      key=lambda item: (-item[2], -item[1]))
+
+    def as_dict(self):
+        return {
+            "tool": self.tool,
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "wall_seconds": round(self.wall_seconds, 4),
+            "crossings": self.crossings,
+            "interop_seconds": round(self.interop_seconds, 4),
+            "members": [{"member": label, "count": count, "seconds": round(seconds, 4)}
+                        for label, count, seconds in self.breakdown()],
+        }
+
+    def footer(self):
+        parts = [f"{label}×{count} ({seconds * 1000:.1f}ms)"
+                 for label, count, seconds in self.breakdown()[:_FOOTER_TOP]]
+        more = len(self.counts) - _FOOTER_TOP
+        if more > 0:
+            parts.append(f"+{more} more")
+        return (f"\n\n---\n[interop] {self.crossings} CLR crossings, {self.interop_seconds * 1000:.1f}ms of "
+                f"{self.wall_seconds * 1000:.1f}ms" + (": " + ", ".join(parts) if parts else ""))
+
+
+def _record(label, elapsed):
+    metrics = _active_call.get()
+    if metrics is None:
+        global _outside_metrics
+        if _outside_metrics is None:
+            _outside_metrics = CallMetrics(_OUTSIDE)
+        metrics = _outside_metrics
+    metrics.record(label, elapsed)
+
+
+# ==============================================================================
+# 计数代理
+# ==============================================================================
+
+def _wrap(value):
+    if isinstance(value, _PRIMITIVES) or isinstance(value, (_InteropProxy, _BoundCall)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(_wrap(v) for v in value)
+    return _InteropProxy(value)
+
+
+def _unwrap(value):
+    if isinstance(value, _InteropProxy):
+        return value._pymx_interop_target
+    if isinstance(value, _BoundCall):
+        return value._method
+    return value
+
+
+def _type_label(key):
+    if isinstance(key, tuple):
+        return ", ".join(_type_label(k) for k in key)
+    return getattr(key, "__name__", None) or str(key)
+
+
+class _BoundCall:
+    """代理对象上的方法：调用时计数计时，参数解包、返回值继续代理；支持泛型方法 Create[T]()"""
+
+    __slots__ = ("_method", "_label")
+
+    def __init__(self, method, label):
+        self._method = method
+        self._label = label
+
+    def __call__(self, *args, **kwargs):
+        args = tuple(_unwrap(a) for a in args)
+        kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+        started = time.perf_counter()
+        try:
+            result = self._method(*args, **kwargs)
+        finally:
+            _record(f"{self._label}()", time.perf_counter() - started)
+        return _wrap(result)
+
+    def __getitem__(self, key):
+        key = tuple(_unwrap(k) for k in key) if isinstance(key, tuple) else _unwrap(key)
+        return _BoundCall(self._method[key], f"{self._label}[{_type_label(key)}]")
+
+    def __repr__(self):
+        return f"<interop {self._label}>"
+
+
+class _InteropProxy:
+    """.NET 对象的透明计数代理"""
+
+    __slots__ = ("_pymx_interop_target",)
+
+    def __init__(self, target):
+        object.__setattr__(self, "_pymx_interop_target", target)
+
+    def __getattr__(self, name):
+        target = self._pymx_interop_target
+        if name.startswith("__"):
+            return getattr(target, name)
+        started = time.perf_counter()
+        value = getattr(target, name)
+        if callable(value) and not isinstance(value, _PRIMITIVES):
+            return _BoundCall(value, name)
+        _record(f".{name}", time.perf_counter() - started)
+        return _wrap(value)
+
+    def __setattr__(self, name, value):
+        started = time.perf_counter()
+        try:
+            setattr(self._pymx_interop_target, name, _unwrap(value))
+        finally:
+            _record(f".{name}=", time.perf_counter() - started)
+
+    def __iter__(self):
+        for item in self._pymx_interop_target:
+            yield _wrap(item)
+
+    def __len__(self):
+        return len(self._pymx_interop_target)
+
+    def __getitem__(self, key):
+        started = time.perf_counter()
+        try:
+            return _wrap(self._pymx_interop_target[_unwrap(key)])
+        finally:
+            _record("[]", time.perf_counter() - started)
+
+    def __contains__(self, item):
+        return _unwrap(item) in self._pymx_interop_target
+
+    def __bool__(self):
+        return bool(self._pymx_interop_target)
+
+    def __eq__(self, other):
+        return self._pymx_interop_target == _unwrap(other)
+
+    def __ne__(self, other):
+        return self._pymx_interop_target != _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._pymx_interop_target)
+
+    def __str__(self):
+        return str(self._pymx_interop_target)
+
+    def __repr__(self):
+        return repr(self._pymx_interop_target)
+
+    def __format__(self, spec):
+        return format(self._pymx_interop_target, spec)
+
+
+# ==============================================================================
+# 服务与工具挂载
+# ==============================================================================
+
+def _service_names(ctx_module):
+    return [name for name in vars(ctx_module)
+            if name == "CurrentApp" or (name.endswith("Service") and not name.startswith("_"))]
+
+
+def _instrument_services(ctx_module):
+    for name in _service_names(ctx_module):
+        value = getattr(ctx_module, name)
+        if value is not None and not isinstance(value, _InteropProxy):
+            setattr(ctx_module, name, _InteropProxy(value))
+
+
+def _restore_services(ctx_module):
+    for name in _service_names(ctx_module):
+        setattr(ctx_module, name, _unwrap(getattr(ctx_module, name)))
+
+
+def _finish(metrics, started):
+    metrics.wall_seconds = time.perf_counter() - started
+    _recent.append(metrics)
+    total = _per_tool.get(metrics.tool)
+    if total is None:
+        total = _per_tool[metrics.tool] = CallMetrics(metrics.tool)
+        total.calls = 0
+    total.merge(metrics)
+
+
+def _with_footer(result, metrics):
+    return result + metrics.footer() if isinstance(result, str) else result
+
+
+def _instrument_tool(tool):
+    fn = tool.fn
+    if getattr(fn, "__pymx_interop__", False):
+        return
+    name = tool.name
+
+    if tool.is_async:
+        async def wrapper(*args, **kwargs):
+            if not _enabled:
+                return await fn(*args, **kwargs)
+            metrics = CallMetrics(name)
+            token = _active_call.set(metrics)
+            started = time.perf_counter()
+            try:
+                result = await fn(*args, **kwargs)
+            finally:
+                _active_call.reset(token)
+                _finish(metrics, started)
+            return _with_footer(result, metrics)
+    else:
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            metrics = CallMetrics(name)
+            token = _active_call.set(metrics)
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                _active_call.reset(token)
+                _finish(metrics, started)
+            return _with_footer(result, metrics)
+
+    functools.update_wrapper(wrapper, fn)
+    wrapper.__pymx_interop__ = True
+    tool.fn = wrapper
+
+
+def _install_tool_hook(mcp):
+    """拦截 ToolManager.call_tool：每个被调用的工具 (含重新加载后新注册的) 在首次调用前被包装"""
+    manager = mcp._tool_manager
+    if getattr(manager.call_tool, "__pymx_interop__", False):
+        return
+    original = manager.call_tool
+
+    async def call_tool(name, arguments, *args, **kwargs):
+        tool = manager.get_tool(name)
+        if tool is not None:
+            _instrument_tool(tool)
+        return await original(name, arguments, *args, **kwargs)
+
+    call_tool.__pymx_interop__ = True
+    manager.call_tool = call_tool
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(ctx_module, mcp):
+    """开启统计：代理 mendix_context 中的服务并挂载工具调用归属"""
+    global _enabled
+    _install_tool_hook(mcp)
+    _instrument_services(ctx_module)
+    _enabled = True
+
+
+def disable(ctx_module):
+    """关闭统计：恢复原始服务对象；工具包装保持直通"""
+    global _enabled
+    _enabled = False
+    _restore_services(ctx_module)
+
+
+def reset():
+    global _outside_metrics
+    _recent.clear()
+    _per_tool.clear()
+    _outside_metrics = None
+
+
+def report():
+    """资源输出：最近的工具调用明细 + 按工具汇总"""
+    per_tool = []
+    for total in sorted(_per_tool.values(), key=lambda m: -m.interop_seconds):
+        entry = total.as_dict()
+        entry["calls"] = total.calls
+        entry.pop("started_at")
+        per_tool.append(entry)
+    return {
+        "enabled": _enabled,
+        "recent_calls": [m.as_dict() for m in reversed(_recent)],
+        "per_tool": per_tool,
+        "outside_tool_calls": _outside_metrics.as_dict() if _outside_metrics else None,
+    }
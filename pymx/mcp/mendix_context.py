@@ -89,3 +89,67 @@ def set_mendix_services(
     runtimeService = _runtimeService
     selectorDialogService = _selectorDialogService
     versionControlService = _versionControlService
+
+
+# --- 共享的 Untyped 模型上下文 ---
+# 全名索引等缓存跨工具调用复用；缓存按模型代数 (pymx.model.generations) 校验，
+# 事务提交或 Studio Pro 模型变更事件后自动失效重建。
+# 未能订阅任何模型变更事件时 (见日志警告)，每次获取都视为模型可能已变更，缓存只在单次调用内有效。
+_untyped_context = None
+
+
+def get_untyped_context(app=None):
+    """返回当前 App 共享的 MendixContext（延迟创建）。
+
+    每次获取都会清空身份映射，封装对象及其属性缓存只在一次工具调用内共享。
+    """
+    global _untyped_context
+    from pymx.model import generations
+    app = app or CurrentApp
+    if _untyped_context is None or _untyped_context.model is not app:
+        from pymx.model.untyped_model_wrapper import MendixContext
+        generations.attach_model_events(app)
+        root = untypedModelAccessService.GetUntypedModel(app)
+        _untyped_context = MendixContext(app, root)
+    else:
+        _untyped_context.reset_element_cache()
+    generations.revalidate()
+    return _untyped_context
+
+
+# --- 模型快照 (pymx.model.snapshot) ---
+# 持久化到 <项目目录>/.mendix-cache/model-snapshot/ 并以内存映射方式加载。
+# 订阅了模型变更事件时按模型代数校验：代数未变直接复用，不访问磁盘；代数变化后从内存中的模型重建
+# (未保存的修改不体现在磁盘文件上)。未订阅事件时只能以磁盘上模型文件的指纹判断是否需要重建。
+_model_snapshot = None
+_model_snapshot_generation = None
+
+
+def get_model_snapshot(app=None, rebuild=False):
+    """返回当前 App 的 ModelSnapshot：模型未变时复用已加载的快照，否则加载或重建缓存文件。"""
+    global _model_snapshot, _model_snapshot_generation
+    app = app or CurrentApp
+    from pymx.model import generations, snapshot_file
+    generations.attach_model_events(app)
+    tracked = generations.change_events_attached()
+    generation = generations.global_generation()
+    if (not rebuild and tracked and _model_snapshot is not None
+            and _model_snapshot_generation == generation):
+        return _model_snapshot
+
+    project_dir = snapshot_file.project_directory(app)
+    fingerprint = snapshot_file.model_fingerprint(project_dir) if project_dir else None
+    if fingerprint and tracked and generation:
+        fingerprint = snapshot_file.session_fingerprint(fingerprint, generation)
+    if (not rebuild and fingerprint and _model_snapshot is not None
+            and _model_snapshot.fingerprint == fingerprint):
+        _model_snapshot_generation = generation
+        return _model_snapshot
+
+    if _model_snapshot is not None:
+        _model_snapshot.close()
+    _model_snapshot = None
+    root = untypedModelAccessService.GetUntypedModel(app)
+    _model_snapshot = snapshot_file.get_or_build_snapshot(project_dir, root, rebuild, fingerprint)
+    _model_snapshot_generation = generation
+    return _model_snapshot
@@ -7,14 +7,85 @@ endpoints for generating DSL representations of Mendix models.
 
 from .. import mendix_context as ctx
 from ..tool_registry import mcp
+import asyncio
 import importlib
+import json
+import time
+from pathlib import Path
+from mcp.server.fastmcp import Context
 
 # Import business logic and DTOs
 from pymx.model import dsl
 importlib.reload(dsl)
+from pymx.model import dsl_export
+importlib.reload(dsl_export)
+from pymx.model import dsl_records
+from pymx.model import snapshot_file
 from pymx.model.dto import type_dsl
 importlib.reload(type_dsl)
 
+# ==========================================
+# STREAMING
+# ==========================================
+
+# 工具边生成边推送：仅当客户端带 progressToken 时，累计 _CHUNK_BYTES 字节或距上次推送超过
+# _FLUSH_SECONDS 秒即以进度通知 (message = 分片) 发送一个分片。未请求进度的客户端只收到工具结果，不产生任何通知。
+# 工具结果仍是完整文本；生成在首个分片前就结束的小文档不产生任何通知。
+_CHUNK_BYTES = 8 * 1024
+_FLUSH_SECONDS = 0.5
+
+
+def _progress_token(context: Context):
+    """客户端为本次请求提供的 progressToken；没有时返回 None"""
+    if context is None:
+        return None
+    try:
+        meta = context.request_context.meta
+    except (AttributeError, ValueError):
+        return None
+    return meta.progressToken if meta is not None else None
+
+
+async def _send_chunk(context: Context, chunk: str, sent_bytes: int, total_bytes=None):
+    await context.report_progress(sent_bytes, total_bytes, message=chunk)
+
+
+async def _stream_dsl(lines, context: Context = None) -> str:
+    """消费 dsl.iter_*_dsl 行生成器，客户端请求了进度时按分片推送，返回完整文本"""
+    if _progress_token(context) is None:
+        return "\n".join(lines)
+
+    parts = []
+    pending = []
+    pending_bytes = 0
+    sent_bytes = 0
+    streamed = False
+    last_flush = time.monotonic()
+
+    for line in lines:
+        parts.append(line)
+        pending.append(line)
+        pending_bytes += len(line) + 1
+        if pending_bytes >= _CHUNK_BYTES or time.monotonic() - last_flush >= _FLUSH_SECONDS:
+            sent_bytes += pending_bytes
+            await _send_chunk(context, "\n".join(pending), sent_bytes)
+            pending, pending_bytes, streamed = [], 0, True
+            last_flush = time.monotonic()
+
+    if streamed and pending:
+        sent_bytes += pending_bytes
+        await _send_chunk(context, "\n".join(pending), sent_bytes, sent_bytes)
+    return "\n".join(parts)
+
+
+async def _tool_dsl(iter_dsl, data, context: Context = None) -> str:
+    """工具结果是文本：msgpack 只通过 .msgpack 资源提供"""
+    if data.format_options.output_format == dsl_records.MSGPACK:
+        return ("Error: OutputFormat 'msgpack' is binary and only served by the "
+                "model://dsl/...msgpack resources; use 'jsonl' for tool calls.")
+    return await _stream_dsl(iter_dsl(ctx.CurrentApp, data), context)
+
+
 # ==========================================
 # DSL TOOLS (On-demand generation)
 # ==========================================
@@ -24,7 +95,7 @@ importlib.reload(type_dsl)
     name="generate_domain_model_dsl",
     description="Generate human-readable DSL documentation for entities, attributes, and associations in a module"
 )
-async def tool_domain_model_dsl(data: type_dsl.DomainModelDSLInput) -> str:
+async def tool_domain_model_dsl(data: type_dsl.DomainModelDSLInput, context: Context = None) -> str:
     """
     Generate DomainModel DSL for a module.
 
@@ -34,14 +105,14 @@ async def tool_domain_model_dsl(data: type_dsl.DomainModelDSLInput) -> str:
     Returns:
         DSL string showing entities, attributes, associations, and inheritance
     """
-    return dsl.generate_domain_model_dsl(ctx.CurrentApp, data)
+    return await _tool_dsl(dsl.iter_domain_model_dsl, data, context)
 
 
 @mcp.tool(
     name="generate_microflow_dsl",
     description="Generate ASCII art flow visualization for a microflow with activity details"
 )
-async def tool_microflow_dsl(data: type_dsl.MicroflowDSLInput) -> str:
+async def tool_microflow_dsl(data: type_dsl.MicroflowDSLInput, context: Context = None) -> str:
     """
     Generate Microflow DSL with activity flow visualization.
 
@@ -51,14 +122,14 @@ async def tool_microflow_dsl(data: type_dsl.MicroflowDSLInput) -> str:
     Returns:
         DSL string showing microflow parameters, return type, and activity flow
     """
-    return dsl.generate_microflow_dsl(ctx.CurrentApp, data)
+    return await _tool_dsl(dsl.iter_microflow_dsl, data, context)
 
 
 @mcp.tool(
     name="generate_page_dsl",
     description="Generate widget tree structure DSL for a page"
 )
-async def tool_page_dsl(data: type_dsl.PageDSLInput) -> str:
+async def tool_page_dsl(data: type_dsl.PageDSLInput, context: Context = None) -> str:
     """
     Generate Page DSL showing widget hierarchy.
 
@@ -68,14 +139,14 @@ async def tool_page_dsl(data: type_dsl.PageDSLInput) -> str:
     Returns:
         DSL string with nested widget tree structure
     """
-    return dsl.generate_page_dsl(ctx.CurrentApp, data)
+    return await _tool_dsl(dsl.iter_page_dsl, data, context)
 
 
 @mcp.tool(
     name="generate_workflow_dsl",
     description="Generate activity flow DSL for a workflow (Mendix 9.24+)"
 )
-async def tool_workflow_dsl(data: type_dsl.WorkflowDSLInput) -> str:
+async def tool_workflow_dsl(data: type_dsl.WorkflowDSLInput, context: Context = None) -> str:
     """
     Generate Workflow DSL with user tasks and flow visualization.
 
@@ -85,14 +156,14 @@ async def tool_workflow_dsl(data: type_dsl.WorkflowDSLInput) -> str:
     Returns:
         DSL string showing workflow activities and decision points
     """
-    return dsl.generate_workflow_dsl(ctx.CurrentApp, data)
+    return await _tool_dsl(dsl.iter_workflow_dsl, data, context)
 
 
 @mcp.tool(
     name="generate_module_tree_dsl",
     description="Generate file/folder tree DSL for a module's structure"
 )
-async def tool_module_tree_dsl(data: type_dsl.ModuleTreeDSLInput) -> str:
+async def tool_module_tree_dsl(data: type_dsl.ModuleTreeDSLInput, context: Context = None) -> str:
     """
     Generate ModuleTree DSL showing folder and document structure.
 
@@ -102,15 +173,90 @@ async def tool_module_tree_dsl(data: type_dsl.ModuleTreeDSLInput) -> str:
     Returns:
         DSL string with ASCII tree of module contents
     """
-    return dsl.generate_module_tree_dsl(ctx.CurrentApp, data)
+    return await _tool_dsl(dsl.iter_module_tree_dsl, data, context)
 
 
 @mcp.tool(
     name="generate_java_action_dsl",
     description="Generate human-readable DSL for all Java Actions in a module"
 )
-async def tool_java_action_dsl(data: type_dsl.JavaActionDSLInput) -> str:
-    return dsl.generate_java_action_dsl(ctx.CurrentApp, data)
+async def tool_java_action_dsl(data: type_dsl.JavaActionDSLInput, context: Context = None) -> str:
+    return await _tool_dsl(dsl.iter_java_action_dsl, data, context)
+
+
+@mcp.tool(
+    name="generate_java_action_catalog",
+    description=(
+        "List the Java Actions of every module in the app (Marketplace modules included and flagged) in one "
+        "call, with parameter and return types. Use this to find a Java Action instead of querying module by module."
+    )
+)
+async def tool_java_action_catalog(data: type_dsl.JavaActionCatalogDSLInput, context: Context = None) -> str:
+    return await _tool_dsl(dsl.iter_java_action_catalog_dsl, data, context)
+
+
+@mcp.tool(
+    name="app_domain_graph",
+    description=(
+        "Generate the entity-relationship graph of the whole app in one call: every entity, association and "
+        "cross-association, with both ends resolved to qualified names across modules. Filter with ModuleNames "
+        "and/or Focus + Hops (entities within N associations of the focus entities)."
+    )
+)
+async def tool_app_domain_graph(data: type_dsl.AppDomainGraphDSLInput, context: Context = None) -> str:
+    return await _tool_dsl(dsl.iter_app_domain_graph_dsl, data, context)
+
+
+_export_lock = asyncio.Lock()
+
+
+@mcp.tool(
+    name="export_app_dsl",
+    description=(
+        "Export the DSL of the whole app (domain models, module trees, microflows, pages, workflows of every module) "
+        "to a directory tree in one call. Reads the model once into a snapshot and renders modules in parallel "
+        "worker processes. With Incremental, only units added or changed since the last export are re-rendered. "
+        "Returns the manifest with change counts, wall-clock and per-module timings; the files are listed in "
+        "manifest.json in the output directory."
+    )
+)
+async def tool_export_app_dsl(data: type_dsl.AppDSLExportInput) -> str:
+    # 导出串行执行：快照与其 MendixContext 由导出共享，并发的第二次导出可能重建并关闭正在渲染的快照
+    async with _export_lock:
+        return await _export_app_dsl(data)
+
+
+async def _export_app_dsl(data: type_dsl.AppDSLExportInput) -> str:
+    started = time.perf_counter()
+    project_dir = snapshot_file.project_directory(ctx.CurrentApp)
+    if data.output_directory:
+        output_dir = Path(data.output_directory)
+    elif project_dir is not None:
+        output_dir = project_dir / dsl_export.DEFAULT_OUTPUT_SUBDIR
+    else:
+        return "Error: Project directory unknown; specify OutputDirectory."
+
+    # 快照需在主线程 (CLR) 中读取；渲染只访问快照，放到线程中以免阻塞事件循环
+    snapshot = ctx.get_model_snapshot(rebuild=data.rebuild_snapshot)
+    snapshot_seconds = time.perf_counter() - started
+    path = snapshot_file.snapshot_path(project_dir, snapshot.fingerprint) if project_dir and snapshot.fingerprint else None
+
+    try:
+        manifest = await asyncio.to_thread(
+            dsl_export.export_app_dsl, snapshot, output_dir, path, data.module_names,
+            tuple(data.kinds), data.format_options, data.workers, data.incremental)
+    except Exception as e:
+        import traceback
+        return f"Error exporting app DSL: {e}\n{traceback.format_exc()}"
+
+    # 文件清单只保留在 manifest.json 中，返回给客户端的是摘要与耗时
+    summary = {key: value for key, value in manifest.items() if key != "modules"}
+    summary["snapshot_seconds"] = round(snapshot_seconds, 4)
+    summary["total_seconds"] = round(time.perf_counter() - started, 4)
+    summary["manifest"] = str(output_dir / dsl_export.MANIFEST_FILE)
+    summary["modules"] = [{key: value for key, value in entry.items() if key != "files"}
+                          for entry in manifest["modules"]]
+    return json.dumps(summary, indent=2, ensure_ascii=False)
 
 
 # ==========================================
@@ -209,6 +355,206 @@ def resource_java_action_dsl(module_name: str) -> str:
     return dsl.generate_java_action_dsl(ctx.CurrentApp, data)
 
 
+@mcp.resource(
+    "model://dsl/app/java-actions.txt",
+    description="Java Action catalog of the whole app (all modules, Marketplace modules flagged)",
+    mime_type="text/plain"
+)
+def resource_java_action_catalog() -> str:
+    return dsl.generate_java_action_catalog_dsl(ctx.CurrentApp, type_dsl.JavaActionCatalogDSLInput())
+
+
+@mcp.resource(
+    "model://dsl/app/domain-graph.txt",
+    description="Entity-relationship graph of the whole app (all modules)",
+    mime_type="text/plain"
+)
+def resource_app_domain_graph() -> str:
+    return dsl.generate_app_domain_graph_dsl(ctx.CurrentApp, type_dsl.AppDomainGraphDSLInput())
+
+
+@mcp.resource(
+    "model://dsl/app/domain-graph/{module_names}.txt",
+    description="Entity-relationship graph of the given modules (comma-separated), with associations leaving them",
+    mime_type="text/plain"
+)
+def resource_app_domain_graph_modules(module_names: str) -> str:
+    """
+    Example: model://dsl/app/domain-graph/Sales,Administration.txt
+    """
+    names = [name.strip() for name in module_names.split(",") if name.strip()]
+    data = type_dsl.AppDomainGraphDSLInput(ModuleNames=names)
+    return dsl.generate_app_domain_graph_dsl(ctx.CurrentApp, data)
+
+
+# ==========================================
+# STRUCTURED RESOURCES (JSON Lines / msgpack)
+# ==========================================
+
+# 与 .txt 资源并列：同一 URL 模式，扩展名换成 .jsonl (每行一个 JSON 记录) 或 .msgpack (记录流)
+
+
+def _records(generate, input_type, output_format: str, **names):
+    data = input_type(FormatOptions=type_dsl.DSLFormatOptions(OutputFormat=output_format), **names)
+    return generate(ctx.CurrentApp, data)
+
+
+@mcp.resource(
+    "model://dsl/domain/{module_name}.mxdomain.jsonl",
+    description="DomainModel DSL as JSON Lines records (entity, attribute, association)",
+    mime_type="application/jsonl"
+)
+def resource_domain_model_jsonl(module_name: str) -> str:
+    return _records(dsl.generate_domain_model_dsl, type_dsl.DomainModelDSLInput, dsl_records.JSONL,
+                    ModuleName=module_name)
+
+
+@mcp.resource(
+    "model://dsl/domain/{module_name}.mxdomain.msgpack",
+    description="DomainModel DSL as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_domain_model_msgpack(module_name: str) -> bytes:
+    return _records(dsl.generate_domain_model_dsl, type_dsl.DomainModelDSLInput, dsl_records.MSGPACK,
+                    ModuleName=module_name)
+
+
+@mcp.resource(
+    "model://dsl/microflow/{qualified_name}.mfmicroflow.jsonl",
+    description="Microflow DSL as JSON Lines records (microflow, activity, flow)",
+    mime_type="application/jsonl"
+)
+def resource_microflow_jsonl(qualified_name: str) -> str:
+    return _records(dsl.generate_microflow_dsl, type_dsl.MicroflowDSLInput, dsl_records.JSONL,
+                    QualifiedName=qualified_name)
+
+
+@mcp.resource(
+    "model://dsl/microflow/{qualified_name}.mfmicroflow.msgpack",
+    description="Microflow DSL as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_microflow_msgpack(qualified_name: str) -> bytes:
+    return _records(dsl.generate_microflow_dsl, type_dsl.MicroflowDSLInput, dsl_records.MSGPACK,
+                    QualifiedName=qualified_name)
+
+
+@mcp.resource(
+    "model://dsl/page/{qualified_name}.mfpage.jsonl",
+    description="Page widget tree as JSON Lines records (one per widget)",
+    mime_type="application/jsonl"
+)
+def resource_page_jsonl(qualified_name: str) -> str:
+    return _records(dsl.generate_page_dsl, type_dsl.PageDSLInput, dsl_records.JSONL,
+                    QualifiedName=qualified_name)
+
+
+@mcp.resource(
+    "model://dsl/page/{qualified_name}.mfpage.msgpack",
+    description="Page widget tree as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_page_msgpack(qualified_name: str) -> bytes:
+    return _records(dsl.generate_page_dsl, type_dsl.PageDSLInput, dsl_records.MSGPACK,
+                    QualifiedName=qualified_name)
+
+
+@mcp.resource(
+    "model://dsl/workflow/{qualified_name}.mfworkflow.jsonl",
+    description="Workflow DSL as JSON Lines records (one per activity)",
+    mime_type="application/jsonl"
+)
+def resource_workflow_jsonl(qualified_name: str) -> str:
+    return _records(dsl.generate_workflow_dsl, type_dsl.WorkflowDSLInput, dsl_records.JSONL,
+                    QualifiedName=qualified_name)
+
+
+@mcp.resource(
+    "model://dsl/workflow/{qualified_name}.mfworkflow.msgpack",
+    description="Workflow DSL as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_workflow_msgpack(qualified_name: str) -> bytes:
+    return _records(dsl.generate_workflow_dsl, type_dsl.WorkflowDSLInput, dsl_records.MSGPACK,
+                    QualifiedName=qualified_name)
+
+
+@mcp.resource(
+    "model://dsl/module/{module_name}.mfmodule.tree.jsonl",
+    description="Module file/folder tree as JSON Lines records (folder, document)",
+    mime_type="application/jsonl"
+)
+def resource_module_tree_jsonl(module_name: str) -> str:
+    return _records(dsl.generate_module_tree_dsl, type_dsl.ModuleTreeDSLInput, dsl_records.JSONL,
+                    ModuleName=module_name)
+
+
+@mcp.resource(
+    "model://dsl/module/{module_name}.mfmodule.tree.msgpack",
+    description="Module file/folder tree as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_module_tree_msgpack(module_name: str) -> bytes:
+    return _records(dsl.generate_module_tree_dsl, type_dsl.ModuleTreeDSLInput, dsl_records.MSGPACK,
+                    ModuleName=module_name)
+
+
+@mcp.resource(
+    "model://dsl/java_actions/{module_name}.mxjavaactions.jsonl",
+    description="Java Actions of a module as JSON Lines records",
+    mime_type="application/jsonl"
+)
+def resource_java_action_jsonl(module_name: str) -> str:
+    return _records(dsl.generate_java_action_dsl, type_dsl.JavaActionDSLInput, dsl_records.JSONL,
+                    ModuleName=module_name)
+
+
+@mcp.resource(
+    "model://dsl/java_actions/{module_name}.mxjavaactions.msgpack",
+    description="Java Actions of a module as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_java_action_msgpack(module_name: str) -> bytes:
+    return _records(dsl.generate_java_action_dsl, type_dsl.JavaActionDSLInput, dsl_records.MSGPACK,
+                    ModuleName=module_name)
+
+
+@mcp.resource(
+    "model://dsl/app/java-actions.jsonl",
+    description="Java Action catalog of the whole app as JSON Lines records",
+    mime_type="application/jsonl"
+)
+def resource_java_action_catalog_jsonl() -> str:
+    return _records(dsl.generate_java_action_catalog_dsl, type_dsl.JavaActionCatalogDSLInput, dsl_records.JSONL)
+
+
+@mcp.resource(
+    "model://dsl/app/java-actions.msgpack",
+    description="Java Action catalog of the whole app as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_java_action_catalog_msgpack() -> bytes:
+    return _records(dsl.generate_java_action_catalog_dsl, type_dsl.JavaActionCatalogDSLInput, dsl_records.MSGPACK)
+
+
+@mcp.resource(
+    "model://dsl/app/domain-graph.jsonl",
+    description="Entity-relationship graph of the whole app as JSON Lines records (entity, association)",
+    mime_type="application/jsonl"
+)
+def resource_app_domain_graph_jsonl() -> str:
+    return _records(dsl.generate_app_domain_graph_dsl, type_dsl.AppDomainGraphDSLInput, dsl_records.JSONL)
+
+
+@mcp.resource(
+    "model://dsl/app/domain-graph.msgpack",
+    description="Entity-relationship graph of the whole app as a msgpack record stream",
+    mime_type="application/msgpack"
+)
+def resource_app_domain_graph_msgpack() -> bytes:
+    return _records(dsl.generate_app_domain_graph_dsl, type_dsl.AppDomainGraphDSLInput, dsl_records.MSGPACK)
+
+
 # ==========================================
 # CONVENIENCE RESOURCES (Markdown format)
 # ==========================================
@@ -1,4 +1,4 @@
-from pymx.model.util import TransactionManager
+from pymx.model.util import TransactionManager, Document
 from .. import mendix_context as ctx
 from ..tool_registry import mcp
 import importlib
@@ -15,7 +15,9 @@ importlib.reload(_folder)
     description="Ensure folder exists, if not create it"
 )
 async def create_mendix_folders(fullPaths: Annotated[list[str], Field(description="A folder name to ensure exist, {ModuleName}/{Folder1Name}/{Folder2Name} or {ModuleName}/{Folder1Name}, Module is also a folder")]) -> str:
-    with TransactionManager(ctx.CurrentApp, 'create list folder') as tx:
+    # 文件夹只改变模块结构：标记所属模块
+    touched = [Document(path.split('/')[0]) for path in fullPaths if path.split('/')[0]]
+    with TransactionManager(ctx.CurrentApp, 'create list folder', touched) as tx:
         for path in fullPaths:
             _folder.ensure_folder(ctx.CurrentApp, path+'/_')
     return 'create success'
@@ -0,0 +1,67 @@
+import json
+import os
+from typing import Annotated
+
+from pydantic import Field
+
+from .. import interop_metrics
+from pymx.model import dsl_cache
+from .. import mendix_context as ctx
+from ..tool_registry import mcp
+
+# 注意：interop_metrics 与 dsl_cache 保存运行期状态 (已代理的服务、统计记录、缓存内容)，不在此处 reload
+
+# 设置环境变量 PYMX_INTEROP_METRICS=1 可在工具加载时直接开启统计
+if os.environ.get("PYMX_INTEROP_METRICS") == "1" and not interop_metrics.is_enabled():
+    interop_metrics.enable(ctx, mcp)
+
+
+@mcp.tool(
+    name="configure_interop_metrics",
+    description="Turn CLR boundary-crossing instrumentation on or off. When on, every untyped-model/service call (GetProperty, GetValues, GetUnitsOfType, Create[...]) made by a tool call is counted and timed; tool reports get a footer and details are in the model://metrics/interop resource. Adds overhead, use for diagnosis only."
+)
+async def configure_interop_metrics(
+    enabled: Annotated[bool, Field(description="True to start counting, False to stop and restore the original services")],
+    reset: Annotated[bool, Field(description="Clear the recorded statistics")] = False,
+) -> str:
+    if reset:
+        interop_metrics.reset()
+    if enabled:
+        interop_metrics.enable(ctx, mcp)
+    else:
+        interop_metrics.disable(ctx)
+    state = "enabled" if interop_metrics.is_enabled() else "disabled"
+    return f"Interop metrics {state}." + (" Statistics cleared." if reset else "")
+
+
+@mcp.resource(
+    "model://metrics/interop",
+    description="Per tool call CLR boundary crossings (count and time per member) recorded while interop metrics are enabled",
+    mime_type="application/json"
+)
+def resource_interop_metrics() -> str:
+    return json.dumps(interop_metrics.report(), indent=2, ensure_ascii=False)
+
+
+@mcp.tool(
+    name="configure_dsl_cache",
+    description="Set the byte budget of the generated-DSL cache (LRU, keyed by unit ID, options and unit version) or clear it. A budget of 0 disables caching. Statistics are in the model://metrics/dsl_cache resource."
+)
+async def configure_dsl_cache(
+    max_bytes: Annotated[int, Field(description="Byte budget; -1 keeps the current budget, 0 disables the cache")] = -1,
+    clear: Annotated[bool, Field(description="Drop all cached documents and reset the statistics")] = False,
+) -> str:
+    if clear:
+        dsl_cache.cache.clear(reset_stats=True)
+    if max_bytes >= 0:
+        dsl_cache.cache.configure(max_bytes)
+    return json.dumps(dsl_cache.cache.stats(), indent=2)
+
+
+@mcp.resource(
+    "model://metrics/dsl_cache",
+    description="Generated-DSL cache statistics: entries, bytes used of the budget, hits, misses, evictions, invalidations",
+    mime_type="application/json"
+)
+def resource_dsl_cache_metrics() -> str:
+    return json.dumps(dsl_cache.cache.stats(), indent=2)
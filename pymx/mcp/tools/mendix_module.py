@@ -23,7 +23,8 @@ importlib.reload(_module)
     description="Ensure module exists, if not create it"
 )
 async def ensure_mendix_modules(names: Annotated[list[str], Field(description="A module name to ensure exist")]) -> str:
-    with util.TransactionManager(ctx.CurrentApp, 'ensure list module exist') as tx:
+    touched = [util.Document(name) for name in names]
+    with util.TransactionManager(ctx.CurrentApp, 'ensure list module exist', touched) as tx:
         for name in names:
             _module.ensure_module(ctx.CurrentApp, name)
     return 'ensure success'
@@ -50,8 +51,8 @@ def model_module_resource(module_name: str) -> str:
     module = next((m for m in modules if m.Name == module_name), None)
 
     try:
-        # 使用事务可以确保类型转换等操作的原子性
-        with util.TransactionManager(ctx.CurrentApp, f"list_entity_in_{module_name}") as tx:
+        # 类型转换需要 Create 辅助对象，因此在只读事务中进行 (结束时回滚，不使缓存失效)
+        with util.TransactionManager(ctx.CurrentApp, f"list_entity_in_{module_name}", read_only=True) as tx:
             if not module:
                 return json.dumps({"error": f"Module '{module_name}' not found."})
 
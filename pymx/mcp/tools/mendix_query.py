@@ -0,0 +1,34 @@
+from .. import mendix_context as ctx
+from ..tool_registry import mcp
+import importlib
+from pydantic import Field
+from typing import Annotated
+
+# 导入包含核心逻辑的模块
+from pymx.model import query as model_query
+importlib.reload(model_query)
+
+
+@mcp.tool(
+    name="query_model",
+    description=(
+        "Query the app model with a CSS-like selector instead of writing execute_python walks. "
+        "Steps: 'Type' (short or 'Module$Type', '*' = any), '@Module.Document' (first step only), "
+        "'A B' = descendant, 'A > B' = direct child. "
+        "Predicates: [prop], [prop=value], [prop!=v], [prop^=v], [prop$=v], [prop*=v]; prop may be a dotted path. "
+        "Pseudo-classes: :refs(Module.Name) = references that name, :module(Name). "
+        "Example: RetrieveAction[retrieveSource.entity=Sales.Order][retrieveSource.xPathConstraint]. "
+        "Results are paged; use offset to continue."
+    )
+)
+async def query_model(
+    selector: Annotated[str, Field(description="Selector, e.g. 'Microflow:module(Sales) MicroflowCallAction[microflowCall.microflow^=Sales.SUB_]'")],
+    offset: Annotated[int, Field(description="Index of the first match to return")] = 0,
+    limit: Annotated[int, Field(description=f"Page size (max {model_query.MAX_PAGE_SIZE})")] = model_query.DEFAULT_PAGE_SIZE,
+    rebuild: Annotated[bool, Field(description="Rebuild the model index before querying (use after the model was changed outside pymx)")] = False,
+) -> str:
+    try:
+        page = ctx.get_untyped_context().query(selector, offset, limit, rebuild)
+    except model_query.QuerySyntaxError as e:
+        return f"Invalid selector: {e}"
+    return model_query.format_query_page(page)
@@ -0,0 +1,23 @@
+from .. import mendix_context as ctx
+from ..tool_registry import mcp
+import importlib
+from pydantic import Field
+from typing import Annotated
+
+# 导入包含核心逻辑的模块
+from pymx.model import reference_index
+importlib.reload(reference_index)
+
+
+@mcp.tool(
+    name="find_references",
+    description="Find every place in the app that references a qualified name: microflow calls, entity/attribute/association usages (incl. XPath and expressions), page and snippet calls, event handlers. Use it for impact analysis ('who uses X?') before renaming or deleting."
+)
+async def find_references(
+    qualifiedName: Annotated[str, Field(description="Qualified name to look up, e.g. 'MyModule.ACT_Order_Save', 'MyModule.Customer', 'MyModule.Customer.Name', 'MyModule.Order_Customer'")],
+    rebuild: Annotated[bool, Field(description="Rebuild the index before querying (use after the model was changed)")] = False,
+) -> str:
+    context = ctx.get_untyped_context()
+    index = context.get_reference_index(rebuild)
+    records = index.find(qualifiedName)
+    return reference_index.format_references(qualifiedName, index, records)
@@ -1,4 +1,4 @@
-from pymx.model.util import TransactionManager
+from pymx.model.util import TransactionManager, Document
 import importlib
 from typing import List, Literal, Tuple, Optional
 from pydantic import BaseModel, Field
@@ -67,7 +67,7 @@ async def create_constants_with_demo(current_app, demo_input: CreateConstantsToo
     """
     for request in demo_input.requests:
         # 使用单个事务处理一个常量的创建（包括其文件夹结构）
-        with TransactionManager(current_app, f"Create Constant {request.full_path}"):
+        with TransactionManager(current_app, f"Create Constant {request.full_path}", [Document(request.full_path)]):
             try:
                 # 确保文件夹路径存在，并获取父容器、文档名和模块名
                 parent_container, constant_name, module_name = _folder.ensure_folder(
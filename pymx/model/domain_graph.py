@@ -0,0 +1,165 @@
+"""
+Whole-app entity-relationship graph.
+
+build_domain_graph() reads every module's domain model once. It builds a
+global entity ID -> qualified name map first and then resolves both ends of
+every association and cross-association through it, so edges between modules
+name real entities instead of whatever the per-module view could resolve.
+
+DomainGraph.select() narrows the graph to modules and/or the entities within
+N association hops of a set of focus entities. MendixContext.get_domain_graph
+caches the graph until the model changes. This module does not import clr.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from pymx.model.untyped_walk import is_model_object, object_id
+
+
+class GraphEntity(NamedTuple):
+    id: str
+    qualified_name: str
+    module: str
+    name: str
+    persistable: bool
+    generalization: Optional[str]
+    inheritance_depth: int
+
+
+class GraphAssociation(NamedTuple):
+    id: str
+    module: str
+    name: str
+    parent: str
+    child: str
+    type: str
+    owner: str
+    cross_module: bool
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.module}.{self.name}"
+
+
+class GraphSelection(NamedTuple):
+    entities: List[GraphEntity]
+    associations: List[GraphAssociation]
+    external: List[str]  # far ends of associations leaving the selected modules
+
+
+class DomainGraph:
+    """Entities (by qualified name) and all associations of the app, with an undirected adjacency."""
+
+    def __init__(self, entities: Dict[str, GraphEntity], associations: List[GraphAssociation],
+                 qname_of_id: Dict[str, str]):
+        self.entities = entities
+        self.associations = associations
+        self.qname_of_id = qname_of_id
+        self.modules = sorted({entity.module for entity in entities.values()})
+        self.neighbors: Dict[str, Set[str]] = {}
+        for assoc in associations:
+            self.neighbors.setdefault(assoc.parent, set()).add(assoc.child)
+            self.neighbors.setdefault(assoc.child, set()).add(assoc.parent)
+
+    def neighborhood(self, focus: Iterable[str], hops: int) -> Set[str]:
+        """Entities within `hops` associations of any focus entity (the focus included)."""
+        reached = {qname: 0 for qname in focus}
+        queue = deque(reached)
+        while queue:
+            qname = queue.popleft()
+            distance = reached[qname]
+            if distance >= hops:
+                continue
+            for other in self.neighbors.get(qname, ()):
+                if other not in reached:
+                    reached[other] = distance + 1
+                    queue.append(other)
+        return {qname for qname in reached if qname in self.entities}
+
+    def select(self, modules: Optional[Sequence[str]] = None, focus: Optional[Sequence[str]] = None,
+               hops: int = 1) -> GraphSelection:
+        """Entities of `modules` (all when None), limited to the neighborhood of `focus` when given.
+
+        Associations between selected entities are kept; with a module filter,
+        associations leaving the selected modules are kept as well and their far
+        end is listed as external.
+        """
+        module_set = set(modules) if modules else None
+        names = self.neighborhood(focus, hops) if focus else set(self.entities)
+        if module_set is not None:
+            names = {qname for qname in names if self.entities[qname].module in module_set}
+
+        associations, external = [], set()
+        for assoc in self.associations:
+            parent_in, child_in = assoc.parent in names, assoc.child in names
+            if parent_in and child_in:
+                associations.append(assoc)
+            elif module_set is not None and (parent_in or child_in):
+                far = assoc.child if parent_in else assoc.parent
+                if _module_of(far) not in module_set:
+                    associations.append(assoc)
+                    external.add(far)
+        entities = sorted((self.entities[qname] for qname in names), key=lambda e: (e.module, e.name))
+        associations.sort(key=lambda a: (a.module, a.name))
+        return GraphSelection(entities, associations, sorted(external))
+
+
+def _module_of(qname: str) -> str:
+    return qname.split(".", 1)[0]
+
+
+def _enum_text(prop) -> str:
+    return str(prop.Value).split(".")[-1] if prop and prop.Value else "Unknown"
+
+
+def _endpoint(prop, qname_of_id: Dict[str, str]) -> str:
+    """Qualified name of an association end, given as an entity object or a qualified name string."""
+    value = prop.Value if prop else None
+    if value is None:
+        return "Unknown"
+    if is_model_object(value):
+        return qname_of_id.get(object_id(value), "Unknown")
+    return str(value)
+
+
+def build_domain_graph(root, generalizations=None) -> DomainGraph:
+    """Build the graph over all modules below an untyped model root.
+
+    `generalizations` (a pymx.model.generalization_index.GeneralizationIndex)
+    supplies persistability and inheritance depth; without it every entity is
+    reported persistable at depth 0.
+    """
+    domain_models = []
+    entities: Dict[str, GraphEntity] = {}
+    qname_of_id: Dict[str, str] = {}
+    for module in root.GetUnitsOfType("Projects$Module"):
+        for domain_model in module.GetUnitsOfType("DomainModels$DomainModel"):
+            domain_models.append((module.Name, domain_model))
+            entities_prop = domain_model.GetProperty("entities")
+            if not entities_prop or not entities_prop.IsList:
+                continue
+            for entity in entities_prop.GetValues():
+                qname = f"{module.Name}.{entity.Name}"
+                entity_id = object_id(entity)
+                qname_of_id[entity_id] = qname
+                info = generalizations.get(qname) if generalizations is not None else None
+                entities[qname] = GraphEntity(
+                    entity_id, qname, module.Name, entity.Name,
+                    info.persistable if info else True, info.parent if info else None, info.depth if info else 0)
+
+    # Second pass: every entity of the app is known, so both ends resolve across modules
+    associations = []
+    for module_name, domain_model in domain_models:
+        for list_name, cross in (("associations", False), ("crossAssociations", True)):
+            prop = domain_model.GetProperty(list_name)
+            if not prop or not prop.IsList:
+                continue
+            for assoc in prop.GetValues():
+                name_prop = assoc.GetProperty("name")
+                associations.append(GraphAssociation(
+                    object_id(assoc), module_name, name_prop.Value if name_prop else "Unknown",
+                    _endpoint(assoc.GetProperty("parent"), qname_of_id),
+                    _endpoint(assoc.GetProperty("child"), qname_of_id),
+                    _enum_text(assoc.GetProperty("type")), _enum_text(assoc.GetProperty("owner")), cross))
+    return DomainGraph(entities, associations, qname_of_id)
@@ -5,13 +5,15 @@ This module provides read-only generators that produce human-readable
 DSL representations of Mendix models (entities, microflows, pages, workflows).
 
 All functions are synchronous and do NOT use TransactionManager.
+Each analyzer yields its document line by line (iter_lines / iter_*_dsl), so
+callers can stream large documents; generate_*_dsl joins the lines.
 """
 
-import clr
-from typing import Optional, List, Set, Dict, Any
-from collections import defaultdict
+from typing import Optional, List, Set, Dict, Any, Iterator
 
-from pymx.model.untyped_model_wrapper import ElementFactory
+from pymx.model.untyped_model_wrapper import ElementFactory, MendixContext
+from pymx.model import dsl_budget, dsl_cache, dsl_records, domain_graph, microflow_cfg, module_tree
+from pymx.model.untyped_walk import object_id
 
 from pymx.model.dto import type_dsl
 import importlib
@@ -23,14 +25,27 @@ importlib.reload(type_dsl)
 # ==========================================
 
 # @CORE:DSL.TypeParser - Parses Mendix type objects into strings.
-def _get_type_as_string(type_obj):
+def _get_type_as_string(type_obj, memo: Optional[Dict[str, str]] = None):
     """
     Recursively analyzes a Mendix type object from the Untyped API and returns a readable string representation.
     Handles various nested structures for return types and parameters.
+    `memo` (type object ID -> string, see MendixContext.type_string_memo) skips objects resolved before;
+    every level of a nested type (parameter type and the concrete type it points to) is memoized by its own ID.
     """
     if not type_obj:
         return "Void"
 
+    if memo is not None:
+        type_id = object_id(type_obj)
+        if type_id is not None:
+            text = memo.get(type_id)
+            if text is None:
+                text = memo[type_id] = _type_as_string(type_obj, memo)
+            return text
+    return _type_as_string(type_obj, memo)
+
+
+def _type_as_string(type_obj, memo: Optional[Dict[str, str]]) -> str:
     try:
         # Check the type of the current object itself first
         type_name_raw = str(type_obj.Type)
@@ -49,7 +64,7 @@ def _get_type_as_string(type_obj):
         type_prop = type_obj.GetProperty("type")
         if type_prop and type_prop.Value:
             # Recurse with the nested object (e.g., a CodeActions$ConcreteEntityType or a primitive type)
-            return _get_type_as_string(type_prop.Value)
+            return _get_type_as_string(type_prop.Value, memo)
 
         # Case 3: Primitive Types (Fallback if no entity/type property)
         if "Type" in type_name_raw:
@@ -64,11 +79,143 @@ def _get_type_as_string(type_obj):
     return "UnsupportedType"
 
 
+def _get_context(app, snapshot=None) -> MendixContext:
+    """Lookup/wrapping context over the live model, or over a ModelSnapshot when one is given.
+
+    The generators' `snapshot` parameter lets the same analyzers run CLR-free
+    against a pymx.model.snapshot.ModelSnapshot instead of Studio Pro objects.
+    """
+    if snapshot is not None:
+        return snapshot.get_context()
+    from pymx.mcp import mendix_context as ctx
+    return ctx.get_untyped_context(app)
+
+
+def _find_document(context, module, qualified_name: str, doc_name: str, unit_type: str):
+    """Resolve a document by its (possibly folder-qualified) name through the context index."""
+    return (context.get_unit(qualified_name, unit_type)
+            or context.get_unit(f"{module.Name}.{doc_name}", unit_type))
+
+
+def _cached(kind: str, unit, data, snapshot, render, scope: str = dsl_cache.SCOPE_UNIT) -> Iterator[str]:
+    """Serve a document from the DSL cache, or stream it from `render()` and store it.
+
+    A hit yields the whole cached text as a single item, so joining the
+    result returns the cached string itself. Documents whose consumer stops
+    early are not stored, nor are documents without a unit (`unit` None), nor
+    live-model documents when model changes cannot be detected (see
+    dsl_cache.cacheable). App-wide documents pass a fixed document ID string
+    as `unit`.
+    """
+    cache = dsl_cache.cache
+    if unit is None or not dsl_cache.cacheable(snapshot):
+        yield from render()
+        return
+    options = data.model_dump_json(exclude={"module_name", "qualified_name"})
+    unit_id = unit if isinstance(unit, str) else unit.ID.ToString()
+    key = dsl_cache.make_key(kind, unit_id, options, scope, snapshot)
+    text = cache.get(key)
+    if text is not None:
+        yield text
+        return
+    lines = []
+    for line in render():
+        lines.append(line)
+        yield line
+    cache.put(key, dsl_records.join(data.format_options.output_format, lines))
+
+
+def _structured(data) -> bool:
+    """True when `data` asks for a record stream (OutputFormat jsonl/msgpack) instead of text"""
+    return data.format_options.output_format != dsl_records.TEXT
+
+
+def _error(data, message: str):
+    """An error line in the requested output format (plain text when that format cannot be encoded)"""
+    output_format = data.format_options.output_format
+    if _structured(data) and not dsl_records.unavailable(output_format):
+        return dsl_records.encoder(output_format)(dsl_records.error_record(message))
+    return message
+
+
+def _join(data, parts):
+    """Whole document from a generator; a plain error message when the output format is unavailable.
+
+    The availability check runs before `parts` is consumed, so the generator never starts.
+    """
+    output_format = data.format_options.output_format
+    problem = dsl_records.unavailable(output_format)
+    if problem:
+        return f"Error: {problem}"
+    return dsl_records.join(output_format, parts)
+
+
+def _record_stream(kind: str, unit, data, snapshot, records, scope: str = dsl_cache.SCOPE_UNIT):
+    """Structured output: encode `records()` one item per record, cut at record boundaries by the budget"""
+    output_format = data.format_options.output_format
+    encode = dsl_records.encoder(output_format)
+
+    def render():
+        try:
+            cursor = dsl_budget.parse_cursor(data.cursor) if data.cursor else None
+        except ValueError as e:
+            yield encode(dsl_records.error_record(str(e)))
+            return
+        limit = dsl_budget.byte_limit(data)
+        budget = dsl_budget.Budget(limit) if limit is not None else None
+        yield from dsl_budget.bounded(
+            (encode(record) for record in records()), budget, data.format_options.detail_level,
+            cursor.offset if cursor else 0,
+            lambda offset, cursor: encode(dsl_records.elision_record(f"records from #{offset}", cursor)))
+
+    return _cached(kind, unit, data, snapshot, render, scope)
+
+
+def _budgeted(data, render, estimate=None) -> Iterator[str]:
+    """Apply the output budget of `data` (MaxTokens / MaxBytes / Cursor, see pymx.model.dsl_budget).
+
+    `render(options, budget, start)` yields the document at the chosen detail
+    level, charging `budget` (None when unlimited) and resuming at `start`.
+    `estimate(level)` returns the expected size in bytes from cheap counts;
+    without it the requested level is kept and the output is only cut.
+    """
+    requested = data.format_options.detail_level
+    limit = dsl_budget.byte_limit(data)
+    try:
+        cursor = dsl_budget.parse_cursor(data.cursor) if data.cursor else None
+    except ValueError as e:
+        yield f"Error: {e}"
+        return
+
+    if cursor is not None:
+        level = cursor.level  # continuations keep the level of the first page
+    elif limit is not None and estimate is not None:
+        level = dsl_budget.choose_level(requested, estimate, limit)
+    else:
+        level = requested
+    options = data.format_options
+    if level != requested:
+        options = options.model_copy(update={"detail_level": level})
+
+    budget = dsl_budget.Budget(limit) if limit is not None else None
+    if level != requested and cursor is None:
+        note = f"> Detail level reduced from {requested} to {level} to fit the output budget."
+        if budget is None or budget.take(note):
+            yield note
+    yield from render(options, budget, cursor.offset if cursor else 0)
+
+
 # ==========================================
 # 1. DomainModel DSL Generator
 # ==========================================
 
 
+# Average DSL bytes per item and detail level, for budget estimates (pymx.model.dsl_budget)
+_ENTITY_BYTES = {"detailed": 80, "standard": 64, "brief": 40, "names": 40}
+_ATTRIBUTE_BYTES = {"detailed": 56, "standard": 44, "brief": 24, "names": 0}
+_ASSOCIATION_BYTES = 72
+
+
 class DomainModelAnalyzer:
     """Generates DSL documentation for domain models using Mendix untyped API.
 
@@ -90,22 +237,38 @@ class DomainModelAnalyzer:
             name = entity.GetProperty("name").Value
     """
 
-    def __init__(self, app, untyped_module, options: type_dsl.DSLFormatOptions):
+    def __init__(self, app, untyped_module, options: type_dsl.DSLFormatOptions, context=None):
         """Initialize analyzer with untyped module object.
 
         Args:
             app: Mendix application instance
             untyped_module: Module from GetUnitsOfType("Projects$Module")
             options: DSL formatting options
+            context: MendixContext whose app-wide generalization index resolves
+                persistability through parent chains (other modules included);
+                without one only the entity's own generalization is inspected
         """
         self.app = app
         self.module = untyped_module  # Untyped module from GetUnitsOfType("Projects$Module")
         self.options = options
-        self.lines = []
+        self.generalizations = context.get_generalization_index() if context is not None else None
+        self._counts = None  # (entities, attributes, associations) for estimate_size
 
     def generate(self, entity_names: Optional[List[str]] = None) -> str:
         """Generate complete DSL for domain model using untyped API.
 
+        Args:
+            entity_names: Optional list of specific entity names to process
+
+        Returns:
+            DSL string representation of the domain model
+        """
+        return "\n".join(self.iter_lines(entity_names))
+
+    def iter_lines(self, entity_names: Optional[List[str]] = None,
+                   budget: Optional[dsl_budget.Budget] = None, start: int = 0) -> Iterator[str]:
+        """Yield the domain model DSL line by line, as it is generated.
+
         Process:
         1. Find DomainModel unit using GetUnitsOfType("DomainModels$DomainModel")
         2. Get entities via GetProperty("entities").GetValues()
@@ -115,11 +278,11 @@ class DomainModelAnalyzer:
 
         Args:
             entity_names: Optional list of specific entity names to process
-
-        Returns:
-            DSL string representation of the domain model
+            budget: Output budget; entities and associations are cut at item
+                boundaries with an elision marker once it is spent
+            start: Item offset to resume at (entities first, then associations)
         """
-        self.lines = [
+        header = [
             f"# Domain Model DSL: {self.module.Name}",
             f"# Generated from module {self.module.Name}",
             ""
@@ -130,21 +293,25 @@ class DomainModelAnalyzer:
         domain_model = next((dm for dm in dm_units), None)
 
         if not domain_model:
-            return f"Error: Module '{self.module.Name}' has no domain model."
+            yield f"Error: Module '{self.module.Name}' has no domain model."
+            return
 
         # Get entities using untyped API
         entities_prop = domain_model.GetProperty("entities")
-        if not entities_prop or not entities_prop.IsList:
-            return f"{self.lines[0]}\n{self.lines[1]}\n\nNo entities found."
-
-        entities = list(entities_prop.GetValues())
+        entities = list(entities_prop.GetValues()) if entities_prop and entities_prop.IsList else []
 
         # Filter entities if specific names provided
         if entity_names:
             entities = [e for e in entities if e.Name in entity_names]
 
         if not entities:
-            return f"{self.lines[0]}\n{self.lines[1]}\n\nNo entities found."
+            yield from header
+            yield "No entities found."
+            return
+
+        # Without room for the header the page starts directly with its first item
+        if budget is None or budget.take(*header):
+            yield from header
 
         # Build ID to qualified name mapping
         # Used for resolving entity references in associations
@@ -152,32 +319,72 @@ class DomainModelAnalyzer:
         for ent in entities:
             id_map[ent.ID.ToString()] = f"{self.module.Name}.{ent.Name}"
 
-        # Generate entity documentation
-        for entity in entities:
-            self._generate_entity(entity, id_map)
-            self.lines.append("")  # Blank separator
-
-        # Generate associations section using untyped API
+        # Associations and cross-associations follow the entities as items of their section
         associations_prop = domain_model.GetProperty("associations")
-        if associations_prop and associations_prop.IsList:
-            associations = list(associations_prop.GetValues())
-            if associations:
-                self.lines.append("## Associations (Internal)")
-                for assoc in associations:
-                    self._generate_association(assoc, id_map)
-                self.lines.append("")
-
-        # Generate cross-associations section using untyped API
         cross_assocs_prop = domain_model.GetProperty("crossAssociations")
+        assoc_items = []
+        if associations_prop and associations_prop.IsList:
+            assoc_items += [("## Associations (Internal)", assoc, self._generate_association)
+                            for assoc in associations_prop.GetValues()]
         if cross_assocs_prop and cross_assocs_prop.IsList:
-            cross_associations = list(cross_assocs_prop.GetValues())
-            if cross_associations:
-                self.lines.append("## Associations (Cross-Module)")
-                for assoc in cross_associations:
-                    self._generate_cross_association(assoc, id_map)
-                self.lines.append("")
-
-        return "\n".join(self.lines)
+            assoc_items += [("## Associations (Cross-Module)", assoc, self._generate_cross_association)
+                            for assoc in cross_assocs_prop.GetValues()]
+        level = self.options.detail_level
+
+        # Generate entity documentation; the first item of a page is always emitted so the cursor moves on
+        for index in range(start, len(entities)):
+            lines = self._generate_entity(entities[index], id_map)
+            if budget is not None:
+                lines = list(lines)
+                lines.append("")
+                if not budget.take(*lines, force=index == start):
+                    yield dsl_budget.elision(f"{len(entities) - index} more entities and {len(assoc_items)} associations",
+                                             dsl_budget.Cursor(level, index))
+                    return
+                yield from lines
+                continue
+            yield from lines
+            yield ""  # Blank separator
+
+        # Generate associations sections using untyped API
+        section = None
+        first = max(start - len(entities), 0)
+        for index in range(first, len(assoc_items)):
+            title, assoc, generate = assoc_items[index]
+            lines = [generate(assoc, id_map)]
+            if title != section:
+                lines = ([""] if section else []) + [title] + lines
+            if budget is not None and not budget.take(*lines, force=len(entities) + index == start):
+                yield dsl_budget.elision(f"{len(assoc_items) - index} more associations",
+                                         dsl_budget.Cursor(level, len(entities) + index))
+                return
+            section = title
+            yield from lines
+        if section:
+            yield ""
+
+    def estimate_size(self, level: str, entity_names: Optional[List[str]] = None) -> int:
+        """Expected DSL size in bytes at `level`, from entity/attribute/association counts only"""
+        if self._counts is None:
+            dm = next(iter(self.module.GetUnitsOfType("DomainModels$DomainModel")), None)
+            entities, attributes, associations = 0, 0, 0
+            if dm is not None:
+                entities_prop = dm.GetProperty("entities")
+                for entity in (entities_prop.GetValues() if entities_prop and entities_prop.IsList else []):
+                    if entity_names and entity.Name not in entity_names:
+                        continue
+                    entities += 1
+                    attrs_prop = entity.GetProperty("attributes")
+                    if attrs_prop and attrs_prop.IsList:
+                        attributes += len(list(attrs_prop.GetValues()))
+                for name in ("associations", "crossAssociations"):
+                    prop = dm.GetProperty(name)
+                    if prop and prop.IsList:
+                        associations += len(list(prop.GetValues()))
+            self._counts = (entities, attributes, associations)
+        entities, attributes, associations = self._counts
+        return (entities * _ENTITY_BYTES[level] + attributes * _ATTRIBUTE_BYTES[level]
+                + associations * _ASSOCIATION_BYTES)
 
     def _generate_entity(self, entity, id_map: Dict[str, str]):
         """Generate DSL for single entity using untyped API"""
@@ -191,32 +398,36 @@ class DomainModelAnalyzer:
         name_prop = entity.GetProperty("name")
         entity_name = name_prop.Value if name_prop else "Unknown"
 
-        self.lines.append(f"## Entity: {entity_name}{p_tag}{gen_info}")
+        yield f"## Entity: {entity_name}{p_tag}{gen_info}"
+
+        level = self.options.detail_level
+        if level == "names":
+            return
 
         # Get documentation
-        doc_prop = entity.GetProperty("documentation")
+        doc_prop = entity.GetProperty("documentation") if level != "brief" else None
         if self.options.include_documentation and doc_prop and doc_prop.Value:
-            self.lines.append(f"> {doc_prop.Value}")
+            yield f"> {doc_prop.Value}"
 
         # Get location
         if self.options.include_location:
             loc_prop = entity.GetProperty("location")
             if loc_prop and loc_prop.Value:
                 loc = loc_prop.Value
-                self.lines.append(f"> Position: ({loc.X}, {loc.Y})")
+                yield f"> Position: ({loc.X}, {loc.Y})"
 
         # Get attributes using untyped API
         attrs_prop = entity.GetProperty("attributes")
         if attrs_prop and attrs_prop.IsList:
             for attr in attrs_prop.GetValues():
-                self._generate_attribute(attr)
+                yield from self._generate_attribute(attr)
 
         # Get event handlers using untyped API
         handlers_prop = entity.GetProperty("eventHandlers")
         if handlers_prop and handlers_prop.IsList and self.options.detail_level == "detailed":
             event_handlers = list(handlers_prop.GetValues())
             if event_handlers:
-                self.lines.append("\n**Event Handlers:**")
+                yield "\n**Event Handlers:**"
                 for handler in event_handlers:
                     # Get event type
                     event_prop = handler.GetProperty("event") if hasattr(handler, "GetProperty") else None
@@ -225,10 +436,12 @@ class DomainModelAnalyzer:
                     # Get microflow name
                     mf_prop = handler.GetProperty("microflow") if hasattr(handler, "GetProperty") else None
                     mf_name = mf_prop.Value if mf_prop and mf_prop.Value else "None"
-                    self.lines.append(f"  - {event_str}: {mf_name}")
+                    yield f"  - {event_str}: {mf_name}"
 
     def _check_is_persistable(self, entity) -> bool:
         """Check if entity is persistable, considering generalization"""
+        if self.generalizations is not None:
+            return self.generalizations.is_persistable(entity)
         try:
             gen_prop = entity.GetProperty("generalization")
             if not gen_prop or not gen_prop.Value:
@@ -240,8 +453,7 @@ class DomainModelAnalyzer:
             if hasattr(gen, "GetProperty"):
                 parent_qname_prop = gen.GetProperty("generalization")
                 if parent_qname_prop and parent_qname_prop.Value:
-                    # Has parent entity
-                    # For untyped API, we can't easily resolve parent entities recursively
+                    # Has parent entity; resolving it needs the context's generalization index
                     # Conservatively return True (parent entities typically persistable)
                     return True
 
@@ -279,10 +491,10 @@ class DomainModelAnalyzer:
         attr_name = name_prop.Value if name_prop else "Unknown"
 
         # Get documentation
-        doc_prop = attr.GetProperty("documentation")
+        doc_prop = attr.GetProperty("documentation") if self.options.detail_level != "brief" else None
         doc = f" // {doc_prop.Value}" if (self.options.include_documentation and doc_prop and doc_prop.Value) else ""
 
-        self.lines.append(f"- {attr_name}: {type_name}{doc}")
+        yield f"- {attr_name}: {type_name}{doc}"
 
         if self.options.detail_level == "detailed":
             # Add default value if present
@@ -291,7 +503,7 @@ class DomainModelAnalyzer:
                 if value_prop and value_prop.Value:
                     default_val_prop = value_prop.Value.GetProperty("defaultValue") if hasattr(value_prop.Value, "GetProperty") else None
                     if default_val_prop and default_val_prop.Value:
-                        self.lines.append(f"  Default: {default_val_prop.Value}")
+                        yield f"  Default: {default_val_prop.Value}"
             except:
                 pass
 
@@ -346,81 +558,144 @@ class DomainModelAnalyzer:
         except Exception:
             return "Unknown"
 
-    def _generate_association(self, association, id_map: Dict[str, str]):
-        """Generate association DSL using untyped API"""
+    def _association_fields(self, association, id_map: Dict[str, str], cross: bool) -> Dict[str, str]:
+        """Name, parent/child qualified names, type and owner of an association using untyped API"""
         # Get parent and child via properties
-        parent_id_prop = association.GetProperty("parent") if hasattr(association, "GetProperty") else None
-        child_id_prop = association.GetProperty("child") if hasattr(association, "GetProperty") else None
-
-        parent_id = str(parent_id_prop.Value.ID) if parent_id_prop and parent_id_prop.Value and hasattr(parent_id_prop.Value, "ID") else "Unknown"
-        child_id = str(child_id_prop.Value.ID) if child_id_prop and child_id_prop.Value and hasattr(child_id_prop.Value, "ID") else "Unknown"
-
-        parent_name = id_map.get(parent_id, "Unknown")
-        child_name = id_map.get(child_id, "Unknown")
+        parent_prop = association.GetProperty("parent") if hasattr(association, "GetProperty") else None
+        child_prop = association.GetProperty("child") if hasattr(association, "GetProperty") else None
 
-        # Simplify names (remove module prefix)
-        parent_short = parent_name.split(".")[-1] if "." in parent_name else parent_name
-        child_short = child_name.split(".")[-1] if "." in child_name else child_name
+        parent = parent_prop.Value if parent_prop else None
+        parent_name = id_map.get(parent.ID.ToString(), "Unknown") if parent is not None and hasattr(parent, "ID") else "Unknown"
+        if cross:
+            # For cross associations, child is a qualified name string
+            child_name = str(child_prop.Value) if child_prop and child_prop.Value else "Unknown"
+        else:
+            child = child_prop.Value if child_prop else None
+            child_name = id_map.get(child.ID.ToString(), "Unknown") if child is not None and hasattr(child, "ID") else "Unknown"
 
         # Get association name
         name_prop = association.GetProperty("name")
-        assoc_name = name_prop.Value if name_prop else "Unknown"
 
         # Get owner and type
         owner_prop = association.GetProperty("owner")
-        owner = str(owner_prop.Value).split(".")[-1] if owner_prop and owner_prop.Value else "Unknown"
-
         type_prop = association.GetProperty("type")
-        assoc_type = str(type_prop.Value).split(".")[-1] if type_prop and type_prop.Value else "Unknown"
+        return {
+            "name": name_prop.Value if name_prop else "Unknown",
+            "parent": parent_name,
+            "child": child_name,
+            "type": str(type_prop.Value).split(".")[-1] if type_prop and type_prop.Value else "Unknown",
+            "owner": str(owner_prop.Value).split(".")[-1] if owner_prop and owner_prop.Value else "Unknown",
+        }
 
-        self.lines.append(f"- [Assoc] {assoc_name}: {parent_short} -> {child_short} [Type:{assoc_type}, Owner:{owner}]")
+    def _generate_association(self, association, id_map: Dict[str, str]):
+        """Generate association DSL using untyped API"""
+        fields = self._association_fields(association, id_map, cross=False)
+        # Simplify names (remove module prefix)
+        parent_short = fields["parent"].split(".")[-1]
+        child_short = fields["child"].split(".")[-1]
+        return f"- [Assoc] {fields['name']}: {parent_short} -> {child_short} [Type:{fields['type']}, Owner:{fields['owner']}]"
 
     def _generate_cross_association(self, association, id_map: Dict[str, str]):
         """Generate cross-association DSL using untyped API"""
-        # Get parent via properties
-        parent_id_prop = association.GetProperty("parent") if hasattr(association, "GetProperty") else None
-        parent_id = str(parent_id_prop.Value.ID) if parent_id_prop and parent_id_prop.Value and hasattr(parent_id_prop.Value, "ID") else "Unknown"
-
-        parent_name = id_map.get(parent_id, "Unknown")
-        parent_short = parent_name.split(".")[-1] if "." in parent_name else parent_name
-
-        # Get child - for cross associations, child might be a qualified name string
-        child_prop = association.GetProperty("child") if hasattr(association, "GetProperty") else None
-        if child_prop and child_prop.Value:
-            child_name = str(child_prop.Value)
-        else:
-            child_name = "Unknown"
-
-        # Get association name
-        name_prop = association.GetProperty("name")
-        assoc_name = name_prop.Value if name_prop else "Unknown"
-
-        # Get owner and type
-        owner_prop = association.GetProperty("owner")
-        owner = str(owner_prop.Value).split(".")[-1] if owner_prop and owner_prop.Value else "Unknown"
+        fields = self._association_fields(association, id_map, cross=True)
+        parent_short = fields["parent"].split(".")[-1]
+        return f"- [Cross] {fields['name']}: {parent_short} -> {fields['child']} [Type:{fields['type']}, Owner:{fields['owner']}]"
 
-        type_prop = association.GetProperty("type")
-        assoc_type = str(type_prop.Value).split(".")[-1] if type_prop and type_prop.Value else "Unknown"
-
-        self.lines.append(f"- [Cross] {assoc_name}: {parent_short} -> {child_name} [Type:{assoc_type}, Owner:{owner}]")
+    def iter_records(self, entity_names: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield one record per entity, attribute, event handler and association (see pymx.model.dsl_records)"""
+        domain_model = next(iter(self.module.GetUnitsOfType("DomainModels$DomainModel")), None)
+        if not domain_model:
+            yield dsl_records.error_record(f"Module '{self.module.Name}' has no domain model.")
+            return
 
+        module_name = self.module.Name
+        entities_prop = domain_model.GetProperty("entities")
+        entities = list(entities_prop.GetValues()) if entities_prop and entities_prop.IsList else []
+        if entity_names:
+            entities = [e for e in entities if e.Name in entity_names]
+        id_map = {ent.ID.ToString(): f"{module_name}.{ent.Name}" for ent in entities}
 
-def generate_domain_model_dsl(app, data: type_dsl.DomainModelDSLInput) -> str:
+        for entity in entities:
+            entity_id = entity.ID.ToString()
+            qname = id_map[entity_id]
+            doc_prop = entity.GetProperty("documentation")
+            gen_info = self._get_generalization_info(entity)
+            yield {
+                "kind": "entity", "id": entity_id, "module": module_name, "name": entity.Name,
+                "qualified_name": qname, "persistable": self._check_is_persistable(entity),
+                "generalization": gen_info[len(" extends "):] if gen_info else None,
+                "inheritance_depth": self.generalizations.depth(entity) if self.generalizations else None,
+                "documentation": (doc_prop.Value if doc_prop else None) or None,
+            }
+            attrs_prop = entity.GetProperty("attributes")
+            for attr in (attrs_prop.GetValues() if attrs_prop and attrs_prop.IsList else []):
+                attr_doc = attr.GetProperty("documentation")
+                default = None
+                value_prop = attr.GetProperty("value")
+                if value_prop and value_prop.Value and hasattr(value_prop.Value, "GetProperty"):
+                    default_prop = value_prop.Value.GetProperty("defaultValue")
+                    default = default_prop.Value if default_prop and default_prop.Value else None
+                yield {
+                    "kind": "attribute", "id": attr.ID.ToString(), "entity": qname, "name": attr.Name,
+                    "type": self._get_attribute_type_string(attr),
+                    "documentation": (attr_doc.Value if attr_doc else None) or None, "default": default,
+                }
+            handlers_prop = entity.GetProperty("eventHandlers")
+            for handler in (handlers_prop.GetValues() if handlers_prop and handlers_prop.IsList else []):
+                event_prop = handler.GetProperty("event")
+                mf_prop = handler.GetProperty("microflow")
+                yield {
+                    "kind": "event_handler", "entity": qname,
+                    "event": str(event_prop.Value).split(".")[-1] if event_prop and event_prop.Value else None,
+                    "microflow": (mf_prop.Value if mf_prop else None) or None,
+                }
+
+        for name, cross in (("associations", False), ("crossAssociations", True)):
+            prop = domain_model.GetProperty(name)
+            for assoc in (prop.GetValues() if prop and prop.IsList else []):
+                record = {"kind": "association", "id": assoc.ID.ToString(), "module": module_name, "cross_module": cross}
+                record.update(self._association_fields(assoc, id_map, cross))
+                yield record
+
+
+def iter_domain_model_dsl(app, data: type_dsl.DomainModelDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the domain model DSL line by line (see DomainModelAnalyzer.iter_lines)."""
     try:
-        from pymx.mcp import mendix_context as ctx
-        untypedRoot = ctx.untypedModelAccessService.GetUntypedModel(app)
-        # Find module
-        modules = untypedRoot.GetUnitsOfType("Projects$Module")
-        module = next((m for m in modules if m.Name == data.module_name), None)
+        # Find module via the shared qualified-name index
+        context = _get_context(app, snapshot)
+        module = context.get_unit(data.module_name, "Projects$Module")
 
         if not module:
-            return f"Error: Module '{data.module_name}' not found."
+            yield _error(data, f"Error: Module '{data.module_name}' not found.")
+            return
 
-        analyzer = DomainModelAnalyzer(app, module, data.format_options)
-        return analyzer.generate(data.entity_names)
+        # Entities and associations live in the module's DomainModel unit
+        domain_model = next(iter(module.GetUnitsOfType("DomainModels$DomainModel")), None) or module
+        # Persistability inherited from another module's entity ties the document to that module too
+        scope = (dsl_cache.SCOPE_GLOBAL if context.get_generalization_index().external_dependencies(module.Name)
+                 else dsl_cache.SCOPE_UNIT)
+        if _structured(data):
+            analyzer = DomainModelAnalyzer(app, module, data.format_options, context)
+            yield from _record_stream("domain", domain_model, data, snapshot,
+                                      lambda: analyzer.iter_records(data.entity_names), scope)
+            return
+        sizer = DomainModelAnalyzer(app, module, data.format_options, context)
+
+        def render(options, budget, start):
+            analyzer = DomainModelAnalyzer(app, module, options, context)
+            return analyzer.iter_lines(data.entity_names, budget, start)
+
+        yield from _cached("domain", domain_model, data, snapshot,
+                           lambda: _budgeted(data, render,
+                                             lambda level: sizer.estimate_size(level, data.entity_names)),
+                           scope)
     except Exception as e:
         import traceback
-        return f"Error generating domain model DSL: {e}\n{traceback.format_exc()}"
+        yield _error(data, f"Error generating domain model DSL: {e}\n{traceback.format_exc()}")
+
+
+def generate_domain_model_dsl(app, data: type_dsl.DomainModelDSLInput, snapshot=None) -> str:
+    return _join(data, iter_domain_model_dsl(app, data, snapshot))
 
 
 # ==========================================
@@ -428,21 +703,31 @@ def generate_domain_model_dsl(app, data: type_dsl.DomainModelDSLInput) -> str:
 # ==========================================
 
 
+_MICROFLOW_HEADER_BYTES = 64
+_MICROFLOW_NODE_BYTES = {"detailed": 64, "standard": 64, "brief": 36, "names": 36}
+
+
 class MicroflowAnalyzer:
     """Generates DSL visualization for microflows with ASCII art flow"""
 
-    def __init__(self, app, module, microflow, options: type_dsl.DSLFormatOptions):
+    def __init__(self, app, module, microflow, options: type_dsl.DSLFormatOptions, context: Optional[MendixContext] = None):
         self.app = app
         self.module = module
         self.microflow = microflow
         self.options = options
-        self.lines = []
+        # Shared wrapping context: its identity map ensures every flow/object is wrapped once
+        self.context = context or MendixContext(app, None)
 
     def generate(self, include_expressions: bool = True) -> str:
         """Generate microflow DSL with activity flow"""
+        return "\n".join(self.iter_lines(include_expressions))
+
+    def iter_lines(self, include_expressions: bool = True) -> Iterator[str]:
+        """Yield the microflow DSL line by line while the flow is traversed"""
 
         module_name = self.module.Name
-        self.lines = [
+        # Pending header lines; emptied once they have been yielded
+        header = [
             f"# Microflow DSL: {module_name}.{self.microflow.Name}",
             "",
             "```"
@@ -453,74 +738,38 @@ class MicroflowAnalyzer:
             model_prop = self.microflow.GetProperty("model")
             # @CORE:MicroflowDSL - 使用 ElementFactory 动态代理 untyped microflow 对象，以简化属性访问。
             # This is crucial for accessing properties like object_collection and flows directly.
-            wrapped_microflow = ElementFactory.create(self.microflow, self.app)
+            wrapped_microflow = ElementFactory.create(self.microflow, self.context)
 
             if not wrapped_microflow.is_valid:
-                return f"{self.lines[0]}\n```Invalid microflow object.```"
-
-            # 直接访问动态代理后的 microflow 对象的 object_collection 和 flows 属性
-            # Access objects (activities, events)
-            object_collection = list(wrapped_microflow.object_collection.objects) if wrapped_microflow.object_collection and wrapped_microflow.object_collection.objects else []
-            nodes = {obj.id: obj for obj in object_collection}
-
-            # Access flows (connections between activities)
-            flows = list(wrapped_microflow.flows) if wrapped_microflow.flows else []
-
-            adj = defaultdict(list)
-            for flow in flows:
-                # 使用动态代理后的 flow 对象直接访问 origin 和 destination 属性
-                src = flow.origin.id if flow.origin and hasattr(flow.origin, 'id') else None
-                dst = flow.destination.id if flow.destination and hasattr(flow.destination, 'id') else None
-                if src and dst:
-                    adj[src].append((flow, dst))
-
-            # Find start node
-            start_node = next((obj for obj in nodes.values() if "StartEvent" in obj.type_name), None)
-
-            if not start_node:
-                return f"{self.lines[0]}\n```No start event found.```"
-
-            # Traverse flow
-            visited = set()
-            stack = [(start_node.id, 0, "")]
-
-            while stack:
-                node_id, indent, flow_label = stack.pop()
-                node = nodes.get(node_id)
-
-                if not node:
-                    continue
+                yield header[0]
+                yield "```Invalid microflow object.```"
+                return
 
-                label_str = f"--({flow_label})--> " if flow_label else ""
-                self.lines.append(f"{'  ' * indent}{label_str}{self._get_activity_summary(node, wrapped_microflow, include_expressions)}")
+            # 控制流图按微流缓存在上下文中 (pymx.model.microflow_cfg)，分支/循环/合并点已预先计算
+            cfg = self.context.get_microflow_cfg(self.microflow)
 
-                if node_id in visited:
-                    self.lines.append(f"{'  ' * (indent + 1)}(Jump/Loop)")
-                    continue
-                visited.add(node_id)
+            if not any(cfg.nodes[entry].type == microflow_cfg.START_EVENT for entry in cfg.entries):
+                yield header[0]
+                yield "```No start event found.```"
+                return
 
-                out_flows = adj.get(node_id, [])
-                has_branches = len(out_flows) > 1
+            yield from header
+            header = []
 
-                for flow, target_id in reversed(out_flows):
-                    case_val = ""
-                    if has_branches and flow.case_values:
-                        # @CORE:MicroflowDSL - 使用动态代理后的 flow 对象直接访问 case_values。
-                        # Access case_values directly from the proxied flow object.
-                        cv = flow.case_values[0]
-                        case_val = getattr(cv, "value", cv.type_name)
+            # Structured traversal: if/else, switch, on error and loop blocks, every object once
+            def summarize(node):
+                return self._get_activity_summary(ElementFactory.create(node.raw, self.context),
+                                                  wrapped_microflow, include_expressions)
 
-                    new_indent = indent + 1 if has_branches else indent
-                    stack.append((target_id, new_indent, case_val))
+            yield from microflow_cfg.iter_structured(cfg, summarize)
 
-            self.lines.append("```")
-            return "\n".join(self.lines)
+            yield "```"
 
         except Exception as e:
             import traceback
             error_msg = f"Error generating microflow DSL: {e}\n{traceback.format_exc()}"
-            self.lines.append(f"```Error: {error_msg}```")
-            return "\n".join(self.lines)
+            yield from header
+            yield f"```Error: {error_msg}```"
 
 
     def _get_activity_summary(self, obj, wrapped_microflow, include_expressions: bool) -> str:
@@ -620,12 +869,25 @@ class MicroflowAnalyzer:
                     return f"Decision: {expr[:50]}"
                 return "Decision"
 
-            elif "LoopBreak" in obj_type:
+            elif "InheritanceSplit" in obj_type:
+                variable = obj.split_variable_name
+                return f"Split: ${variable}" if variable else "Split"
+
+            elif "LoopedActivity" in obj_type:
+                return self._get_loop_summary(obj, include_expressions)
+
+            elif "ExclusiveMerge" in obj_type:
+                return "Merge"
+
+            elif "LoopBreak" in obj_type or "BreakEvent" in obj_type:
                 return "Break"
 
-            elif "LoopContinue" in obj_type:
+            elif "LoopContinue" in obj_type or "ContinueEvent" in obj_type:
                 return "Continue"
 
+            elif "ErrorEvent" in obj_type:
+                return "Error"
+
             elif "SequenceFlow" in obj_type:
                 return "→"
 
@@ -638,48 +900,107 @@ class MicroflowAnalyzer:
         except Exception as e:
             return f"[{obj_type}: Error: {e}]"
 
+    def iter_records(self, include_expressions: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield one record per activity (object) and sequence flow of the control-flow graph"""
+        qname = f"{self.module.Name}.{self.microflow.Name}"
+        wrapped_microflow = ElementFactory.create(self.microflow, self.context)
+        cfg = self.context.get_microflow_cfg(self.microflow)
+        yield {"kind": "microflow", "id": self.microflow.ID.ToString(), "qualified_name": qname,
+               "objects": sum(1 for _ in cfg.walk())}
+
+        # Loop bodies are nested graphs: their records name the enclosing loop
+        pending = [(cfg, None)]
+        while pending:
+            graph, loop_id = pending.pop(0)
+            for node in graph.nodes:
+                summary = self._get_activity_summary(ElementFactory.create(node.raw, self.context),
+                                                     wrapped_microflow, include_expressions)
+                yield {"kind": "activity", "id": node.id, "microflow": qname, "type": node.type_name,
+                       "loop": loop_id, "summary": summary}
+                if node.body is not None:
+                    pending.append((node.body, node.id))
+            for edge in graph.edges:
+                yield {"kind": "flow", "microflow": qname, "source": graph.nodes[edge.source].id,
+                       "target": graph.nodes[edge.target].id, "case": edge.case or None,
+                       "error_handler": edge.is_error}
+
+    def _get_loop_summary(self, obj, include_expressions: bool) -> str:
+        """Describe what a LoopedActivity iterates over (for-each list or while condition)"""
+        source = getattr(obj, "loop_source", None)
+        if source is not None and "WhileLoopCondition" in source.type_name:
+            expr = source.while_expression or ""
+            return f"While: {expr[:50]}" if include_expressions else "While"
+        if source is not None:
+            list_name, item_name = source.list_variable_name, source.variable_name
+        else:
+            # Older models keep the iteration variables on the loop itself
+            list_name = getattr(obj, "iterated_list_variable_name", None)
+            item_name = getattr(obj, "loop_variable_name", None)
+        return f"For each ${item_name} in ${list_name}"
+
 # TODO: DSL的输出能与对应的工具输入对齐，为LLM提供参考价值
-def generate_microflow_dsl(app, data: type_dsl.MicroflowDSLInput) -> str:
-    """Generate DSL for microflow"""
+def iter_microflow_dsl(app, data: type_dsl.MicroflowDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the microflow DSL line by line"""
+    from pymx.mcp import mendix_context as ctx
     try:
-        from pymx.mcp import mendix_context as ctx
         # Parse qualified name
         parts = data.qualified_name.split(".")
         if len(parts) < 2:
             error_msg = f"Error: Invalid qualified name '{data.qualified_name}'. Expected format: Module.MicroflowName"
             ctx.log(error_msg)
-            return error_msg
+            yield _error(data, error_msg)
+            return
 
         module_name = parts[0]
         mf_name = parts[-1]
 
-        # Find module using untyped API (like generate_domain_model_dsl)
-        untypedRoot = ctx.untypedModelAccessService.GetUntypedModel(app)
-        modules = untypedRoot.GetUnitsOfType("Projects$Module")
-        module = next((m for m in modules if m.Name == module_name), None)
+        # Find module and microflow via the shared qualified-name index
+        context = _get_context(app, snapshot)
+        module = context.get_unit(module_name, "Projects$Module")
 
         if not module:
             error_msg = f"Error: Module '{module_name}' not found."
             ctx.log(error_msg)
-            return error_msg
+            yield _error(data, error_msg)
+            return
 
-        # Find microflow
-        microflows = list(module.GetUnitsOfType("Microflows$Microflow"))
-        microflow = next((mf for mf in microflows if mf.Name == mf_name), None)
+        microflow = _find_document(context, module, data.qualified_name, mf_name, "Microflows$Microflow")
 
         if not microflow:
             error_msg = f"Error: Microflow '{mf_name}' not found in module '{module_name}'."
             ctx.log(error_msg)
-            return error_msg
+            yield _error(data, error_msg)
+            return
+
+        if _structured(data):
+            analyzer = MicroflowAnalyzer(app, module, microflow, data.format_options, context)
+            yield from _record_stream("microflow", microflow, data, snapshot,
+                                      lambda: analyzer.iter_records(data.include_expressions))
+            return
+
+        def render(options, budget, start):
+            analyzer = MicroflowAnalyzer(app, module, microflow, options, context)
+            # Expressions are the first detail to go when the budget is tight
+            include_expressions = data.include_expressions and options.detail_level not in ("brief", "names")
+            return dsl_budget.bounded(analyzer.iter_lines(include_expressions), budget, options.detail_level, start)
+
+        def estimate(level):
+            # The control-flow graph is cached on the context and reused by the rendering
+            nodes = sum(1 for _ in context.get_microflow_cfg(microflow).walk())
+            return _MICROFLOW_HEADER_BYTES + nodes * _MICROFLOW_NODE_BYTES[level]
 
-        analyzer = MicroflowAnalyzer(app, module, microflow, data.format_options)
-        return analyzer.generate(data.include_expressions)
+        yield from _cached("microflow", microflow, data, snapshot, lambda: _budgeted(data, render, estimate))
 
     except Exception as e:
         import traceback
         error_msg = f"Error generating microflow DSL: {e}\n{traceback.format_exc()}"
         ctx.log(error_msg)
-        return error_msg
+        yield _error(data, error_msg)
+
+
+def generate_microflow_dsl(app, data: type_dsl.MicroflowDSLInput, snapshot=None) -> str:
+    """Generate DSL for microflow"""
+    return _join(data, iter_microflow_dsl(app, data, snapshot))
 
 
 # ==========================================
@@ -687,23 +1008,120 @@ def generate_microflow_dsl(app, data: type_dsl.MicroflowDSLInput) -> str:
 # ==========================================
 
 
+# Child slots per widget type: (label, property path). Each path step may be a
+# list or a single element; intermediate elements (grid rows/columns, template
+# grid contents, table cells...) are walked through without being rendered.
+# A labelled slot is rendered as a "label:" line above its widgets.
+_WIDGET_CHILDREN = {
+    "LayoutGrid": ((None, ("rows", "columns", "widgets")),),
+    "DataView": ((None, ("widgets",)), (None, ("contents", "widgets")), ("footer", ("footerWidgets",))),
+    "ListView": ((None, ("widgets",)), (None, ("contents", "widgets"))),
+    "TemplateGrid": (("control bar", ("controlBar", "items")), (None, ("contents", "widgets"))),
+    "DataGrid": (("control bar", ("controlBar", "items")),),
+    "TabContainer": ((None, ("tabPages",)),),
+    "TabPage": ((None, ("widgets",)),),
+    "ScrollContainer": ((None, ("center", "widgets")), ("left", ("left", "widgets")),
+                        ("right", ("right", "widgets")), ("top", ("top", "widgets")),
+                        ("bottom", ("bottom", "widgets"))),
+    "Table": ((None, ("cells", "widgets")),),
+    "NavigationList": ((None, ("items", "widgets")),),
+    "Header": (("left", ("leftWidgets",)), ("right", ("rightWidgets",))),
+    "SplitPane": ((None, ("firstWidget",)), (None, ("secondWidget",))),
+    "CustomWidget": ((None, ("object", "properties", "value", "widgets")),),
+}
+# Unknown widget types: generic containers keep their children in "widgets"
+_DEFAULT_WIDGET_CHILDREN = ((None, ("widgets",)),)
+
+# Referenced documents shown on the widget line instead of being expanded
+_WIDGET_REFERENCES = {
+    "SnippetCallWidget": ("Snippet", ("snippetCall", "snippet")),
+}
+
+DEFAULT_PAGE_MAX_DEPTH = 64
+DEFAULT_PAGE_MAX_NODES = 20000
+
+
+def _element_values(obj, name: str) -> list:
+    """Elements behind property `name` (list or single value); [] when absent"""
+    try:
+        prop = obj.GetProperty(name)
+    except Exception:
+        return []
+    if prop is None:
+        return []
+    if prop.IsList:
+        return list(prop.GetValues())
+    value = prop.Value
+    return [] if value is None else [value]
+
+
+def _property_value(obj, name: str):
+    try:
+        prop = obj.GetProperty(name)
+    except Exception:
+        return None
+    return prop.Value if prop is not None and not prop.IsList else None
+
+
+def _follow(obj, path) -> list:
+    """Elements reached from `obj` along a property path (lists are flattened)"""
+    values = [obj]
+    for step in path:
+        values = [value for current in values for value in _element_values(current, step)]
+    return values
+
+
+def _widget_slots(widget, widget_type: str) -> list:
+    """Non-empty child slots of a widget as (label, children) per _WIDGET_CHILDREN"""
+    slots = []
+    for label, child_path in _WIDGET_CHILDREN.get(widget_type, _DEFAULT_WIDGET_CHILDREN):
+        children = _follow(widget, child_path)
+        if children:
+            slots.append((label, children))
+    return slots
+
+
+def _widget_reference(widget, widget_type: str):
+    """(label, target) of the document a widget refers to, or None"""
+    reference = _WIDGET_REFERENCES.get(widget_type)
+    if reference is None:
+        return None
+    label, ref_path = reference
+    targets = _follow(widget, ref_path)
+    return (label, str(targets[0])) if targets else None
+
+
 class PageAnalyzer:
-    """Generates DSL for page widget tree structure"""
+    """Generates DSL for page widget tree structure.
 
-    def __init__(self, app, module, page, options: type_dsl.DSLFormatOptions):
+    The widget tree is walked with an explicit stack, following the child
+    slots declared in _WIDGET_CHILDREN, so deeply nested pages cannot hit
+    the recursion limit. Subtrees deeper than max_depth and widgets beyond
+    max_nodes are cut off with a notice naming the widget path.
+    """
+
+    def __init__(self, app, module, page, options: type_dsl.DSLFormatOptions,
+                 max_depth: int = DEFAULT_PAGE_MAX_DEPTH, max_nodes: int = DEFAULT_PAGE_MAX_NODES):
         self.app = app
         self.module = module
         self.page = page
         self.options = options
-        self.lines = []
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self._rendered = 0
+        self._truncated = False
 
     def generate(self, include_widget_properties: bool = False) -> str:
         """Generate page widget tree DSL"""
+        return "\n".join(self.iter_lines(include_widget_properties))
+
+    def iter_lines(self, include_widget_properties: bool = False) -> Iterator[str]:
+        """Yield the page widget tree DSL line by line"""
         module_name = self.module.Name
-        self.lines = [
-            f"# Page DSL: {module_name}.{self.page.Name}",
-            ""
-        ]
+        yield f"# Page DSL: {module_name}.{self.page.Name}"
+        yield ""
+        self._rendered = 0
+        self._truncated = False
 
         try:
             # Get layout call using untyped API pattern
@@ -715,102 +1133,181 @@ class PageAnalyzer:
                     for arg in arguments_prop.GetValues():
                         parameter_prop = arg.GetProperty("parameter")
                         param_name = parameter_prop.Value if parameter_prop else "Unknown"
-                        self.lines.append(f"## Placeholder: {param_name}")
-                        widgets_prop = arg.GetProperty("widgets")
-                        if widgets_prop and widgets_prop.IsList:
-                            for widget in widgets_prop.GetValues():
-                                self._render_widget(widget, 1, include_widget_properties)
-                        self.lines.append("")
+                        yield f"## Placeholder: {param_name}"
+                        yield from self._render_widgets(_element_values(arg, "widgets"), param_name,
+                                                        include_widget_properties)
+                        yield ""
             else:
                 # No layout call, try to get widgets directly
-                self.lines.append("## Widgets:")
+                yield "## Widgets:"
                 try:
                     widgets_prop = self.page.GetProperty("widgets")
                     if widgets_prop and widgets_prop.IsList:
-                        for widget in widgets_prop.GetValues():
-                            self._render_widget(widget, 1, include_widget_properties)
+                        yield from self._render_widgets(list(widgets_prop.GetValues()), self.page.Name,
+                                                        include_widget_properties)
                     else:
-                        self.lines.append("(No widgets found)")
+                        yield "(No widgets found)"
                 except:
-                    self.lines.append("(No widgets found or page uses legacy format)")
+                    yield "(No widgets found or page uses legacy format)"
 
-            return "\n".join(self.lines)
+            if self._truncated:
+                yield (f"(Page truncated: rendered {self._rendered} widgets; "
+                       f"limits max_depth={self.max_depth}, max_nodes={self.max_nodes})")
 
         except Exception as e:
             import traceback
-            return f"{self.lines[0]}\n\nError generating page DSL: {e}\n{traceback.format_exc()}"
-
-    def _render_widget(self, widget, indent: int, include_properties: bool):
-        """Render widget with indentation using untyped API pattern"""
-        # Get widget type from the raw object
-        widget_type = widget.Type.split("$")[-1] if hasattr(widget, "Type") else type(widget).__name__
-
-        # Get widget name using untyped API pattern
-        name_prop = widget.GetProperty("name") if hasattr(widget, "GetProperty") else None
-        widget_name = name_prop.Value if name_prop else ""
-
-        name_str = f" ({widget_name})" if widget_name else ""
-        self.lines.append(f"{'  ' * indent}- [{widget_type}]{name_str}")
-
-        if include_properties:
-            # Add caption property using untyped API pattern
-            caption_prop = widget.GetProperty("caption") if hasattr(widget, "GetProperty") else None
-            if caption_prop and caption_prop.Value:
-                self.lines.append(f"{'  ' * (indent + 1)}Caption: {caption_prop.Value}")
-
-        # Recursively render child widgets using untyped API pattern
-        if hasattr(widget, "GetProperty"):
-            widgets_prop = widget.GetProperty("widgets")
-            if widgets_prop and widgets_prop.IsList:
-                for child in widgets_prop.GetValues():
-                    self._render_widget(child, indent + 1, include_properties)
-            else:
-                # Try rows pattern (for LayoutGrid)
-                rows_prop = widget.GetProperty("rows")
-                if rows_prop and rows_prop.IsList:
-                    for row in rows_prop.GetValues():
-                        columns_prop = row.GetProperty("columns")
-                        if columns_prop and columns_prop.IsList:
-                            for col in columns_prop.GetValues():
-                                col_widgets_prop = col.GetProperty("widgets")
-                                if col_widgets_prop and col_widgets_prop.IsList:
-                                    for child in col_widgets_prop.GetValues():
-                                        self._render_widget(child, indent + 1, include_properties)
-
-
-def generate_page_dsl(app, data: type_dsl.PageDSLInput) -> str:
-    """Generate DSL for page"""
+            yield ""
+            yield f"Error generating page DSL: {e}\n{traceback.format_exc()}"
+
+    def _render_widgets(self, widgets: list, root_label: str, include_properties: bool) -> Iterator[str]:
+        """Render widget trees in document order with an explicit stack.
+
+        Stack entries are (widget, depth, path) or (label, depth, None) for a
+        slot heading; `path` is a linked (name, parent) tuple that is only
+        joined when a truncation notice needs it.
+        """
+        root = (root_label, None)
+        stack = [(widget, 1, root) for widget in reversed(widgets)]
+        while stack:
+            item, depth, path = stack.pop()
+            indent = '  ' * depth
+            if path is None:
+                yield f"{indent}{item}:"
+                continue
+
+            if self._truncated or self._rendered >= self.max_nodes:
+                self._truncated = True
+                pending = 1 + sum(1 for entry in stack if entry[2] is not None)
+                yield f"{indent}... ({pending} more widget subtree(s) not rendered: max_nodes={self.max_nodes} " \
+                      f"reached at {self._path_text(path)})"
+                return
+            self._rendered += 1
+
+            widget_type = item.Type.split("$")[-1]
+            widget_name = _property_value(item, "name")
+            name_str = f" ({widget_name})" if widget_name else ""
+            reference = _widget_reference(item, widget_type)
+            ref_str = f" -> {reference[0]}: {reference[1]}" if reference else ""
+            yield f"{indent}- [{widget_type}]{name_str}{ref_str}"
+
+            if include_properties:
+                caption = _property_value(item, "caption")
+                if caption:
+                    yield f"{indent}  Caption: {caption}"
+
+            widget_path = (widget_name or widget_type, path)
+            slots = _widget_slots(item, widget_type)
+            if not slots:
+                continue
+
+            if depth >= self.max_depth:
+                self._truncated = True
+                count = sum(len(children) for _, children in slots)
+                yield f"{indent}  ... ({count} child widget(s) not rendered: max_depth={self.max_depth} " \
+                      f"reached at {self._path_text(widget_path)})"
+                continue
+
+            # Push in reverse so the first slot's first child is rendered next
+            for label, children in reversed(slots):
+                child_depth = depth + 1 if label is None else depth + 2
+                stack.extend((child, child_depth, widget_path) for child in reversed(children))
+                if label is not None:
+                    stack.append((label, depth + 1, None))
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield one record per widget in document order, with the same child slots and limits as the text"""
+        qname = f"{self.module.Name}.{self.page.Name}"
+        placeholders = []
+        layout_call = _property_value(self.page, "layoutCall")
+        if layout_call is not None:
+            for arg in _element_values(layout_call, "arguments"):
+                placeholders.append((_property_value(arg, "parameter") or "Unknown", _element_values(arg, "widgets")))
+        else:
+            placeholders.append((None, _element_values(self.page, "widgets")))
+
+        rendered = 0
+        for placeholder, widgets in placeholders:
+            # Stack entries: (widget, depth, parent widget ID, slot label)
+            stack = [(widget, 1, None, None) for widget in reversed(widgets)]
+            while stack:
+                item, depth, parent_id, slot = stack.pop()
+                if rendered >= self.max_nodes:
+                    yield {"kind": "truncated", "page": qname, "reason": "max_nodes", "limit": self.max_nodes,
+                           "pending": 1 + len(stack)}
+                    return
+                rendered += 1
+                widget_id = item.ID.ToString()
+                widget_type = item.Type.split("$")[-1]
+                reference = _widget_reference(item, widget_type)
+                yield {"kind": "widget", "id": widget_id, "page": qname, "type": widget_type,
+                       "name": _property_value(item, "name") or None, "caption": _property_value(item, "caption"),
+                       "placeholder": placeholder, "parent": parent_id, "slot": slot, "depth": depth,
+                       "reference": reference[1] if reference else None}
+                slots = _widget_slots(item, widget_type)
+                if slots and depth >= self.max_depth:
+                    yield {"kind": "truncated", "page": qname, "reason": "max_depth", "limit": self.max_depth,
+                           "widget": widget_id, "children": sum(len(children) for _, children in slots)}
+                    continue
+                for label, children in reversed(slots):
+                    stack.extend((child, depth + 1, widget_id, label) for child in reversed(children))
+
+    @staticmethod
+    def _path_text(path) -> str:
+        names = []
+        while path is not None:
+            names.append(str(path[0]))
+            path = path[1]
+        return " > ".join(reversed(names))
+
+
+def iter_page_dsl(app, data: type_dsl.PageDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the page DSL line by line"""
     try:
         from pymx.mcp import mendix_context as ctx
         # Parse qualified name
         parts = data.qualified_name.split(".")
         if len(parts) < 2:
-            return f"Error: Invalid qualified name '{data.qualified_name}'. Expected format: Module.PageName or Module.Folder.PageName"
+            yield _error(data, f"Error: Invalid qualified name '{data.qualified_name}'. Expected format: Module.PageName or Module.Folder.PageName")
+            return
 
         module_name = parts[0]
         page_name = parts[-1]
 
-        # Find module using untyped API (like generate_domain_model_dsl)
-        untypedRoot = ctx.untypedModelAccessService.GetUntypedModel(app)
-        modules = untypedRoot.GetUnitsOfType("Projects$Module")
-        module = next((m for m in modules if m.Name == module_name), None)
+        # Find module and page via the shared qualified-name index
+        context = _get_context(app, snapshot)
+        module = context.get_unit(module_name, "Projects$Module")
 
         if not module:
-            return f"Error: Module '{module_name}' not found."
+            yield _error(data, f"Error: Module '{module_name}' not found.")
+            return
 
-        # Find page
-        pages = list(module.GetUnitsOfType("Pages$Page"))
-        page = next((p for p in pages if p.Name == page_name), None)
+        page = _find_document(context, module, data.qualified_name, page_name, "Pages$Page")
 
         if not page:
-            return f"Error: Page '{page_name}' not found in module '{module_name}'."
+            yield _error(data, f"Error: Page '{page_name}' not found in module '{module_name}'.")
+            return
 
-        analyzer = PageAnalyzer(app, module, page, data.format_options)
-        return analyzer.generate(data.include_widget_properties)
+        if _structured(data):
+            analyzer = PageAnalyzer(app, module, page, data.format_options, data.max_depth, data.max_nodes)
+            yield from _record_stream("page", page, data, snapshot, analyzer.iter_records)
+            return
+
+        def render(options, budget, start):
+            analyzer = PageAnalyzer(app, module, page, options, data.max_depth, data.max_nodes)
+            include_properties = data.include_widget_properties and options.detail_level not in ("brief", "names")
+            return dsl_budget.bounded(analyzer.iter_lines(include_properties), budget, options.detail_level, start)
+
+        # Widget counts are only known after the traversal: pages are cut, not estimated
+        yield from _cached("page", page, data, snapshot, lambda: _budgeted(data, render))
 
     except Exception as e:
         import traceback
-        return f"Error generating page DSL: {e}\n{traceback.format_exc()}"
+        yield _error(data, f"Error generating page DSL: {e}\n{traceback.format_exc()}")
+
+
+def generate_page_dsl(app, data: type_dsl.PageDSLInput, snapshot=None) -> str:
+    """Generate DSL for page"""
+    return _join(data, iter_page_dsl(app, data, snapshot))
 
 
 # ==========================================
@@ -826,33 +1323,32 @@ class WorkflowAnalyzer:
         self.module = module
         self.workflow = workflow
         self.options = options
-        self.lines = []
 
     def generate(self) -> str:
         """Generate workflow DSL"""
+        return "\n".join(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the workflow DSL line by line"""
         module_name = self.module.Name
-        self.lines = [
-            f"# Workflow DSL: {module_name}.{self.workflow.Name}",
-            ""
-        ]
+        yield f"# Workflow DSL: {module_name}.{self.workflow.Name}"
+        yield ""
 
         try:
             # Get workflow flow using untyped API pattern
             flow_prop = self.workflow.GetProperty("flow")
             if flow_prop and flow_prop.Value:
-                self.lines.append("```")
-                self._render_flow(flow_prop.Value, 0)
-                self.lines.append("```")
+                yield "```"
+                yield from self._render_flow(flow_prop.Value, 0)
+                yield "```"
             else:
-                self.lines.append("(No flow found)")
-
-            return "\n".join(self.lines)
+                yield "(No flow found)"
 
         except Exception as e:
             import traceback
-            return f"{self.lines[0]}\n```Error generating workflow DSL: {e}\n{traceback.format_exc()}```"
+            yield f"```Error generating workflow DSL: {e}\n{traceback.format_exc()}```"
 
-    def _render_flow(self, flow, indent: int):
+    def _render_flow(self, flow, indent: int) -> Iterator[str]:
         """Render workflow flow recursively using untyped API pattern"""
         if not flow:
             return
@@ -877,7 +1373,7 @@ class WorkflowAnalyzer:
             caption_str = f" {caption}" if caption else ""
             name_str = f" ({name})" if name else ""
 
-            self.lines.append(f"{'  ' * indent}- [{act_type}]{caption_str}{name_str}")
+            yield f"{'  ' * indent}- [{act_type}]{caption_str}{name_str}"
 
             # Handle outcomes (branches) using untyped API pattern
             outcomes_prop = act.GetProperty("outcomes") if hasattr(act, "GetProperty") else None
@@ -886,50 +1382,88 @@ class WorkflowAnalyzer:
                     # Get value using untyped API pattern
                     value_prop = outcome.GetProperty("value") if hasattr(outcome, "GetProperty") else None
                     val = value_prop.Value if value_prop else "Outcome"
-                    self.lines.append(f"{'  ' * (indent + 1)}└─ Case: {val}")
+                    yield f"{'  ' * (indent + 1)}└─ Case: {val}"
 
                     # Recursively render outcome flow using untyped API pattern
                     flow_prop = outcome.GetProperty("flow") if hasattr(outcome, "GetProperty") else None
                     if flow_prop and flow_prop.Value:
-                        self._render_flow(flow_prop.Value, indent + 2)
+                        yield from self._render_flow(flow_prop.Value, indent + 2)
 
 
-def generate_workflow_dsl(app, data: type_dsl.WorkflowDSLInput) -> str:
-    """Generate DSL for workflow"""
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield one record per workflow activity; branch activities name their outcome"""
+        qname = f"{self.module.Name}.{self.workflow.Name}"
+        flow_prop = self.workflow.GetProperty("flow")
+        if flow_prop and flow_prop.Value:
+            yield from self._flow_records(flow_prop.Value, qname, 0, None, None)
+
+    def _flow_records(self, flow, qname: str, depth: int, parent_id, outcome) -> Iterator[Dict[str, Any]]:
+        activities_prop = flow.GetProperty("activities")
+        if not activities_prop or not activities_prop.IsList:
+            return
+        for act in activities_prop.GetValues():
+            act_id = act.ID.ToString()
+            yield {"kind": "activity", "id": act_id, "workflow": qname, "type": act.Type.split("$")[-1],
+                   "caption": _property_value(act, "caption") or None, "name": _property_value(act, "name") or None,
+                   "depth": depth, "parent": parent_id, "outcome": outcome}
+            for branch in _element_values(act, "outcomes"):
+                branch_flow = _property_value(branch, "flow")
+                if branch_flow is not None:
+                    yield from self._flow_records(branch_flow, qname, depth + 1, act_id,
+                                                  _property_value(branch, "value") or "Outcome")
+
+
+def iter_workflow_dsl(app, data: type_dsl.WorkflowDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the workflow DSL line by line"""
     try:
         from pymx.mcp import mendix_context as ctx
         # Parse qualified name
         parts = data.qualified_name.split(".")
         if len(parts) < 2:
-            return f"Error: Invalid qualified name '{data.qualified_name}'. Expected format: Module.WorkflowName"
+            yield _error(data, f"Error: Invalid qualified name '{data.qualified_name}'. Expected format: Module.WorkflowName")
+            return
 
         module_name = parts[0]
         wf_name = parts[-1]
 
-        # Find module using untyped API (like generate_domain_model_dsl)
-        untypedRoot = ctx.untypedModelAccessService.GetUntypedModel(app)
-        modules = untypedRoot.GetUnitsOfType("Projects$Module")
-        module = next((m for m in modules if m.Name == module_name), None)
+        # Find module and workflow via the shared qualified-name index
+        context = _get_context(app, snapshot)
+        module = context.get_unit(module_name, "Projects$Module")
 
         if not module:
-            return f"Error: Module '{module_name}' not found."
+            yield _error(data, f"Error: Module '{module_name}' not found.")
+            return
 
         # Find workflow
         try:
-            workflows = list(module.GetUnitsOfType("Workflows$Workflow"))
-            workflow = next((wf for wf in workflows if wf.Name == wf_name), None)
+            workflow = _find_document(context, module, data.qualified_name, wf_name, "Workflows$Workflow")
 
             if not workflow:
-                return f"Error: Workflow '{wf_name}' not found in module '{module_name}'. Note: Workflows require Mendix 9.24+."
+                yield _error(data, f"Error: Workflow '{wf_name}' not found in module '{module_name}'. Note: Workflows require Mendix 9.24+.")
+                return
         except Exception:
-            return f"Error: Workflows are not supported in this Mendix version (requires 9.24+)."
+            yield _error(data, f"Error: Workflows are not supported in this Mendix version (requires 9.24+).")
+            return
+
+        if _structured(data):
+            analyzer = WorkflowAnalyzer(app, module, workflow, data.format_options)
+            yield from _record_stream("workflow", workflow, data, snapshot, analyzer.iter_records)
+            return
+
+        def render(options, budget, start):
+            analyzer = WorkflowAnalyzer(app, module, workflow, options)
+            return dsl_budget.bounded(analyzer.iter_lines(), budget, options.detail_level, start)
 
-        analyzer = WorkflowAnalyzer(app, module, workflow, data.format_options)
-        return analyzer.generate()
+        yield from _cached("workflow", workflow, data, snapshot, lambda: _budgeted(data, render))
 
     except Exception as e:
         import traceback
-        return f"Error generating workflow DSL: {e}\n{traceback.format_exc()}"
+        yield _error(data, f"Error generating workflow DSL: {e}\n{traceback.format_exc()}")
+
+
+def generate_workflow_dsl(app, data: type_dsl.WorkflowDSLInput, snapshot=None) -> str:
+    """Generate DSL for workflow"""
+    return _join(data, iter_workflow_dsl(app, data, snapshot))
 
 
 # ==========================================
@@ -937,14 +1471,18 @@ def generate_workflow_dsl(app, data: type_dsl.WorkflowDSLInput) -> str:
 # ==========================================
 
 
+_TREE_LINE_BYTES = {"detailed": 44, "standard": 44, "brief": 30, "names": 22}
+
+
 class ModuleTreeAnalyzer:
     """Generates DSL for module file/folder structure"""
 
-    def __init__(self, app, module, options: type_dsl.DSLFormatOptions):
+    def __init__(self, app, module, options: type_dsl.DSLFormatOptions, context: Optional[MendixContext] = None):
         self.app = app
         self.module = module
         self.options = options
-        self.lines = []
+        # The folder tree is built once per module and cached on the context
+        self.context = context or MendixContext(app, None)
         self.alias_map = {
             "Microflows$Microflow": "Microflow",
             "Pages$Page": "Page",
@@ -959,98 +1497,95 @@ class ModuleTreeAnalyzer:
 
     def generate(self, include_system_elements: bool = False) -> str:
         """Generate module tree DSL"""
-        self.lines = [
-            f"# Module Tree DSL: {self.module.Name}",
-            "```"
-        ]
+        return "\n".join(self.iter_lines(include_system_elements))
+
+    def iter_lines(self, include_system_elements: bool = False) -> Iterator[str]:
+        """Yield the module tree DSL line by line"""
+        yield f"# Module Tree DSL: {self.module.Name}"
+        yield "```"
 
         try:
             # Start from module root
-            self._render_container(self.module, 0, include_system_elements)
+            yield from self._render_container(self.module, 0, include_system_elements)
 
-            self.lines.append("```")
-            return "\n".join(self.lines)
+            yield "```"
 
         except Exception as e:
             import traceback
-            return f"{self.lines[0]}\n```Error generating module tree DSL: {e}\n{traceback.format_exc()}```"
-
-    def _render_container(self, container, indent: int, include_system: bool):
-        """Render container (module or folder) contents using untyped API pattern"""
-        try:
-            all_units = list(container.GetUnits())
-        except:
-            all_units = []
-
-        # Track descendant IDs to avoid duplicates
-        descendant_ids: Set[str] = set()
-
-        # First, collect all descendant IDs
-        for unit in all_units:
-            unit_type = unit.Type
-            if unit_type == "Projects$Folder":
-                self._collect_descendant_ids(unit, descendant_ids)
-
-        # Filter direct units (not descendants of folders) using untyped API pattern
-        direct_units = []
-        for u in all_units:
-            if u.ID.ToString() not in descendant_ids:
-                name_prop = u.GetProperty("name") if hasattr(u, "GetProperty") else None
-                if name_prop and name_prop.Value:
-                    direct_units.append(u)
-
-        # Separate folders from documents
-        direct_folders = [u for u in direct_units if u.Type == "Projects$Folder"]
-        direct_docs = [u for u in direct_units if u.Type != "Projects$Folder"]
-
-        # Render documents using untyped API pattern
-        for doc in sorted(direct_docs, key=lambda x: x.GetProperty("name").Value if hasattr(x, "GetProperty") and x.GetProperty("name") else ""):
-            # Filter system elements if needed
-            name_prop = doc.GetProperty("name") if hasattr(doc, "GetProperty") else None
-            doc_name = name_prop.Value if name_prop else ""
-            if not include_system and doc_name.startswith("_"):
-                continue
-
-            full_type = doc.Type
-            # type_label = self.alias_map.get(full_type, full_type.split("$")[-1])
-            self.lines.append(f"{'  ' * indent}[{full_type}] {doc_name}")
+            yield f"```Error generating module tree DSL: {e}\n{traceback.format_exc()}```"
+
+    def _render_container(self, container, indent: int, include_system: bool) -> Iterator[str]:
+        """Render container (module or folder) contents from the module's parent -> children map"""
+        tree = self.context.get_module_tree(self.module)
+        container_id = None if container is self.module else container.ID.ToString()
+        detail = self.options.detail_level
+        for level, unit in tree.walk(container_id, indent):
+            unit_name = unit.Name
+            if unit.Type == module_tree.FOLDER_TYPE:
+                yield f"{'  ' * level}{unit_name}/" if detail == "names" else f"{'  ' * level}[Folder] {unit_name}"
+            elif include_system or not unit_name.startswith("_"):
+                # Filter system elements if needed
+                if detail == "names":
+                    yield f"{'  ' * level}{unit_name}"
+                elif detail == "brief":
+                    type_label = self.alias_map.get(unit.Type, unit.Type.split("$")[-1])
+                    yield f"{'  ' * level}[{type_label}] {unit_name}"
+                else:
+                    yield f"{'  ' * level}[{unit.Type}] {unit_name}"
 
-        # Render folders recursively using untyped API pattern
-        for folder in sorted(direct_folders, key=lambda x: x.GetProperty("name").Value if hasattr(x, "GetProperty") and x.GetProperty("name") else ""):
-            folder_name_prop = folder.GetProperty("name") if hasattr(folder, "GetProperty") else None
-            folder_name = folder_name_prop.Value if folder_name_prop else ""
-            self.lines.append(f"{'  ' * indent}[Folder] {folder_name}")
-            self._render_container(folder, indent + 1, include_system)
 
-    def _collect_descendant_ids(self, folder, id_set: Set[str]):
-        """Recursively collect all descendant unit IDs"""
-        try:
-            for unit in folder.GetUnits():
-                id_set.add(unit.ID.ToString())
-                if unit.Type == "Projects$Folder":
-                    self._collect_descendant_ids(unit, id_set)
-        except:
-            pass
+    def iter_records(self, include_system_elements: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield one record per folder and document, in tree order, with its folder path"""
+        tree = self.context.get_module_tree(self.module)
+        module_name = self.module.Name
+        for level, unit in tree.walk():
+            unit_name = unit.Name
+            is_folder = unit.Type == module_tree.FOLDER_TYPE
+            if not is_folder and not include_system_elements and unit_name.startswith("_"):
+                continue
+            yield {"kind": "folder" if is_folder else "document", "id": unit.ID.ToString(), "module": module_name,
+                   "name": unit_name, "type": unit.Type, "path": "/".join(tree.folder_path(unit)), "depth": level}
 
 
-def generate_module_tree_dsl(app, data: type_dsl.ModuleTreeDSLInput) -> str:
-    """Generate DSL for module file/folder tree"""
+def iter_module_tree_dsl(app, data: type_dsl.ModuleTreeDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the module file/folder tree DSL line by line"""
     try:
         from pymx.mcp import mendix_context as ctx
-        # Find module using untyped API (like generate_domain_model_dsl)
-        untypedRoot = ctx.untypedModelAccessService.GetUntypedModel(app)
-        modules = untypedRoot.GetUnitsOfType("Projects$Module")
-        module = next((m for m in modules if m.Name == data.module_name), None)
+        # Find module via the shared qualified-name index
+        context = _get_context(app, snapshot)
+        module = context.get_unit(data.module_name, "Projects$Module")
 
         if not module:
-            return f"Error: Module '{data.module_name}' not found."
+            yield _error(data, f"Error: Module '{data.module_name}' not found.")
+            return
 
-        analyzer = ModuleTreeAnalyzer(app, module, data.format_options)
-        return analyzer.generate(data.include_system_elements)
+        if _structured(data):
+            analyzer = ModuleTreeAnalyzer(app, module, data.format_options, context)
+            yield from _record_stream("module_tree", module, data, snapshot,
+                                      lambda: analyzer.iter_records(data.include_system_elements),
+                                      dsl_cache.SCOPE_GLOBAL)
+            return
+
+        def render(options, budget, start):
+            analyzer = ModuleTreeAnalyzer(app, module, options, context)
+            return dsl_budget.bounded(analyzer.iter_lines(data.include_system_elements), budget,
+                                      options.detail_level, start)
+
+        def estimate(level):
+            return len(context.get_module_tree(module)) * _TREE_LINE_BYTES[level]
+
+        # The tree spans every unit of the module: cached per global generation
+        yield from _cached("module_tree", module, data, snapshot, lambda: _budgeted(data, render, estimate),
+                           dsl_cache.SCOPE_GLOBAL)
 
     except Exception as e:
         import traceback
-        return f"Error generating module tree DSL: {e}\n{traceback.format_exc()}"
+        yield _error(data, f"Error generating module tree DSL: {e}\n{traceback.format_exc()}")
+
+
+def generate_module_tree_dsl(app, data: type_dsl.ModuleTreeDSLInput, snapshot=None) -> str:
+    """Generate DSL for module file/folder tree"""
+    return _join(data, iter_module_tree_dsl(app, data, snapshot))
 
 
 
@@ -1058,55 +1593,282 @@ def generate_module_tree_dsl(app, data: type_dsl.ModuleTreeDSLInput) -> str:
 # 6. JavaAction DSL Generator
 # ==========================================
 
+_JAVA_ACTION_BYTES = {"detailed": 100, "standard": 100, "brief": 100, "names": 32}
+
+
+def _java_action_record(module_name: str, action, memo: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Signature of a Java Action: parameters (name/type) and return type"""
+    return_type_prop = action.GetProperty("actionReturnType")
+    return_type_obj = return_type_prop.Value if return_type_prop else None
+
+    parameters = []
+    params_prop = action.GetProperty("actionParameters")
+    if params_prop and params_prop.IsList:
+        for param in params_prop.GetValues():
+            param_name = param.Name
+            param_type_prop = param.GetProperty("actionParameterType")
+
+            if not (param_name and param_type_prop and param_type_prop.Value):
+                continue
+
+            parameters.append({"name": param_name, "type": _get_type_as_string(param_type_prop.Value, memo)})
+
+    return {"kind": "java_action", "id": action.ID.ToString(), "module": module_name, "name": action.Name,
+            "qualified_name": f"{module_name}.{action.Name}", "parameters": parameters,
+            "return_type": _get_type_as_string(return_type_obj, memo)}
+
+
+def _iter_java_action_records(module, memo: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    for action in module.GetUnitsOfType("JavaActions$JavaAction"):
+        if action.Name:
+            yield _java_action_record(module.Name, action, memo)
+
+
+def _java_action_line(module_name: str, action, level: str, memo: Optional[Dict[str, str]] = None) -> str:
+    if level == "names":
+        return f"JAVA ACTION {action.Name}"
+    record = _java_action_record(module_name, action, memo)
+    params_output = ", ".join(f"{p['name']}: {p['type']}" for p in record["parameters"])
+    return f"JAVA ACTION {action.Name}({params_output}) -> {record['return_type']}"
+
+
+def _iter_java_actions(module, data: type_dsl.JavaActionDSLInput, level: str = "standard",
+                       memo: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    java_actions = list(module.GetUnitsOfType("JavaActions$JavaAction"))
+    if not java_actions:
+        yield f"No JavaAction found in module '{data.module_name}'."
+        return
+
+    for action in java_actions:
+        if action.Name:
+            yield _java_action_line(module.Name, action, level, memo)
+
+
 # @CORE:DSL.JavaAction - Generates DSL for Java Actions in a module.
-def generate_java_action_dsl(app, data: type_dsl.JavaActionDSLInput) -> str:
+def iter_java_action_dsl(app, data: type_dsl.JavaActionDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield one DSL line per Java Action in the module"""
     try:
-        from pymx.mcp import mendix_context as ctx
+        context = _get_context(app, snapshot)
+        module = context.get_unit(data.module_name, "Projects$Module")
 
-        results = []
-        untypedRoot = ctx.untypedModelAccessService.GetUntypedModel(app)
+        if not module:
+            yield _error(data, f"Error: Module '{data.module_name}' not found.")
+            return
 
-        modules = untypedRoot.GetUnitsOfType("Projects$Module")
-        module = next((m for m in modules if m.Name == data.module_name), None)
+        memo = context.type_string_memo()
+        if _structured(data):
+            yield from _record_stream("java_action", module, data, snapshot,
+                                      lambda: _iter_java_action_records(module, memo), dsl_cache.SCOPE_GLOBAL)
+            return
 
-        if not module:
-            return f"Error: Module '{data.module_name}' not found."
+        def render(options, budget, start):
+            return dsl_budget.bounded(_iter_java_actions(module, data, options.detail_level, memo), budget,
+                                      options.detail_level, start)
 
-        java_actions = list(module.GetUnitsOfType("JavaActions$JavaAction"))
-        if not java_actions:
-            return f"No JavaAction found in module '{data.module_name}'."
+        def estimate(level):
+            return len(list(module.GetUnitsOfType("JavaActions$JavaAction"))) * _JAVA_ACTION_BYTES[level]
 
-        for action in java_actions:
-            action_name = action.Name
-            if not action_name:
-                continue
+        # One line per Java Action unit of the module: cached per global generation
+        yield from _cached("java_action", module, data, snapshot, lambda: _budgeted(data, render, estimate),
+                           dsl_cache.SCOPE_GLOBAL)
+
+    except Exception as e:
+        import traceback
+        yield _error(data, f"Error generating Java Action DSL: {e}\n{traceback.format_exc()}")
 
-            return_type_prop = action.GetProperty("actionReturnType")
-            return_type_obj = return_type_prop.Value if return_type_prop else None
-            return_type_str = _get_type_as_string(return_type_obj)
 
-            param_strs = []
-            params_prop = action.GetProperty("actionParameters")
-            if params_prop and params_prop.IsList:
-                for param in params_prop.GetValues():
-                    param_name = param.Name
-                    param_type_prop = param.GetProperty("actionParameterType")
+def generate_java_action_dsl(app, data: type_dsl.JavaActionDSLInput, snapshot=None) -> str:
+    return _join(data, iter_java_action_dsl(app, data, snapshot))
+
+
+# DSL cache document ID of the app-wide catalog (it belongs to no single unit)
+_JAVA_ACTION_CATALOG_ID = "app:java_actions"
 
-                    if not (param_name and param_type_prop and param_type_prop.Value):
-                        continue
 
-                    param_type_obj = param_type_prop.Value
-                    param_type_str = _get_type_as_string(param_type_obj)
-                    param_strs.append(f"{param_name}: {param_type_str}")
+def _is_marketplace_module(module) -> bool:
+    """Module installed from the Marketplace (Projects$Module.fromAppStore)"""
+    prop = module.GetProperty("fromAppStore")
+    return bool(prop and prop.Value)
 
-            params_output = ", ".join(param_strs)
-            results.append(f"JAVA ACTION {action_name}({params_output}) -> {return_type_str}")
 
-        return "\n".join(results)
+def _java_action_catalog(context, data: type_dsl.JavaActionCatalogDSLInput):
+    """(module, from Marketplace, Java Actions) per module with Java Actions, sorted by module name"""
+    entries = []
+    modules = sorted((m for m in context.root.GetUnitsOfType("Projects$Module") if m.Name), key=lambda m: m.Name)
+    for module in modules:
+        marketplace = _is_marketplace_module(module)
+        if marketplace and not data.include_marketplace:
+            continue
+        actions = [action for action in module.GetUnitsOfType("JavaActions$JavaAction") if action.Name]
+        if actions:
+            entries.append((module, marketplace, actions))
+    return entries
+
+
+def _iter_java_action_catalog_records(entries, memo: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    for module, marketplace, actions in entries:
+        for action in actions:
+            record = _java_action_record(module.Name, action, memo)
+            record["marketplace"] = marketplace
+            yield record
+
+
+def _iter_java_action_catalog(entries, level: str, memo: Dict[str, str]) -> Iterator[str]:
+    total = sum(len(actions) for _, _, actions in entries)
+    marketplace = sum(1 for _, from_store, _ in entries if from_store)
+    yield "# Java Action Catalog"
+    yield f"# {total} Java actions in {len(entries)} modules ({marketplace} from the Marketplace)"
+    if not entries:
+        yield ""
+        yield "No JavaAction found in the app."
+    for module, from_store, actions in entries:
+        yield ""
+        yield f"## Module: {module.Name}{' [Marketplace]' if from_store else ''}"
+        for action in actions:
+            yield _java_action_line(module.Name, action, level, memo)
+
+
+def iter_java_action_catalog_dsl(app, data: type_dsl.JavaActionCatalogDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the Java Actions of every module (Marketplace modules flagged) in one pass"""
+    try:
+        context = _get_context(app, snapshot)
+        memo = context.type_string_memo()
+
+        if _structured(data):
+            yield from _record_stream(
+                "java_action_catalog", _JAVA_ACTION_CATALOG_ID, data, snapshot,
+                lambda: _iter_java_action_catalog_records(_java_action_catalog(context, data), memo),
+                dsl_cache.SCOPE_GLOBAL)
+            return
+
+        def document():
+            entries = _java_action_catalog(context, data)
+
+            def render(options, budget, start):
+                return dsl_budget.bounded(_iter_java_action_catalog(entries, options.detail_level, memo), budget,
+                                          options.detail_level, start)
+
+            def estimate(level):
+                return sum(len(actions) for _, _, actions in entries) * _JAVA_ACTION_BYTES[level]
+
+            return _budgeted(data, render, estimate)
+
+        # Spans every module: cached per global generation, i.e. until the model changes
+        yield from _cached("java_action_catalog", _JAVA_ACTION_CATALOG_ID, data, snapshot, document,
+                           dsl_cache.SCOPE_GLOBAL)
 
     except Exception as e:
         import traceback
-        return f"Error generating Java Action DSL: {e}\n{traceback.format_exc()}"
+        yield _error(data, f"Error generating Java Action catalog: {e}\n{traceback.format_exc()}")
+
+
+def generate_java_action_catalog_dsl(app, data: type_dsl.JavaActionCatalogDSLInput, snapshot=None) -> str:
+    return _join(data, iter_java_action_catalog_dsl(app, data, snapshot))
+
+
+# ==========================================
+# 7. App Domain Graph Generator
+# ==========================================
+
+
+def _graph_entity_record(entity: domain_graph.GraphEntity) -> Dict[str, Any]:
+    return {"kind": "entity", "id": entity.id, "module": entity.module, "name": entity.name,
+            "qualified_name": entity.qualified_name, "persistable": entity.persistable,
+            "generalization": entity.generalization, "inheritance_depth": entity.inheritance_depth}
+
+
+def _graph_association_record(assoc: domain_graph.GraphAssociation) -> Dict[str, Any]:
+    return {"kind": "association", "id": assoc.id, "module": assoc.module, "name": assoc.name,
+            "parent": assoc.parent, "child": assoc.child, "type": assoc.type, "owner": assoc.owner,
+            "cross_module": assoc.cross_module}
+
+
+def _iter_graph_records(selection: domain_graph.GraphSelection) -> Iterator[Dict[str, Any]]:
+    for entity in selection.entities:
+        yield _graph_entity_record(entity)
+    for assoc in selection.associations:
+        yield _graph_association_record(assoc)
+    for qname in selection.external:
+        yield {"kind": "external_entity", "qualified_name": qname}
+
+
+def _iter_graph_lines(selection: domain_graph.GraphSelection, data: type_dsl.AppDomainGraphDSLInput,
+                      level: str) -> Iterator[str]:
+    cross = sum(1 for assoc in selection.associations if assoc.cross_module)
+    yield "# App Domain Graph"
+    filters = []
+    if data.module_names:
+        filters.append(f"Modules: {', '.join(data.module_names)}")
+    if data.focus:
+        filters.append(f"Focus: {', '.join(data.focus)} ({data.hops} hops)")
+    if filters:
+        yield f"# {' | '.join(filters)}"
+    yield (f"# {len(selection.entities)} entities, {len(selection.associations)} associations "
+           f"({cross} cross-module), {len(selection.external)} external entities")
+
+    module = None
+    for entity in selection.entities:
+        if entity.module != module:
+            module = entity.module
+            yield ""
+            yield f"## Module: {module}"
+        if level == "names":
+            yield f"- {entity.name}"
+            continue
+        p_tag = " [Persistable]" if entity.persistable else " [Non-Persistable]"
+        gen_info = f" extends {entity.generalization}" if entity.generalization else ""
+        yield f"- {entity.name}{p_tag}{gen_info}"
+
+    if selection.associations:
+        yield ""
+        yield "## Associations"
+        for assoc in selection.associations:
+            line = f"- {assoc.qualified_name}: {assoc.parent} -> {assoc.child}"
+            if level != "names":
+                line += f" [{'Cross, ' if assoc.cross_module else ''}Type:{assoc.type}, Owner:{assoc.owner}]"
+            yield line
+
+    if selection.external:
+        yield ""
+        yield "## External Entities"
+        for qname in selection.external:
+            yield f"- {qname}"
+
+
+def iter_app_domain_graph_dsl(app, data: type_dsl.AppDomainGraphDSLInput, snapshot=None) -> Iterator[str]:
+    """Yield the entity-relationship graph of the whole app (optionally a module subset / neighborhood)"""
+    try:
+        graph = _get_context(app, snapshot).get_domain_graph()
+
+        missing = [name for name in (data.module_names or []) if name not in graph.modules]
+        missing += [qname for qname in (data.focus or []) if qname not in graph.entities]
+        if missing:
+            yield _error(data, f"Error: Not found in the domain models: {', '.join(missing)}.")
+            return
+
+        selection = graph.select(data.module_names, data.focus, data.hops)
+        # The graph spans every domain model; it is cached by the context, not the DSL cache
+        if _structured(data):
+            yield from _record_stream("app_domain_graph", None, data, snapshot,
+                                      lambda: _iter_graph_records(selection))
+            return
+
+        def render(options, budget, start):
+            return dsl_budget.bounded(_iter_graph_lines(selection, data, options.detail_level), budget,
+                                      options.detail_level, start)
+
+        def estimate(level):
+            per_entity = 32 if level == "names" else 48
+            return len(selection.entities) * per_entity + len(selection.associations) * _ASSOCIATION_BYTES
+
+        yield from _budgeted(data, render, estimate)
+    except Exception as e:
+        import traceback
+        yield _error(data, f"Error generating app domain graph: {e}\n{traceback.format_exc()}")
+
+
+def generate_app_domain_graph_dsl(app, data: type_dsl.AppDomainGraphDSLInput, snapshot=None) -> str:
+    return _join(data, iter_app_domain_graph_dsl(app, data, snapshot))
 
 
 # TODO: 对此文件进行模块化重构
@@ -0,0 +1,107 @@
+"""
+Output budgets for DSL generation.
+
+Every DSL input may carry MaxTokens and/or MaxBytes. Before rendering, the
+generator estimates the output size per detail level from cheap counts
+(entities and attributes, microflow objects, module units...) and picks the
+richest level that fits, degrading
+
+    detailed -> standard -> brief -> names
+
+While rendering, lines are charged against the budget; once the next line
+(or, for domain models, the next entity) would not fit, rendering stops and
+an elision marker with a continuation cursor is emitted instead. Generators
+are lazy, so nothing past the cut is produced. The first line (or item) of
+every page is emitted even when it alone exceeds the budget, so a cursor
+always moves forward and following cursors cannot loop on a tiny budget.
+
+A cursor is "<detail level>:<offset>". It pins the detail level chosen for
+the first page so that continuations render consistently; the offset counts
+lines, or items where a generator cuts at item boundaries.
+"""
+
+from typing import Callable, Iterator, NamedTuple, Optional, Union
+
+DETAIL_LEVELS = ("detailed", "standard", "brief", "names")
+
+# Rough size of a token in the generated DSL (mostly ASCII identifiers)
+BYTES_PER_TOKEN = 4
+
+# Kept free for the elision marker so a cut document still fits the budget
+_MARKER_RESERVE = 120
+
+
+class Cursor(NamedTuple):
+    level: str
+    offset: int
+
+    def __str__(self):
+        return f"{self.level}:{self.offset}"
+
+
+def parse_cursor(text: str) -> Cursor:
+    """Parse a cursor produced by elision(); raises ValueError for malformed cursors."""
+    level, _, offset = (text or "").strip().partition(":")
+    if level not in DETAIL_LEVELS or not offset.isdigit():
+        raise ValueError(f"Invalid cursor '{text}': expected <detail level>:<offset>")
+    return Cursor(level, int(offset))
+
+
+def byte_limit(data) -> Optional[int]:
+    """Byte budget of a DSL input (the tighter of MaxBytes and MaxTokens), None when unlimited."""
+    limits = []
+    if getattr(data, "max_bytes", None):
+        limits.append(data.max_bytes)
+    if getattr(data, "max_tokens", None):
+        limits.append(data.max_tokens * BYTES_PER_TOKEN)
+    return min(limits) if limits else None
+
+
+def choose_level(requested: str, estimate: Callable[[str], int], limit: int) -> str:
+    """Richest detail level, starting at `requested`, whose estimated size fits `limit`."""
+    levels = DETAIL_LEVELS[DETAIL_LEVELS.index(requested):]
+    for level in levels:
+        if estimate(level) <= limit:
+            return level
+    return levels[-1]
+
+
+class Budget:
+    """Bytes left for a document; text lines are charged as UTF-8 plus the newline, bytes items as is."""
+
+    def __init__(self, limit: int):
+        self.limit = max(limit - _MARKER_RESERVE, 0)
+        self.used = 0
+
+    @staticmethod
+    def size(lines) -> int:
+        return sum(len(line) if isinstance(line, bytes) else len(line.encode("utf-8")) + 1 for line in lines)
+
+    def take(self, *lines: str, force: bool = False) -> bool:
+        """Charge `lines` if they all fit (or `force`, for the first item of a page); False (nothing charged) otherwise."""
+        size = self.size(lines)
+        if self.used + size > self.limit and not force:
+            return False
+        self.used += size
+        return True
+
+
+def elision(what: str, cursor: Cursor) -> str:
+    return f'... ({what} elided to fit the output budget; continue with Cursor="{cursor}")'
+
+
+def bounded(lines: Iterator[Union[str, bytes]], budget: Optional[Budget], level: str, start: int = 0,
+            marker: Optional[Callable[[int, Cursor], Union[str, bytes]]] = None) -> Iterator[Union[str, bytes]]:
+    """Cut `lines` at line (or record) granularity: skip the first `start`, stop at the budget.
+
+    `marker(offset, cursor)` builds the elision item; the default is a text line.
+    The first line of the page is always emitted, so the cursor moves on.
+    """
+    for offset, line in enumerate(lines):
+        if offset < start:
+            continue
+        if budget is not None and not budget.take(line, force=offset == start):
+            cursor = Cursor(level, offset)
+            yield marker(offset, cursor) if marker else elision(f"output from line {offset}", cursor)
+            return
+        yield line
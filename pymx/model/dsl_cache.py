@@ -0,0 +1,171 @@
+"""
+Byte-budgeted LRU cache for generated DSL documents.
+
+Entries are keyed by (DSL kind, unit ID, options, version). The version is
+the unit's generation (pymx.model.generations) for single-document DSL, the
+global generation for DSL that spans many units of a module (module tree,
+Java actions), or the snapshot fingerprint when rendering from a
+ModelSnapshot. A model change therefore produces a new key; the old entry is
+dropped eagerly through a generation listener, or ages out under LRU.
+
+The cache holds the joined document text, so a hit hands back the same
+string object without re-joining lines. The byte budget is measured with
+sys.getsizeof, i.e. the memory the cached strings actually occupy. The
+default budget can be set with PYMX_DSL_CACHE_BYTES; 0 disables caching.
+
+Generations only move when a change is reported. If no model-change event
+could be attached (generations.change_events_attached() is False), nothing
+reports edits made in Studio Pro, so cacheable() refuses every live-model
+entry; documents rendered from a snapshot are still cached under its
+content fingerprint.
+
+This module keeps process-wide state and must not be reloaded.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional
+
+from pymx.model import generations
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+SCOPE_UNIT = "unit"        # valid while the unit's generation is unchanged
+SCOPE_GLOBAL = "global"    # valid while the global generation is unchanged
+SCOPE_SNAPSHOT = "snapshot"  # rendered from an immutable snapshot
+
+
+class CacheKey(NamedTuple):
+    kind: str
+    unit_id: str
+    options: Hashable
+    scope: str
+    version: Hashable
+
+
+class DSLCache:
+    """Thread-safe LRU of DSL text under a byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._sizes: Dict[CacheKey, int] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: CacheKey, text: str):
+        size = sys.getsizeof(text)
+        with self._lock:
+            if size > self.max_bytes:
+                self.rejected += 1  # larger than the whole budget: never cached
+                return
+            self._discard(key)
+            self._entries[key] = text
+            self._sizes[key] = size
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def _discard(self, key: CacheKey) -> bool:
+        if key not in self._entries:
+            return False
+        del self._entries[key]
+        self.bytes -= self._sizes.pop(key)
+        return True
+
+    def invalidate(self, unit_ids: Optional[frozenset] = None):
+        """Drop entries made stale by a model change (all live-model entries when unit_ids is None)."""
+        with self._lock:
+            stale = [key for key in self._entries
+                     if key.scope == SCOPE_GLOBAL
+                     or (key.scope == SCOPE_UNIT and (unit_ids is None or key.unit_id in unit_ids))]
+            for key in stale:
+                self._discard(key)
+            self.invalidations += len(stale)
+
+    def configure(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            while self.bytes > self.max_bytes and self._entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self, reset_stats: bool = False):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes = 0
+            if reset_stats:
+                self.hits = self.misses = self.evictions = self.invalidations = self.rejected = 0
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "rejected": self.rejected,
+        }
+
+
+def _default_budget() -> int:
+    try:
+        return int(os.environ.get("PYMX_DSL_CACHE_BYTES", DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+cache = DSLCache(_default_budget())
+
+
+def _on_model_change(generation: int, unit_ids: Optional[frozenset]):
+    cache.invalidate(unit_ids)
+
+
+generations.add_listener(_on_model_change)
+
+
+def cacheable(snapshot=None) -> bool:
+    """True when a document rendered from `snapshot` (or the live model when None) may be cached."""
+    if cache.max_bytes <= 0:
+        return False
+    if snapshot is not None:
+        return bool(snapshot.fingerprint)
+    return generations.change_events_attached()
+
+
+def make_key(kind: str, unit_id: str, options: Hashable, scope: str = SCOPE_UNIT,
+             snapshot=None) -> CacheKey:
+    """Key for `kind` DSL of a unit: versioned by unit/global generation or by snapshot fingerprint."""
+    if snapshot is not None:
+        return CacheKey(kind, unit_id, options, SCOPE_SNAPSHOT, snapshot.fingerprint)
+    if scope == SCOPE_GLOBAL:
+        return CacheKey(kind, unit_id, options, scope, generations.global_generation())
+    return CacheKey(kind, unit_id, options, scope, generations.unit_generation(unit_id))
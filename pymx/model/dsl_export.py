@@ -0,0 +1,443 @@
+"""
+Whole-app DSL export over a ModelSnapshot.
+
+export_app_dsl() renders the DSL documents of every module (domain model,
+module tree, microflows, pages, workflows) into a directory tree:
+
+    <output dir>/
+        manifest.json
+        unit-hashes.json
+        <Module>/
+            domain/<Module>.mxdomain.txt
+            module/<Module>.mfmodule.tree.txt
+            microflow/<Module>.<Microflow>.mfmicroflow.txt
+            page/<Module>.<Page>.mfpage.txt
+            workflow/<Module>.<Workflow>.mfworkflow.txt
+
+File names follow the model://dsl/... resource URIs. unit-hashes.json records
+a content hash per output file (pymx.model.snapshot.ModelSnapshot.unit_hashes
+for documents, the module's unit structure for the module tree), which lets
+an incremental export re-render only added and changed units and delete the
+outputs of removed ones.
+
+Modules are rendered in parallel by a process pool: every worker
+memory-maps the same snapshot file (pymx.model.snapshot_file), so the model
+is read from Studio Pro once and the workers never touch the CLR. Small
+exports, snapshots without a file, and hosts where no worker process can be
+started (e.g. no standalone Python interpreter next to the embedded one) are
+rendered serially in-process.
+
+The returned manifest records the wall-clock time, change counts and
+per-module, per-kind timings. This module does not import clr.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from pymx.model import dsl
+from pymx.model.dto import type_dsl
+
+MANIFEST_FILE = "manifest.json"
+HASHES_FILE = "unit-hashes.json"
+# Bump when the file layout or the meaning of the recorded hashes changes
+EXPORT_FORMAT_VERSION = 1
+DEFAULT_OUTPUT_SUBDIR = Path(".mendix-cache") / "dsl-export"
+
+KIND_DOMAIN = "domain"
+KIND_MODULE_TREE = "module"
+KIND_MICROFLOW = "microflow"
+KIND_PAGE = "page"
+KIND_WORKFLOW = "workflow"
+ALL_KINDS = (KIND_DOMAIN, KIND_MODULE_TREE, KIND_MICROFLOW, KIND_PAGE, KIND_WORKFLOW)
+
+# Document kinds: unit type and file extension (module-level kinds are rendered once per module)
+_DOCUMENT_KINDS = {
+    KIND_MICROFLOW: ("Microflows$Microflow", "mfmicroflow.txt"),
+    KIND_PAGE: ("Pages$Page", "mfpage.txt"),
+    KIND_WORKFLOW: ("Workflows$Workflow", "mfworkflow.txt"),
+}
+
+# Below this many documents worker start-up (a fresh interpreter per worker) costs more than it saves
+PARALLEL_MIN_DOCUMENTS = 1000
+
+# Per-process snapshot of a pool worker (loaded once by _init_worker)
+_worker_snapshot = None
+
+
+def python_executable() -> Optional[str]:
+    """Standalone interpreter for worker processes.
+
+    Inside Studio Pro sys.executable is the host application, so the
+    interpreter is looked up next to the embedded Python installation.
+    """
+    candidates = [sys.executable] if Path(sys.executable).stem.lower().startswith("python") else []
+    for prefix in (sys.exec_prefix, sys.base_exec_prefix):
+        candidates += [os.path.join(prefix, "python.exe"), os.path.join(prefix, "bin", "python3"),
+                       os.path.join(prefix, "bin", "python")]
+    return next((c for c in candidates if c and os.path.isfile(c)), None)
+
+
+def _write_lines(path: Path, lines) -> int:
+    """Stream generator lines to `path`; returns the number of bytes written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    size = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for i, line in enumerate(lines):
+            chunk = line if i == 0 else "\n" + line
+            f.write(chunk)
+            size += len(chunk.encode("utf-8"))
+    return size
+
+
+def _module_documents(module, kinds: Sequence[str]) -> List[Tuple[str, str, object]]:
+    """(kind, path relative to the module directory, unit) of every document of the module."""
+    name = module.Name
+    documents = []
+    if KIND_DOMAIN in kinds:
+        domain_model = next(iter(module.GetUnitsOfType("DomainModels$DomainModel")), None) or module
+        documents.append((KIND_DOMAIN, f"{KIND_DOMAIN}/{name}.mxdomain.txt", domain_model))
+    if KIND_MODULE_TREE in kinds:
+        documents.append((KIND_MODULE_TREE, f"{KIND_MODULE_TREE}/{name}.mfmodule.tree.txt", module))
+    for kind in (k for k in _DOCUMENT_KINDS if k in kinds):
+        unit_type, extension = _DOCUMENT_KINDS[kind]
+        units = sorted((unit for unit in module.GetUnitsOfType(unit_type) if unit.Name), key=lambda u: u.Name)
+        documents += [(kind, f"{kind}/{name}.{unit.Name}.{extension}", unit) for unit in units]
+    return documents
+
+
+def _render_lines(kind: str, module, unit, options: type_dsl.DSLFormatOptions, context):
+    if kind == KIND_DOMAIN:
+        return dsl.DomainModelAnalyzer(None, module, options, context).iter_lines()
+    if kind == KIND_MODULE_TREE:
+        return dsl.ModuleTreeAnalyzer(None, module, options, context).iter_lines()
+    if kind == KIND_MICROFLOW:
+        return dsl.MicroflowAnalyzer(None, module, unit, options, context).iter_lines()
+    if kind == KIND_PAGE:
+        return dsl.PageAnalyzer(None, module, unit, options).iter_lines()
+    return dsl.WorkflowAnalyzer(None, module, unit, options).iter_lines()
+
+
+def render_module(snapshot, module_name: str, output_dir: Path, kinds: Sequence[str] = ALL_KINDS,
+                  options: Optional[type_dsl.DSLFormatOptions] = None,
+                  only: Optional[Set[str]] = None) -> Dict[str, object]:
+    """Render the DSL documents of one module below `output_dir/<module>`; returns its manifest entry.
+
+    `only` restricts rendering to the given module-relative paths (incremental export).
+    """
+    started = time.perf_counter()
+    options = options or type_dsl.DSLFormatOptions()
+    context = snapshot.get_context()
+    module_dir = Path(output_dir) / module_name
+    entry = {"module": module_name, "seconds": 0.0, "bytes": 0, "kinds": {}, "files": [], "errors": [],
+             "failed": []}
+
+    module = context.get_unit(module_name, "Projects$Module")
+    if module is None:
+        entry["errors"].append(f"Module '{module_name}' not found in snapshot")
+        return entry
+
+    for kind, relative, unit in _module_documents(module, kinds):
+        if only is not None and relative not in only:
+            continue
+        kind_started = time.perf_counter()
+        stats = entry["kinds"].setdefault(kind, {"documents": 0, "seconds": 0.0, "bytes": 0})
+        try:
+            size = _write_lines(module_dir / relative, _render_lines(kind, module, unit, options, context))
+        except Exception as e:
+            entry["errors"].append(f"{relative}: {e}")
+            entry["failed"].append(f"{module_name}/{relative}")
+        else:
+            entry["files"].append(f"{module_name}/{relative}")
+            stats["documents"] += 1
+            stats["bytes"] += size
+            entry["bytes"] += size
+        stats["seconds"] += time.perf_counter() - kind_started
+        context.reset_element_cache()  # wrappers are per document; keep the identity map small
+
+    for stats in entry["kinds"].values():
+        stats["seconds"] = round(stats["seconds"], 4)
+    entry["seconds"] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+# ==========================================
+# Content hashes (incremental export)
+# ==========================================
+
+
+def _tree_hash(snapshot, module_index: int) -> str:
+    """Digest of a module's structure: every unit's ID, type, name and container."""
+    ids = snapshot.node_ids()
+    entries = []
+    for index in snapshot.descendant_units(module_index):
+        record = snapshot.node(index)
+        container = ids[record.container] if record.container >= 0 else ""
+        entries.append(f"{record.id}\x1f{record.type}\x1f{record.name or ''}\x1f{container}")
+    return hashlib.blake2b("\x1e".join(sorted(entries)).encode("utf-8", "surrogatepass"),
+                           digest_size=16).hexdigest()
+
+
+def _domain_hash(unit_hash: str, inherited) -> str:
+    """Domain model digest; entities inheriting from other modules add their resolved persistability."""
+    if not inherited:
+        return unit_hash
+    text = "\x1e".join(f"{info.qualified_name}\x1f{info.persistable}" for info in inherited)
+    return hashlib.blake2b(f"{unit_hash}\x1e{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _renderer_sources() -> List[Path]:
+    """Source files the rendered DSL can depend on: every module of the pymx.model package (DTOs included)."""
+    package_dir = Path(dsl.__file__).parent
+    return sorted(package_dir.rglob("*.py"))
+
+
+def _renderer_stamp(kinds: Sequence[str], options: type_dsl.DSLFormatOptions) -> str:
+    """Changes whenever previously exported files may render differently for unchanged units."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{EXPORT_FORMAT_VERSION}|{sorted(kinds)}|{options.model_dump_json()}".encode("utf-8"))
+    package_dir = Path(dsl.__file__).parent
+    for source in _renderer_sources():
+        try:
+            hasher.update(source.relative_to(package_dir).as_posix().encode("utf-8"))
+            hasher.update(source.read_bytes())
+        except OSError:
+            pass
+    return hasher.hexdigest()
+
+
+def _desired_outputs(snapshot, names: Sequence[str], kinds: Sequence[str]) -> Dict[str, Dict[str, str]]:
+    """Output path -> {module, unit, hash} for every document the export should contain."""
+    context = snapshot.get_context()
+    unit_hashes = snapshot.unit_hashes()
+    outputs = {}
+    for name in names:
+        module = context.get_unit(name, "Projects$Module")
+        if module is None:
+            continue
+        for kind, relative, unit in _module_documents(module, kinds):
+            if kind == KIND_MODULE_TREE:
+                digest = _tree_hash(snapshot, unit.record.index)
+            elif kind == KIND_DOMAIN:
+                digest = _domain_hash(unit_hashes.get(unit.record.index, ""),
+                                      context.get_generalization_index().external_dependencies(name))
+            else:
+                digest = unit_hashes.get(unit.record.index, "")
+            outputs[f"{name}/{relative}"] = {"module": name, "unit": unit.ID.ToString(), "hash": digest}
+    return outputs
+
+
+def _load_hashes(output_dir: Path) -> Optional[Dict[str, object]]:
+    try:
+        with open(output_dir / HASHES_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and isinstance(data.get("files"), dict) else None
+
+
+def _remove_outputs(output_dir: Path, paths: Sequence[str]) -> List[str]:
+    """Delete previously exported files and the directories they leave empty; returns failures."""
+    failed = []
+    root = output_dir.resolve()
+    for path in paths:
+        target = (output_dir / path).resolve()
+        if root not in target.parents:
+            continue  # never touch anything outside the export directory
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            failed.append(path)
+            continue
+        parent = target.parent
+        while parent != root:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+    return failed
+
+
+# ==========================================
+# Process pool
+# ==========================================
+
+
+def _init_worker(snapshot_path: str, fingerprint: str):
+    global _worker_snapshot
+    from pymx.model import snapshot_file
+    _worker_snapshot = snapshot_file.load_snapshot(Path(snapshot_path), fingerprint)
+
+
+def _render_module_job(module_name: str, output_dir: str, kinds: Sequence[str], options_json: str,
+                       only: Optional[List[str]]):
+    options = type_dsl.DSLFormatOptions.model_validate_json(options_json)
+    entry = render_module(_worker_snapshot, module_name, Path(output_dir), kinds, options,
+                          set(only) if only is not None else None)
+    entry["worker"] = os.getpid()
+    return entry
+
+
+def _render_parallel(snapshot_path: Path, fingerprint: str, jobs: Dict[str, Optional[Set[str]]],
+                     output_dir: Path, kinds: Sequence[str], options: type_dsl.DSLFormatOptions, workers: int):
+    executable = python_executable()
+    if executable is None:
+        raise RuntimeError("no standalone Python interpreter found for worker processes")
+    mp_context = multiprocessing.get_context("spawn")
+    mp_context.set_executable(executable)
+    options_json = options.model_dump_json()
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                             initargs=(str(snapshot_path), fingerprint)) as pool:
+        futures = [pool.submit(_render_module_job, name, str(output_dir), tuple(kinds), options_json,
+                               sorted(only) if only is not None else None)
+                   for name, only in jobs.items()]
+        for future in as_completed(futures):
+            entries.append(future.result())
+    return entries
+
+
+def export_app_dsl(snapshot, output_dir: Path, snapshot_path: Optional[Path] = None,
+                   modules: Optional[Sequence[str]] = None, kinds: Sequence[str] = ALL_KINDS,
+                   options: Optional[type_dsl.DSLFormatOptions] = None,
+                   workers: Optional[int] = None, incremental: bool = False) -> Dict[str, object]:
+    """Render the DSL of all (or the given) modules of `snapshot` below `output_dir`.
+
+    Every export records a content hash per output file in unit-hashes.json.
+    Outputs of deleted units (or of modules no longer in the model) are
+    removed. With `incremental`, only files whose unit hash changed, that are
+    new or missing on disk are rendered; if the renderer, kinds or options
+    changed since the recorded export, everything is rendered again.
+
+    Args:
+        snapshot: ModelSnapshot to render from
+        output_dir: Target directory; manifest.json is written there
+        snapshot_path: The snapshot's file; required for parallel rendering
+        modules: Module names to export (None = all)
+        kinds: Subset of ALL_KINDS
+        options: DSL format options shared by all documents
+        workers: Worker process count (None = CPU count, 1 = serial)
+        incremental: Re-render only added and changed units
+
+    Returns:
+        The manifest: timings, change counts, per-module entries and the files written
+    """
+    started = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    options = options or type_dsl.DSLFormatOptions()
+    unknown_kinds = [k for k in kinds if k not in ALL_KINDS]
+    if unknown_kinds:
+        raise ValueError(f"Unknown DSL kinds {unknown_kinds}; expected a subset of {list(ALL_KINDS)}")
+
+    all_names = [snapshot.node(index).name for index in snapshot.modules]
+    names = [n for n in all_names if modules is None or n in modules]
+    missing = sorted(set(modules or ()) - set(all_names))
+
+    # 1. What the export should contain, and how it differs from the recorded export
+    hash_started = time.perf_counter()
+    desired = _desired_outputs(snapshot, names, kinds)
+    stamp = _renderer_stamp(kinds, options)
+    hash_seconds = time.perf_counter() - hash_started
+    previous = _load_hashes(output_dir)
+    previous_files = previous["files"] if previous else {}
+    reuse = incremental and previous is not None and previous.get("stamp") == stamp
+
+    selected = set(names)
+    existing = set(all_names)
+    deleted = sorted(path for path, info in previous_files.items()
+                     if path not in desired and (info.get("module") in selected or info.get("module") not in existing))
+    if reuse:
+        render_paths = {path for path, info in desired.items()
+                        if previous_files.get(path, {}).get("hash") != info["hash"]
+                        or not (output_dir / path).is_file()}
+    else:
+        render_paths = set(desired)
+    added = sum(1 for path in render_paths if path not in previous_files)
+
+    jobs: Dict[str, Optional[Set[str]]] = {}
+    for path in render_paths:
+        module_name, relative = path.split("/", 1)
+        jobs.setdefault(module_name, set()).add(relative)
+    if not reuse:
+        jobs = {name: None for name in names}
+    per_module = Counter(info["module"] for info in desired.values())
+    weights = {name: len(only) if only is not None else per_module[name] for name, only in jobs.items()}
+    jobs = dict(sorted(jobs.items(), key=lambda item: -weights[item[0]]))
+
+    # 2. Render
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    mode, fallback_reason = "serial", None
+    entries = None
+    if workers > 1 and sum(weights.values()) < PARALLEL_MIN_DOCUMENTS:
+        fallback_reason = f"fewer than {PARALLEL_MIN_DOCUMENTS} documents to render"
+    elif workers > 1 and snapshot_path is not None and Path(snapshot_path).exists():
+        try:
+            entries = _render_parallel(Path(snapshot_path), snapshot.fingerprint, jobs, output_dir,
+                                       kinds, options, workers)
+            mode = "process"
+        except Exception as e:
+            fallback_reason = f"{type(e).__name__}: {e}"
+    elif workers > 1:
+        fallback_reason = "snapshot is not backed by a file"
+    if entries is None:
+        workers = 1
+        entries = [render_module(snapshot, name, output_dir, kinds, options, only) for name, only in jobs.items()]
+
+    # 3. Clean up outputs of deleted units, record hashes
+    delete_failed = _remove_outputs(output_dir, deleted)
+    failed = {path for entry in entries for path in entry.pop("failed")}
+    recorded = {path: info for path, info in previous_files.items()
+                if path not in desired and path not in deleted}
+    recorded.update((path, info) for path, info in desired.items() if path not in failed)
+    recorded.update((path, previous_files[path]) for path in delete_failed)
+    with open(output_dir / HASHES_FILE, "w", encoding="utf-8") as f:
+        json.dump({"stamp": stamp, "snapshot_fingerprint": snapshot.fingerprint, "files": recorded}, f,
+                  indent=1, ensure_ascii=False)
+
+    entries.sort(key=lambda e: -e["seconds"])
+    kind_totals: Dict[str, Dict[str, float]] = {}
+    for entry in entries:
+        for kind, stats in entry["kinds"].items():
+            total = kind_totals.setdefault(kind, {"documents": 0, "seconds": 0.0, "bytes": 0})
+            for key in total:
+                total[key] += stats[key]
+    for total in kind_totals.values():
+        total["seconds"] = round(total["seconds"], 4)
+
+    manifest = {
+        "output_dir": str(output_dir),
+        "snapshot_fingerprint": snapshot.fingerprint,
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "incremental": reuse,
+        "mode": mode,
+        "workers": workers,
+        "fallback_reason": fallback_reason,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "hash_seconds": round(hash_seconds, 4),
+        "module_seconds": round(sum(e["seconds"] for e in entries), 4),
+        "modules_exported": len(entries),
+        "documents": sum(len(e["files"]) for e in entries),
+        "added": added,
+        "changed": len(render_paths) - added,
+        "deleted": len(deleted) - len(delete_failed),
+        "unchanged": len(desired) - len(render_paths),
+        "bytes": sum(e["bytes"] for e in entries),
+        "errors": sum(len(e["errors"]) for e in entries),
+        "missing_modules": missing,
+        "kinds": kind_totals,
+        "modules": entries,
+    }
+    with open(output_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
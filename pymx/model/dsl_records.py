@@ -0,0 +1,66 @@
+"""
+Structured DSL output: record streams in JSON Lines or msgpack.
+
+Besides text, every analyzer in pymx.model.dsl yields plain dict records
+(iter_records): one per entity, attribute, association, microflow activity
+and flow, widget, workflow activity, folder/document and Java action. Each
+record has a "kind" key; the other keys depend on the kind. Tooling can
+consume these directly instead of parsing the text DSL.
+
+With FormatOptions.OutputFormat = "jsonl" the generators yield one compact
+JSON object per line; with "msgpack" they yield one packed object per item
+(the concatenation is a valid msgpack stream). msgpack is an optional
+dependency (the "msgpack" extra: pip install "pymx[msgpack]") and only needed
+for that format.
+"""
+
+import json
+from typing import Iterable, Optional, Union
+
+try:
+    import msgpack
+except ImportError:  # optional: only the msgpack output format needs it
+    msgpack = None
+
+TEXT = "text"
+JSONL = "jsonl"
+MSGPACK = "msgpack"
+
+
+def encode_json(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def encode_msgpack(record: dict) -> bytes:
+    return msgpack.packb(record, use_bin_type=True, default=str)
+
+
+def unavailable(output_format: str) -> Optional[str]:
+    """Why `output_format` cannot be produced in this environment; None when it can."""
+    if output_format == MSGPACK and msgpack is None:
+        return ("OutputFormat 'msgpack' requires the 'msgpack' package "
+                "(pip install \"pymx[msgpack]\" or pip install msgpack)")
+    return None
+
+
+def encoder(output_format: str):
+    """Record encoder for a structured output format; RuntimeError when it is unavailable."""
+    problem = unavailable(output_format)
+    if problem:
+        raise RuntimeError(problem)
+    return encode_msgpack if output_format == MSGPACK else encode_json
+
+
+def join(output_format: str, parts: Iterable[Union[str, bytes]]) -> Union[str, bytes]:
+    """Whole document from generator output: msgpack items are concatenated, text and JSON lines newline-joined."""
+    if output_format == MSGPACK:
+        return b"".join(parts)
+    return "\n".join(parts)
+
+
+def error_record(message: str) -> dict:
+    return {"kind": "error", "message": message}
+
+
+def elision_record(what: str, cursor) -> dict:
+    return {"kind": "elision", "what": what, "cursor": str(cursor)}
@@ -20,13 +20,37 @@ class DSLFormatOptions(BaseModel):
         False, alias="IncludeLocation",
         description="Include diagram position coordinates (for visual elements)"
     )
-    detail_level: Literal["brief", "standard", "detailed"] = Field(
+    detail_level: Literal["names", "brief", "standard", "detailed"] = Field(
         "standard", alias="DetailLevel",
         description="Level of detail in generated DSL"
     )
+    output_format: Literal["text", "jsonl", "msgpack"] = Field(
+        "text", alias="OutputFormat",
+        description="text: human-readable DSL; jsonl: one JSON record per entity/attribute/association/activity/widget; "
+                    "msgpack: the same records packed (resources only, needs the msgpack package)"
+    )
+
 
+class DSLOutputBudget(BaseModel):
+    """Output size limits shared by the DSL inputs (see pymx.model.dsl_budget)"""
+    model_config = {"populate_by_name": True}
 
-class DomainModelDSLInput(BaseModel):
+    max_tokens: Optional[int] = Field(
+        None, alias="MaxTokens", ge=1,
+        description="Approximate output budget in tokens; detail is reduced (detailed > standard > brief > names) "
+                    "and the output is cut with a continuation cursor to fit"
+    )
+    max_bytes: Optional[int] = Field(
+        None, alias="MaxBytes", ge=1,
+        description="Output budget in bytes (UTF-8); combined with MaxTokens the tighter limit applies"
+    )
+    cursor: Optional[str] = Field(
+        None, alias="Cursor",
+        description="Continuation cursor from the elision marker of a previous, truncated response"
+    )
+
+
+class DomainModelDSLInput(DSLOutputBudget):
     """Input for generating domain model DSL"""
     model_config = {"populate_by_name": True}
 
@@ -43,7 +67,7 @@ class DomainModelDSLInput(BaseModel):
     )
 
 
-class MicroflowDSLInput(BaseModel):
+class MicroflowDSLInput(DSLOutputBudget):
     """Input for generating microflow DSL"""
     model_config = {"populate_by_name": True}
 
@@ -60,7 +84,7 @@ class MicroflowDSLInput(BaseModel):
     )
 
 
-class PageDSLInput(BaseModel):
+class PageDSLInput(DSLOutputBudget):
     """Input for generating page DSL"""
     model_config = {"populate_by_name": True}
 
@@ -72,12 +96,20 @@ class PageDSLInput(BaseModel):
         False, alias="IncludeWidgetProperties",
         description="Include detailed widget property values"
     )
+    max_depth: int = Field(
+        64, alias="MaxDepth", ge=1,
+        description="Maximum widget nesting depth; deeper subtrees are truncated with a notice"
+    )
+    max_nodes: int = Field(
+        20000, alias="MaxNodes", ge=1,
+        description="Maximum number of widgets rendered; the rest of the page is truncated with a notice"
+    )
     format_options: DSLFormatOptions = Field(
         default_factory=DSLFormatOptions, alias="FormatOptions"
     )
 
 
-class WorkflowDSLInput(BaseModel):
+class WorkflowDSLInput(DSLOutputBudget):
     """Input for generating workflow DSL (Mendix 9.24+ workflows)"""
     model_config = {"populate_by_name": True}
 
@@ -90,7 +122,7 @@ class WorkflowDSLInput(BaseModel):
     )
 
 
-class ModuleTreeDSLInput(BaseModel):
+class ModuleTreeDSLInput(DSLOutputBudget):
     """Input for generating module file/folder tree DSL"""
     model_config = {"populate_by_name": True}
 
@@ -107,7 +139,7 @@ class ModuleTreeDSLInput(BaseModel):
     )
 
 
-class JavaActionDSLInput(BaseModel):
+class JavaActionDSLInput(DSLOutputBudget):
     """Input for generating JavaAction DSL for a module."""
     model_config = {"populate_by_name": True}
 
@@ -119,3 +151,74 @@ class JavaActionDSLInput(BaseModel):
         default_factory=DSLFormatOptions, alias="FormatOptions",
         description="Output format configuration"
     )
+
+
+class JavaActionCatalogDSLInput(DSLOutputBudget):
+    """Input for generating the Java Action catalog of the whole app."""
+    model_config = {"populate_by_name": True}
+
+    include_marketplace: bool = Field(
+        True, alias="IncludeMarketplace",
+        description="Include modules installed from the Marketplace (flagged [Marketplace])"
+    )
+    format_options: DSLFormatOptions = Field(
+        default_factory=DSLFormatOptions, alias="FormatOptions",
+        description="Output format configuration"
+    )
+
+
+class AppDomainGraphDSLInput(DSLOutputBudget):
+    """Input for generating the entity-relationship graph of the whole app."""
+    model_config = {"populate_by_name": True}
+
+    module_names: Optional[List[str]] = Field(
+        None, alias="ModuleNames",
+        description="Modules whose entities to include (null = all modules); associations leaving them are kept "
+                    "and their far ends listed as external entities"
+    )
+    focus: Optional[List[str]] = Field(
+        None, alias="Focus",
+        description="Qualified entity names (Module.Entity); only entities within Hops associations of them are included"
+    )
+    hops: int = Field(
+        1, alias="Hops", ge=0,
+        description="Neighborhood radius around the Focus entities, in associations"
+    )
+    format_options: DSLFormatOptions = Field(
+        default_factory=DSLFormatOptions, alias="FormatOptions",
+        description="Output format configuration"
+    )
+
+
+class AppDSLExportInput(BaseModel):
+    """Input for exporting the DSL of the whole app to a directory tree."""
+    model_config = {"populate_by_name": True}
+
+    output_directory: Optional[str] = Field(
+        None, alias="OutputDirectory",
+        description="Target directory (null = <project dir>/.mendix-cache/dsl-export)"
+    )
+    module_names: Optional[List[str]] = Field(
+        None, alias="ModuleNames",
+        description="Modules to export (null = all modules)"
+    )
+    kinds: List[Literal["domain", "module", "microflow", "page", "workflow"]] = Field(
+        ["domain", "module", "microflow", "page", "workflow"], alias="Kinds",
+        description="Document kinds to render"
+    )
+    workers: Optional[int] = Field(
+        None, alias="Workers",
+        description="Worker process count (null = CPU count, 1 = render serially in-process)"
+    )
+    incremental: bool = Field(
+        False, alias="Incremental",
+        description="Re-render only units added or changed since the last export into this directory; outputs of deleted units are removed either way"
+    )
+    rebuild_snapshot: bool = Field(
+        False, alias="RebuildSnapshot",
+        description="Rebuild the model snapshot before exporting"
+    )
+    format_options: DSLFormatOptions = Field(
+        default_factory=DSLFormatOptions, alias="FormatOptions",
+        description="Output format configuration"
+    )
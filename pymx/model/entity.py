@@ -1,7 +1,7 @@
 # https://aistudio.google.com/prompts/1ntnBFfv51uT4HBbYRhVLjDLx7N_oKiUQ
 
 from pymx.model import module as _module
-from pymx.model.util import TransactionManager
+from pymx.model.util import TransactionManager, Document, DomainModel
 from Mendix.StudioPro.ExtensionsAPI.Model.Enumerations import IEnumeration  # type: ignore
 from Mendix.StudioPro.ExtensionsAPI.Model.Projects import IModule  # type: ignore
 from Mendix.StudioPro.ExtensionsAPI.Model.DomainModels import (  # type: ignore
@@ -295,7 +295,9 @@ async def create_entities(current_app, tool_input: CreateEntitiesToolInput) -> s
             f"\n--- Processing Request {i+1}/{len(tool_input.requests)}: {request.qualified_name} ---")
 
         try:
-            with TransactionManager(current_app, f"Create/Update Entity {request.qualified_name}"):
+            module_name = request.qualified_name.split('.', 1)[0]
+            touched = [Document(module_name), DomainModel(module_name)]
+            with TransactionManager(current_app, f"Create/Update Entity {request.qualified_name}", touched):
                 # 1. Parse name and ensure module exists
                 if '.' not in request.qualified_name:
                     raise ValueError(
@@ -9,7 +9,7 @@ import importlib
 import traceback
 
 from pymx.model import folder as _folder
-from pymx.model.util import TransactionManager
+from pymx.model.util import TransactionManager, Document
 
 importlib.reload(_folder)
 clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
@@ -82,7 +82,7 @@ async def create_enumerations(current_app, requests: List[EnumerationRequest]) -
             f"\n--- Processing Request {i+1}/{len(requests)}: {request.full_path} ---")
 
         try:
-            with TransactionManager(current_app, f"Create/Update Enumeration {request.full_path}"):
+            with TransactionManager(current_app, f"Create/Update Enumeration {request.full_path}", [Document(request.full_path)]):
                 # 1. 确保文件夹结构存在并获取父容器
                 full_path = request.full_path
                 parent_container, doc_name, module_name = _folder.ensure_folder(
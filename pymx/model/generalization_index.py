@@ -0,0 +1,131 @@
+"""
+App-wide entity generalization (inheritance) index.
+
+build_generalization_index() reads every entity of every module once and
+records its direct generalization. Each entity's parent chain is then resolved
+a single time, with memoization, so every entity ends up with:
+
+    ancestors    parent chain, nearest first
+    persistable  persistability of the chain's root (only an entity without a
+                 generalization carries a Persistable flag; specializations
+                 inherit it)
+    depth        number of ancestors
+
+A chain that reaches an entity missing from the model, or loops back on
+itself, is marked unresolved and treated as persistable, the model's default.
+
+MendixContext.get_generalization_index caches the index until the model
+changes, so answering "is X persistable" or "how deep is X" is one dict
+lookup. This module does not import clr.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pymx.model.untyped_walk import object_id
+
+
+class EntityGeneralization(NamedTuple):
+    qualified_name: str
+    parent: Optional[str]
+    ancestors: Tuple[str, ...]
+    persistable: bool
+    resolved: bool = True
+
+    @property
+    def depth(self) -> int:
+        return len(self.ancestors)
+
+    @property
+    def module(self) -> str:
+        return self.qualified_name.split(".", 1)[0]
+
+
+class GeneralizationIndex:
+    """Qualified name (and entity ID) -> EntityGeneralization for every entity in the app."""
+
+    def __init__(self, entities: Dict[str, EntityGeneralization], qname_of_id: Dict[str, str]):
+        self.entities = entities
+        self.qname_of_id = qname_of_id
+
+    def __len__(self):
+        return len(self.entities)
+
+    def get(self, entity) -> Optional[EntityGeneralization]:
+        """Entry of an entity given as qualified name, raw entity or wrapper; None when unknown."""
+        if isinstance(entity, str):
+            return self.entities.get(entity)
+        qname = self.qname_of_id.get(object_id(getattr(entity, "_raw", entity)))
+        return self.entities.get(qname) if qname else None
+
+    def is_persistable(self, entity, default: bool = True) -> bool:
+        info = self.get(entity)
+        return info.persistable if info else default
+
+    def depth(self, entity) -> int:
+        info = self.get(entity)
+        return info.depth if info else 0
+
+    def external_dependencies(self, module_name: str) -> List[EntityGeneralization]:
+        """Entities of `module_name` whose chain reaches into other modules (their
+        persistability depends on documents outside the module's domain model)."""
+        prefix = f"{module_name}."
+        return [info for qname, info in self.entities.items()
+                if qname.startswith(prefix) and any(not a.startswith(prefix) for a in info.ancestors)]
+
+
+def _own_generalization(entity) -> Tuple[Optional[str], bool]:
+    """(parent qualified name or None, own Persistable flag) of a raw entity."""
+    gen_prop = entity.GetProperty("generalization")
+    gen = gen_prop.Value if gen_prop else None
+    if gen is None or not hasattr(gen, "GetProperty"):
+        return None, True
+    parent_prop = gen.GetProperty("generalization")
+    if parent_prop and parent_prop.Value:
+        return str(parent_prop.Value), True
+    persistable_prop = gen.GetProperty("persistable")
+    if persistable_prop and persistable_prop.Value is not None:
+        return None, bool(persistable_prop.Value)
+    return None, True
+
+
+def build_generalization_index(root) -> GeneralizationIndex:
+    """Build the index over all modules below an untyped model root."""
+    own: Dict[str, Tuple[Optional[str], bool]] = {}
+    qname_of_id: Dict[str, str] = {}
+    for module in root.GetUnitsOfType("Projects$Module"):
+        for domain_model in module.GetUnitsOfType("DomainModels$DomainModel"):
+            entities_prop = domain_model.GetProperty("entities")
+            if not entities_prop or not entities_prop.IsList:
+                continue
+            for entity in entities_prop.GetValues():
+                qname = f"{module.Name}.{entity.Name}"
+                own[qname] = _own_generalization(entity)
+                qname_of_id[object_id(entity)] = qname
+
+    entities: Dict[str, EntityGeneralization] = {}
+    for qname in own:
+        if qname in entities:
+            continue
+        # Follow parents up to a root, an already resolved entity, a missing entity or a cycle
+        path, on_path = [], set()
+        current = qname
+        while current is not None and current in own and current not in entities and current not in on_path:
+            on_path.add(current)
+            path.append(current)
+            current = own[current][0]
+
+        if current is None:
+            top = path.pop()
+            base = entities[top] = EntityGeneralization(top, None, (), own[top][1])
+        elif current in entities:
+            base = entities[current]
+        else:
+            top = path.pop()
+            parent = own[top][0]
+            base = entities[top] = EntityGeneralization(top, parent, (parent,), True, False)
+
+        for child in reversed(path):
+            base = entities[child] = EntityGeneralization(
+                child, base.qualified_name, (base.qualified_name,) + base.ancestors, base.persistable, base.resolved)
+
+    return GeneralizationIndex(entities, qname_of_id)
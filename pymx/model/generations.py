@@ -0,0 +1,170 @@
+"""
+Model generation counters: the central invalidation service for pymx caches.
+
+Every model change bumps a global generation. Changes whose scope is known
+also stamp the touched units (by unit ID); changes of unknown scope stamp a
+wildcard, so unit_generation() of *every* unit moves on. Caches record the
+generation they were built at and compare on use instead of living forever:
+
+    stamp = generations.global_generation()
+    ...
+    if stamp != generations.global_generation():
+        rebuild()
+
+Changes are reported by TransactionManager on commit (pymx.model.util) and
+by the model-change events of the host (attach_model_events subscribes to
+the change events the model's .NET type declares; a host extension that
+receives them elsewhere can forward them by calling bump()).
+
+Edits made in the Studio Pro UI are only seen through those events. When no
+event could be attached, change_events_attached() is False and callers must
+revalidate() at the start of every request: each request then starts a new
+generation, so no cache outlives the request it was built in, and the DSL
+cache stays off (pymx.model.dsl_cache). This module does not import clr.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+_log = logging.getLogger("pymx.generations")
+
+_lock = threading.Lock()
+_global_generation = 0
+_wildcard_generation = 0
+_unit_generations: Dict[str, int] = {}
+_listeners: List[Callable[[int, Optional[frozenset]], None]] = []
+_attached_models = set()
+# Model-change events subscribed to ("<type>.<event>"); empty = UI edits go unnoticed
+_attached_events: List[str] = []
+
+
+def global_generation() -> int:
+    """Generation of the model as a whole; changes on every model change."""
+    return _global_generation
+
+
+def unit_generation(unit_id: str) -> int:
+    """Generation at which the unit last (possibly) changed."""
+    return max(_unit_generations.get(unit_id, 0), _wildcard_generation)
+
+
+def _unit_key(unit) -> Optional[str]:
+    if unit is None:
+        return None
+    if isinstance(unit, str):
+        return unit
+    try:
+        return unit.ID.ToString()
+    except AttributeError:
+        return None
+
+
+def bump(units: Optional[Iterable] = None) -> int:
+    """Record a model change and return the new global generation.
+
+    `units` are the touched units (unit IDs or untyped units). Without them, or
+    when none can be identified, the change is treated as touching every unit.
+    """
+    global _global_generation, _wildcard_generation
+    keys = frozenset(k for k in (_unit_key(u) for u in units) if k) if units is not None else None
+    with _lock:
+        _global_generation += 1
+        generation = _global_generation
+        if keys:
+            for key in keys:
+                _unit_generations[key] = generation
+        else:
+            keys = None
+            _wildcard_generation = generation
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(generation, keys)
+        except Exception:
+            pass  # a broken cache listener must not fail the model change
+    return generation
+
+
+def add_listener(callback: Callable[[int, Optional[frozenset]], None]):
+    """Call `callback(generation, unit_ids_or_None)` after every bump (eager cache eviction)."""
+    with _lock:
+        if callback not in _listeners:
+            _listeners.append(callback)
+
+
+def remove_listener(callback):
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def _on_model_event(sender=None, args=None):
+    bump()
+
+
+def change_event_names(model) -> List[str]:
+    """Names of the change events declared by the .NET type of `model` (reflection, no guessing)."""
+    try:
+        events = model.GetType().GetEvents()
+    except Exception:
+        return []
+    return sorted({str(event.Name) for event in events if "Change" in str(event.Name)})
+
+
+def attach_model_events(model, event_names: Optional[Iterable[str]] = None) -> List[str]:
+    """Subscribe to the model-change events of `model`; returns the names subscribed to.
+
+    `event_names` defaults to the change events the model's type declares.
+    When nothing can be attached a warning is logged: callers then rely on
+    revalidate(). Safe to call repeatedly: each model object is only
+    subscribed once.
+    """
+    key = id(model)
+    if model is None or key in _attached_models:
+        return []
+    names = list(event_names) if event_names is not None else change_event_names(model)
+    attached = []
+    for name in names:
+        try:
+            event = getattr(model, name)
+            event += _on_model_event
+            setattr(model, name, event)
+            attached.append(name)
+        except Exception as e:
+            _log.warning("pymx: could not subscribe to model event %s: %s", name, e)
+    _attached_models.add(key)
+    with _lock:
+        _attached_events.extend(attached)
+    if not attached:
+        _log.warning("pymx: no model-change event could be attached (candidates: %s); "
+                     "caches are revalidated on every request and the DSL cache is disabled",
+                     ", ".join(names) or "none")
+    return attached
+
+
+def change_events_attached() -> bool:
+    """True when model-change events report edits made outside pymx (Studio Pro UI)."""
+    return bool(_attached_events)
+
+
+def revalidate() -> int:
+    """Start of a request: without change events, treat the model as possibly changed.
+
+    Bumps a wildcard generation when no model-change event is attached (an edit
+    in the UI could have happened since the last request); a no-op otherwise.
+    Returns the current global generation.
+    """
+    if _attached_events:
+        return _global_generation
+    return bump()
+
+
+def stats() -> Dict[str, int]:
+    return {
+        "global_generation": _global_generation,
+        "wildcard_generation": _wildcard_generation,
+        "tracked_units": len(_unit_generations),
+        "listeners": len(_listeners),
+        "change_events": list(_attached_events),
+    }
@@ -33,7 +33,7 @@ from Mendix.StudioPro.ExtensionsAPI.Model.DomainModels import (
 )
 from Mendix.StudioPro.ExtensionsAPI.Model.MicroflowExpressions import IMicroflowExpression
 
-from pymx.model.util import TransactionManager
+from pymx.model.util import TransactionManager, Document
 from pymx.model import folder as _folder
 from pymx.model import module
 import importlib
@@ -660,7 +660,7 @@ def create_microflows(ctx, requests: List[type_microflow.MicroflowRequest], tx=N
             _do_create(ctx, report, req)
             continue
         try:
-            with TransactionManager(ctx.CurrentApp, f"MF: {req.full_path}"):
+            with TransactionManager(ctx.CurrentApp, f"MF: {req.full_path}", [Document(req.full_path)]):
                 _do_create(ctx, report, req)
         except Exception as e:
             report.append(f"Error {req.full_path}: {str(e)}")
@@ -0,0 +1,403 @@
+"""
+Control-flow graphs for microflows.
+
+build_microflow_cfg() reads a microflow's objects and sequence flows once
+(raw untyped objects, live model or ModelSnapshot) and returns a
+ControlFlowGraph:
+
+- nodes: every flow object except annotations; a LoopedActivity node carries
+  its body as a nested ControlFlowGraph,
+- edges: sequence flows with their case value ("true", enumeration value,
+  entity for inheritance splits) and error-handler flag,
+- immediate dominators and post-dominators (Cooper-Harvey-Kennedy iteration
+  over reverse postorder), back edges and the natural merge point of every
+  split (its immediate post-dominator).
+
+iter_structured() renders a graph as nested if/else, switch, on-error and
+loop blocks in which every node appears exactly once; flows that cannot be
+expressed structurally (loop-backs via merges, jumps into another branch)
+are rendered as goto lines to a labelled node.
+
+Graphs are immutable once built; MendixContext.get_microflow_cfg caches them
+per microflow until the model changes, so other analyses can reuse them.
+This module does not import clr.
+"""
+
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+SEQUENCE_FLOW = "Microflows$SequenceFlow"
+START_EVENT = "Microflows$StartEvent"
+LOOPED_ACTIVITY = "Microflows$LoopedActivity"
+EXCLUSIVE_MERGE = "Microflows$ExclusiveMerge"
+# Objects that take no part in the control flow
+_IGNORED_TYPES = ("Microflows$Annotation",)
+
+ERROR_CASE = "error"
+NO_NODE = -1
+
+
+class CfgEdge(NamedTuple):
+    source: int
+    target: int
+    case: str           # case value of the flow ("" for unconditional flows)
+    is_error: bool      # error-handler flow
+
+
+class CfgNode:
+    """A microflow object in the graph. `raw` is the untyped object; `body` the loop body graph."""
+
+    __slots__ = ("index", "id", "type", "raw", "body")
+
+    def __init__(self, index: int, node_id: str, node_type: str, raw, body: Optional["ControlFlowGraph"] = None):
+        self.index = index
+        self.id = node_id
+        self.type = node_type
+        self.raw = raw
+        self.body = body
+
+    @property
+    def type_name(self) -> str:
+        return self.type.split("$")[-1]
+
+    def __repr__(self):
+        return f"<CfgNode {self.index} {self.type_name} {self.id}>"
+
+
+class ControlFlowGraph:
+    """Nodes, edges and (post-)dominator trees of one flow level (a microflow or a loop body)."""
+
+    def __init__(self, nodes: List[CfgNode], edges: List[CfgEdge], entries: List[int]):
+        self.nodes = nodes
+        self.edges = edges
+        self.entries = entries
+        self.out_edges: List[List[CfgEdge]] = [[] for _ in nodes]
+        self.in_edges: List[List[CfgEdge]] = [[] for _ in nodes]
+        for edge in edges:
+            self.out_edges[edge.source].append(edge)
+            self.in_edges[edge.target].append(edge)
+        self._by_id = {node.id: node.index for node in nodes}
+        self.idom = _immediate_dominators(len(nodes), [[e.target for e in out] for out in self.out_edges],
+                                          entries)
+        exits = [i for i, out in enumerate(self.out_edges) if not out]
+        self.ipdom = _immediate_dominators(len(nodes), [[e.source for e in into] for into in self.in_edges],
+                                           exits, complete=True)
+        self.back_edges = frozenset(e for e in edges if self.dominates(e.target, e.source))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def node_by_id(self, node_id: str) -> Optional[CfgNode]:
+        index = self._by_id.get(node_id)
+        return self.nodes[index] if index is not None else None
+
+    def successors(self, index: int) -> List[int]:
+        return [e.target for e in self.out_edges[index]]
+
+    def predecessors(self, index: int) -> List[int]:
+        return [e.source for e in self.in_edges[index]]
+
+    def dominates(self, a: int, b: int) -> bool:
+        """True when every path from an entry to `b` passes through `a`."""
+        while b != NO_NODE:
+            if a == b:
+                return True
+            parent = self.idom[b]
+            b = NO_NODE if parent == b else parent
+        return False
+
+    def merge_point(self, index: int) -> Optional[int]:
+        """Where the branches leaving `index` join again (None when they only meet at the end)."""
+        merge = self.ipdom[index]
+        return None if merge in (NO_NODE, index) else merge
+
+    def walk(self) -> Iterator[CfgNode]:
+        """Every node of this graph and, depth first, of the nested loop bodies."""
+        for node in self.nodes:
+            yield node
+            if node.body is not None:
+                yield from node.body.walk()
+
+
+def _immediate_dominators(count: int, successors: Sequence[Sequence[int]], roots: Sequence[int],
+                          complete: bool = False) -> List[int]:
+    """Immediate dominator per node (roots map to themselves, unreachable nodes to NO_NODE).
+
+    A virtual root precedes all `roots`; nodes dominated only by it get
+    NO_NODE. With `complete`, nodes not reachable from the roots (e.g. on a
+    cycle without exit, for post-dominators) are attached to the virtual root
+    so every node receives a result.
+    """
+    virtual = count
+    succ = list(successors) + [list(roots)]
+    order: List[int] = []
+    seen = [False] * (count + 1)
+
+    def dfs(start):
+        seen[start] = True
+        stack = [(start, iter(succ[start]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if not seen[child]:
+                    seen[child] = True
+                    stack.append((child, iter(succ[child])))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+    dfs(virtual)
+    if complete:
+        for node in range(count):
+            if not seen[node]:
+                succ[virtual].append(node)
+                dfs(node)
+        order.remove(virtual)
+        order.append(virtual)
+
+    rpo = list(reversed(order))
+    position = {node: i for i, node in enumerate(rpo)}
+    preds: List[List[int]] = [[] for _ in range(count + 1)]
+    for node in rpo:
+        for child in succ[node]:
+            preds[child].append(node)
+
+    idom = [NO_NODE] * (count + 1)
+    idom[virtual] = virtual
+
+    def intersect(a, b):
+        while a != b:
+            while position[a] > position[b]:
+                a = idom[a]
+            while position[b] > position[a]:
+                b = idom[b]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for node in rpo[1:]:
+            new = NO_NODE
+            for pred in preds[node]:
+                if idom[pred] != NO_NODE:
+                    new = pred if new == NO_NODE else intersect(pred, new)
+            if new != idom[node]:
+                idom[node] = new
+                changed = True
+
+    result = []
+    for node in range(count):
+        parent = idom[node]
+        result.append(node if parent == virtual and node in roots else (NO_NODE if parent == virtual else parent))
+    return result
+
+
+# ==========================================
+# Building
+# ==========================================
+
+
+def _prop(obj, name):
+    try:
+        prop = obj.GetProperty(name)
+    except Exception:
+        return None
+    return prop
+
+
+def _value(obj, name):
+    prop = _prop(obj, name)
+    return prop.Value if prop is not None and not prop.IsList else None
+
+
+def _values(obj, name) -> list:
+    prop = _prop(obj, name)
+    return list(prop.GetValues()) if prop is not None and prop.IsList else []
+
+
+def _case_value(flow) -> str:
+    cases = _values(flow, "caseValues")
+    case = cases[0] if cases else _value(flow, "caseValue")
+    if case is None:
+        return ""
+    value = _value(case, "value")
+    if value not in (None, ""):
+        return str(value)
+    case_type = str(case.Type).split("$")[-1]
+    return "" if case_type == "NoCase" else case_type
+
+
+class _FlowRecord(NamedTuple):
+    origin: str
+    destination: str
+    case: str
+    is_error: bool
+
+
+def _read_flows(microflow) -> Dict[str, List[_FlowRecord]]:
+    """All sequence flows of the microflow (loop bodies included), grouped by origin ID."""
+    by_origin: Dict[str, List[_FlowRecord]] = {}
+    for flow in _values(microflow, "flows"):
+        if flow.Type != SEQUENCE_FLOW:
+            continue
+        origin, destination = _value(flow, "origin"), _value(flow, "destination")
+        if origin is None or destination is None:
+            continue
+        record = _FlowRecord(origin.ID.ToString(), destination.ID.ToString(), _case_value(flow),
+                             bool(_value(flow, "isErrorHandler")))
+        by_origin.setdefault(record.origin, []).append(record)
+    return by_origin
+
+
+def _build_level(objects, flows_by_origin: Dict[str, List[_FlowRecord]]) -> ControlFlowGraph:
+    nodes: List[CfgNode] = []
+    index_of: Dict[str, int] = {}
+    for obj in objects:
+        obj_type = obj.Type
+        if obj_type in _IGNORED_TYPES:
+            continue
+        node = CfgNode(len(nodes), obj.ID.ToString(), obj_type, obj)
+        if obj_type == LOOPED_ACTIVITY:
+            collection = _value(obj, "objectCollection")
+            node.body = _build_level(_values(collection, "objects") if collection is not None else [],
+                                     flows_by_origin)
+        index_of[node.id] = node.index
+        nodes.append(node)
+
+    edges = []
+    for node in nodes:
+        for flow in flows_by_origin.get(node.id, ()):
+            target = index_of.get(flow.destination)
+            if target is not None:
+                edges.append(CfgEdge(node.index, target, ERROR_CASE if flow.is_error and not flow.case else flow.case,
+                                     flow.is_error))
+
+    has_incoming = {edge.target for edge in edges}
+    entries = [node.index for node in nodes if node.type == START_EVENT]
+    if not entries:
+        # Loop bodies have no start event: every object without an incoming flow starts the body
+        entries = [node.index for node in nodes if node.index not in has_incoming]
+    return ControlFlowGraph(nodes, edges, entries)
+
+
+def build_microflow_cfg(microflow) -> ControlFlowGraph:
+    """Build the control-flow graph of an untyped microflow (or nanoflow/rule) unit."""
+    collection = _value(microflow, "objectCollection")
+    objects = _values(collection, "objects") if collection is not None else []
+    return _build_level(objects, _read_flows(microflow))
+
+
+# ==========================================
+# Structured rendering
+# ==========================================
+
+
+def iter_structured(cfg: ControlFlowGraph, summarize: Callable[[CfgNode], str],
+                    depth: int = 0) -> Iterator[str]:
+    """Render `cfg` as indented, structured lines; every node is emitted exactly once.
+
+    `summarize(node)` returns the one-line text of a node. Merge nodes are
+    only shown when they are a jump target.
+    """
+    yield from _StructuredWriter(cfg, summarize).render(depth)
+
+
+class _StructuredWriter:
+    def __init__(self, cfg: ControlFlowGraph, summarize: Callable[[CfgNode], str]):
+        self.cfg = cfg
+        self.summarize = summarize
+        self.emitted = set()
+        self.labels: Dict[int, str] = {}
+        self.jump_targets = {edge.target for edge in cfg.back_edges}
+
+    def render(self, depth: int) -> Iterator[str]:
+        for entry in self.cfg.entries:
+            yield from self._region(entry, None, depth)
+        unreachable = len(self.cfg.nodes) - len(self.emitted)
+        if unreachable:
+            yield f"{'  ' * depth}({unreachable} unreachable object{'s' if unreachable != 1 else ''})"
+
+    def _label(self, index: int) -> str:
+        label = self.labels.get(index)
+        if label is None:
+            label = self.labels[index] = f"#{len(self.labels) + 1}"
+        return label
+
+    def _goto(self, index: int, indent: str) -> str:
+        if index in self.labels:
+            return f"{indent}goto {self.labels[index]}"
+        return f"{indent}goto: {self.summarize(self.cfg.nodes[index])}"
+
+    def _node_lines(self, index: int, depth: int) -> Iterator[str]:
+        node = self.cfg.nodes[index]
+        indent = '  ' * depth
+        label = f"{self._label(index)} " if index in self.jump_targets else ""
+        if node.type == EXCLUSIVE_MERGE:
+            if label:
+                yield f"{indent}{label}Merge"
+            return
+        if node.body is not None:
+            yield f"{indent}{label}loop {self.summarize(node)}"
+            yield from _StructuredWriter(node.body, self.summarize).render(depth + 1)
+            yield f"{indent}end loop"
+            return
+        yield f"{indent}{label}{self.summarize(node)}"
+
+    def _region(self, index: Optional[int], stop: Optional[int], depth: int) -> Iterator[str]:
+        cfg = self.cfg
+        indent = '  ' * depth
+        while index is not None and index != stop:
+            if index in self.emitted:
+                yield self._goto(index, indent)
+                return
+            self.emitted.add(index)
+            yield from self._node_lines(index, depth)
+
+            out = cfg.out_edges[index]
+            if not out:
+                return
+            merge = cfg.merge_point(index)
+
+            errors = [e for e in out if e.is_error]
+            normal = [e for e in out if not e.is_error]
+            for edge in errors:
+                yield f"{indent}on error:"
+                yield from self._branch(edge, merge, depth + 1)
+                yield f"{indent}end on error"
+
+            if len(normal) == 1:
+                edge = normal[0]
+                if edge in cfg.back_edges:
+                    yield self._goto(edge.target, indent)
+                    return
+                index = edge.target
+                continue
+            if not normal:
+                index = merge
+                continue
+
+            cases = [e.case.lower() for e in normal]
+            if sorted(cases) == ["false", "true"]:
+                true_edge, false_edge = (normal if cases[0] == "true" else list(reversed(normal)))
+                yield f"{indent}if true:"
+                yield from self._branch(true_edge, merge, depth + 1)
+                if false_edge.target != merge or false_edge in cfg.back_edges:
+                    yield f"{indent}else:"
+                    yield from self._branch(false_edge, merge, depth + 1)
+                yield f"{indent}end if"
+            else:
+                yield f"{indent}switch:"
+                for edge in normal:
+                    yield f"{indent}  case {edge.case or '(default)'}:"
+                    yield from self._branch(edge, merge, depth + 2)
+                yield f"{indent}end switch"
+            index = merge
+
+    def _branch(self, edge: CfgEdge, merge: Optional[int], depth: int) -> Iterator[str]:
+        indent = '  ' * depth
+        if edge in self.cfg.back_edges:
+            yield self._goto(edge.target, indent)
+        elif edge.target == merge:
+            yield f"{indent}(continue)"
+        else:
+            yield from self._region(edge.target, merge, depth)
@@ -28,7 +28,8 @@ def ensure_module(current_app, module_name: str) -> IModule:
 def getAbstractUnitByQualifiedName(ctx, qualifiedName):
     reports = []
     model = ctx.CurrentApp
-    module_name, unit_name = qualifiedName.split('.')
+    parts = qualifiedName.split('.')
+    module_name, unit_name = parts[0], parts[-1]
 
     # modelRoot = ctx.untypedModelAccessService.GetUntypedModel(model)
     # modelUnits = modelRoot.GetUnitsOfType('Projects$Module')
@@ -55,5 +56,27 @@ def getAbstractUnitByQualifiedName(ctx, qualifiedName):
             if document is not None:
                 return document
         return None
+    if module is None:
+        return None, reports
+
+    # 先借助缓存的模块文件夹树 (MendixContext.get_module_tree) 定位文件夹路径，
+    # 沿路径逐级取子文件夹，避免在整棵文件夹树中递归查找
+    try:
+        untyped = ctx.get_untyped_context()
+        raw_module = untyped.get_unit(module_name, "Projects$Module")
+        raw_unit = untyped.get_unit(qualifiedName)
+        if raw_module is not None and raw_unit is not None:
+            folder = module
+            for folder_name in untyped.get_module_tree(raw_module).folder_path(raw_unit):
+                folder = next((f for f in folder.GetFolders() if f.Name == folder_name), None)
+                if folder is None:
+                    break
+            if folder is not None:
+                document = next((doc for doc in folder.GetDocuments() if doc.Name == raw_unit.Name), None)
+                if document is not None:
+                    return document, reports
+    except Exception as e:
+        reports.append(f"Module tree lookup failed, falling back to folder search: {e}")
+
     document = find_document(module, unit_name)
     return document, reports
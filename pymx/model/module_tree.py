@@ -0,0 +1,132 @@
+"""
+Folder/document tree of a module, built in one pass.
+
+build_module_tree() reads the module's units with a single GetUnits() call
+and groups them by their container (unit.Container.ID) into a
+parent -> children map. Rendering the tree or resolving the folder path of
+a document is then a dict walk instead of re-fetching and re-hashing the
+units below every folder.
+
+Should GetUnits() only return a container's direct children, the folders
+found are expanded once each, so the build stays linear either way.
+
+MendixContext.get_module_tree caches trees per module until the model
+changes. This module does not import clr.
+"""
+
+from typing import Dict, Iterator, List, Optional
+
+from pymx.model.untyped_walk import object_id
+
+FOLDER_TYPE = "Projects$Folder"
+
+
+class ModuleTree:
+    """Parent -> children map of one module's folders and documents."""
+
+    def __init__(self, module, units: List, parent_of: Dict[str, str]):
+        self.module = module
+        self.module_id = object_id(module)
+        self.units: Dict[str, object] = {}
+        self.parent_of = parent_of
+        self.children: Dict[str, List] = {}
+        for unit in units:
+            unit_id = object_id(unit)
+            self.units[unit_id] = unit
+            self.children.setdefault(parent_of.get(unit_id, self.module_id), []).append(unit)
+        self._by_name: Optional[Dict[str, List]] = None
+
+    def __len__(self):
+        return len(self.units)
+
+    def children_of(self, container_id: Optional[str] = None) -> List:
+        """Direct children of a folder (the module root when container_id is None)."""
+        return self.children.get(container_id or self.module_id, [])
+
+    def folder_path(self, unit) -> List[str]:
+        """Names of the folders between the module and `unit`, outermost first."""
+        path = []
+        parent_id = self.parent_of.get(object_id(unit))
+        while parent_id is not None and parent_id != self.module_id:
+            folder = self.units.get(parent_id)
+            if folder is None:
+                break
+            path.append(folder.Name)
+            parent_id = self.parent_of.get(parent_id)
+        path.reverse()
+        return path
+
+    def find(self, name: str, unit_type: Optional[str] = None) -> List:
+        """Units named `name` anywhere in the module (optionally of one type)."""
+        if self._by_name is None:
+            by_name: Dict[str, List] = {}
+            for unit in self.units.values():
+                unit_name = _unit_name(unit)
+                if unit_name:
+                    by_name.setdefault(unit_name, []).append(unit)
+            self._by_name = by_name
+        units = self._by_name.get(name, [])
+        return [u for u in units if u.Type == unit_type] if unit_type else list(units)
+
+    def walk(self, container_id: Optional[str] = None, depth: int = 0) -> Iterator:
+        """(depth, unit) pairs in display order: each container's documents, then its folders
+        (each followed by its contents), sorted by name; unnamed units are skipped."""
+        # Entries: (depth, unit to emit or None, container to expand or None)
+        stack = [(depth - 1, None, container_id or self.module_id)]
+        while stack:
+            level, unit, expand_id = stack.pop()
+            if unit is not None:
+                yield level, unit
+            if expand_id is not None:
+                docs, folders = _split_sorted(self.children.get(expand_id, []))
+                entries = [(level + 1, doc, None) for doc in docs]
+                entries += [(level + 1, folder, object_id(folder)) for folder in folders]
+                stack.extend(reversed(entries))
+
+
+def _unit_name(unit) -> str:
+    try:
+        return unit.Name or ""
+    except AttributeError:
+        return ""
+
+
+def _split_sorted(units: List):
+    named = [u for u in units if _unit_name(u)]
+    named.sort(key=_unit_name)
+    return [u for u in named if u.Type != FOLDER_TYPE], [u for u in named if u.Type == FOLDER_TYPE]
+
+
+def build_module_tree(module) -> ModuleTree:
+    """Build the folder/document tree of an untyped module unit."""
+    module_id = object_id(module)
+    units = []
+    parent_of: Dict[str, str] = {}
+    seen = set()
+
+    def collect(container, container_id):
+        try:
+            fetched = list(container.GetUnits())
+        except Exception:
+            return []
+        folders = []
+        for unit in fetched:
+            unit_id = object_id(unit)
+            if unit_id in seen:
+                continue
+            seen.add(unit_id)
+            units.append(unit)
+            parent = unit.Container
+            parent_of[unit_id] = (object_id(parent) if parent is not None else None) or container_id
+            if unit.Type == FOLDER_TYPE:
+                folders.append(unit)
+        return folders
+
+    folders = collect(module, module_id)
+    # GetUnits() normally returns every unit below the module; only when no unit
+    # sits inside a folder are the folders expanded (each exactly once)
+    if folders and all(parent_of[object_id(u)] == module_id for u in units):
+        while folders:
+            folder = folders.pop()
+            folders.extend(collect(folder, object_id(folder)))
+    return ModuleTree(module, units, parent_of)
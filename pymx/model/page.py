@@ -1,7 +1,7 @@
 import traceback
 import clr
 import importlib
-from pymx.model.util import TransactionManager
+from pymx.model.util import TransactionManager, Document
 from pymx.model import folder as _folder
 from Mendix.StudioPro.ExtensionsAPI.Model.Pages import IPage  # type: ignore
 clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
@@ -24,7 +24,7 @@ async def ensure_pages(ctx, fullPaths: list[str]) -> str:
             f"\n--- 处理请求 {i+1}/{len(fullPaths)}: {full_path} ---")
 
         try:
-            with TransactionManager(current_app, f"创建/更新页面 {full_path}"):
+            with TransactionManager(current_app, f"创建/更新页面 {full_path}", [Document(full_path)]):
                 # 1. 确保文件夹路径存在并获取父容器和页面名称
                 parent_container, page_name, module_name = _folder.ensure_folder(
                     current_app, full_path)
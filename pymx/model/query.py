@@ -0,0 +1,458 @@
+"""
+Selector query language over the Untyped Model.
+
+A selector is a CSS-like chain of steps:
+
+    RetrieveAction[retrieveSource.entity=Sales.Order][retrieveSource.xPathConstraint]
+    Microflow > MicroflowObjectCollection ActionActivity:refs(Sales.ACT_Save)
+    @Sales.ACT_Order_Process ExclusiveSplit
+    Entity:module(Sales)[documentation]
+
+Steps
+    Type            short type name (suffix after '$') or full 'Module$Type'; '*' matches any
+    @Qualified.Name the unit with that qualified name (only as the first step)
+    A B             B is a descendant of A (within the same unit)
+    A > B           B is a direct child of A
+
+Predicates (on any step, repeatable)
+    [prop]          property is set (non-empty string/list, not None/False)
+    [prop=value]    equals; also  !=  ^= (starts with)  $= (ends with)  *= (contains)
+                    `prop` may be a dotted path through single-valued children
+                    (retrieveSource.entity); values may be quoted
+    :refs(QName)    element, or an element below it, references the qualified name
+                    (reverse-reference index)
+    :module(Name)   element lives in the given module
+
+Evaluation does not scan the whole app: candidate units come from the
+reference index side tables (units containing each step's type, units with
+references to a :refs target, units of a :module) and only those units are
+walked. Results are paged.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from pymx.model.untyped_walk import is_model_object, object_id
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_OPERATORS = ("!=", "^=", "$=", "*=", "=")
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\$[A-Za-z_][A-Za-z0-9_]*)?|\*")
+_QNAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+_PATH = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+_PSEUDOS = ("refs", "module")
+_PSEUDO = re.compile(r":([a-z]+)\(\s*([^)]*?)\s*\)")
+
+
+class QuerySyntaxError(ValueError):
+    """Selector could not be parsed."""
+
+
+class Predicate(NamedTuple):
+    path: Tuple[str, ...]
+    op: Optional[str]        # None = existence test
+    value: Optional[str]
+
+
+class Step(NamedTuple):
+    type_pattern: str                    # '*', 'Type' or 'Module$Type'
+    scope: Optional[str]                 # @qualified name of a unit
+    predicates: Tuple[Predicate, ...]
+    refs: Tuple[str, ...]
+    modules: Tuple[str, ...]
+
+
+class Selector(NamedTuple):
+    text: str
+    steps: Tuple[Step, ...]
+    combinators: Tuple[str, ...]         # between steps: ' ' (descendant) or '>' (child)
+
+
+class QueryMatch(NamedTuple):
+    unit: str            # qualified name of the containing unit
+    type: str
+    id: str
+    name: Optional[str]
+    details: Tuple[Tuple[str, str], ...]  # values of the last step's predicate properties
+
+
+class QueryPage(NamedTuple):
+    selector: str
+    total: int
+    offset: int
+    limit: int
+    matches: List[QueryMatch]
+    units_walked: int
+    units_total: int
+
+
+# ==========================================
+# Parser
+# ==========================================
+
+
+def parse_selector(text: str) -> Selector:
+    pos = 0
+    n = len(text)
+    steps = []
+    combinators = []
+
+    def error(message):
+        raise QuerySyntaxError(f"{message} at position {pos}: {text!r}")
+
+    def skip_ws():
+        nonlocal pos
+        while pos < n and text[pos].isspace():
+            pos += 1
+
+    skip_ws()
+    while pos < n:
+        if steps:
+            had_ws = pos > 0 and text[pos - 1].isspace()
+            if text[pos] == ">":
+                combinators.append(">")
+                pos += 1
+                skip_ws()
+            elif had_ws:
+                combinators.append(" ")
+            else:
+                error("Expected ' ' or '>' between steps")
+
+        scope = None
+        type_pattern = "*"
+        if pos < n and text[pos] == "@":
+            if steps:
+                error("'@QualifiedName' is only allowed as the first step")
+            m = _QNAME.match(text, pos + 1)
+            if not m:
+                error("Expected a qualified name after '@'")
+            scope = m.group(0)
+            pos = m.end()
+        else:
+            m = _IDENT.match(text, pos)
+            if m:
+                type_pattern = m.group(0)
+                pos = m.end()
+            elif pos >= n or text[pos] not in "[:":
+                error("Expected a type name, '*', '@', '[' or ':'")
+
+        predicates, refs, modules = [], [], []
+        while pos < n and text[pos] in "[:":
+            if text[pos] == "[":
+                pos += 1
+                skip_ws()
+                m = _PATH.match(text, pos)
+                if not m:
+                    error("Expected a property name")
+                path = tuple(m.group(0).split("."))
+                pos = m.end()
+                skip_ws()
+                op = value = None
+                for candidate in _OPERATORS:
+                    if text.startswith(candidate, pos):
+                        op = candidate
+                        pos += len(candidate)
+                        break
+                if op is not None:
+                    skip_ws()
+                    if pos < n and text[pos] in "'\"":
+                        quote = text[pos]
+                        end = text.find(quote, pos + 1)
+                        if end < 0:
+                            error("Unterminated string")
+                        value = text[pos + 1:end]
+                        pos = end + 1
+                    else:
+                        end = text.find("]", pos)
+                        if end < 0:
+                            error("Expected ']'")
+                        value = text[pos:end].strip()
+                        pos = end
+                    skip_ws()
+                if pos >= n or text[pos] != "]":
+                    error("Expected ']'")
+                pos += 1
+                predicates.append(Predicate(path, op, value))
+            else:
+                m = _PSEUDO.match(text, pos)
+                if not m or m.group(1) not in _PSEUDOS:
+                    error(f"Unknown pseudo-class (supported: {', '.join(':' + p + '()' for p in _PSEUDOS)})")
+                (refs if m.group(1) == "refs" else modules).append(m.group(2))
+                pos = m.end()
+
+        steps.append(Step(type_pattern, scope, tuple(predicates), tuple(refs), tuple(modules)))
+        skip_ws()
+
+    if not steps:
+        raise QuerySyntaxError("Empty selector")
+    return Selector(text.strip(), tuple(steps), tuple(combinators))
+
+
+# ==========================================
+# Evaluator
+# ==========================================
+
+
+def _type_matches(pattern: str, full_type: str) -> bool:
+    if pattern == "*":
+        return True
+    if "$" in pattern:
+        return pattern == full_type
+    return full_type.rsplit("$", 1)[-1] == pattern
+
+
+def _to_camel(name: str) -> str:
+    parts = name.split("_")
+    return parts[0] + "".join(x.title() for x in parts[1:])
+
+
+def _get_property(element, name: str):
+    prop = element.GetProperty(name)
+    if prop is None and "_" in name:
+        prop = element.GetProperty(_to_camel(name))
+    return prop
+
+
+def _property_values(element, path: Tuple[str, ...]) -> list:
+    """Values at the end of a dotted property path (lists fan out)."""
+    current = [element]
+    for name in path:
+        following = []
+        for obj in current:
+            if not is_model_object(obj):
+                continue
+            prop = _get_property(obj, name)
+            if prop is None:
+                continue
+            if prop.IsList:
+                following.extend(prop.GetValues())
+            else:
+                following.append(prop.Value)
+        current = following
+    return current
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if is_model_object(value):
+        try:
+            return value.Name or ""
+        except AttributeError:
+            return object_id(value) or ""
+    return str(value)
+
+
+def _predicate_holds(predicate: Predicate, element) -> bool:
+    values = _property_values(element, predicate.path)
+    if predicate.op is None:
+        return any(v is not None and v is not False and _as_text(v) != "" for v in values)
+    expected = predicate.value
+    texts = [_as_text(v) for v in values] or [""]
+    op = predicate.op
+    if op == "=":
+        return any(t == expected or (t.lower() in ("true", "false") and t == expected.lower()) for t in texts)
+    if op == "!=":
+        return all(t != expected for t in texts)
+    if op == "^=":
+        return any(t.startswith(expected) for t in texts)
+    if op == "$=":
+        return any(t.endswith(expected) for t in texts)
+    return any(expected in t for t in texts)  # *=
+
+
+def _children(element) -> list:
+    children = []
+    for prop in element.GetProperties():
+        if prop.IsList:
+            children.extend(v for v in prop.GetValues() if is_model_object(v))
+        else:
+            value = prop.Value
+            if is_model_object(value):
+                children.append(value)
+    return children
+
+
+class _Evaluator:
+    def __init__(self, selector: Selector, index, unit_qname: str, ref_ids: Dict[str, Set[str]]):
+        self.selector = selector
+        self.index = index
+        self.unit_qname = unit_qname
+        self.ref_ids = ref_ids
+        self.ref_subtrees: Dict[str, Set[str]] = {}
+
+    def _mark_ref_subtrees(self, unit):
+        """For each :refs target, the IDs of the unit's elements with a referencing element in their subtree."""
+        self.ref_subtrees = {ref: set() for ref in self.ref_ids}
+        visited = set()
+        path: List[str] = []
+        stack = [(unit, 0)]
+        while stack:
+            element, depth = stack.pop()
+            element_id = object_id(element)
+            if element_id in visited:
+                continue
+            visited.add(element_id)
+            del path[depth:]
+            path.append(element_id)
+            for ref, source_ids in self.ref_ids.items():
+                if element_id in source_ids:
+                    self.ref_subtrees[ref].update(path)
+            for child in reversed(_children(element)):
+                stack.append((child, depth + 1))
+
+    def step_matches(self, step: Step, element, element_type: str) -> bool:
+        if step.scope is not None:
+            if self.index.resolve_name(step.scope) != self.unit_qname or object_id(element) != self.unit_id:
+                return False
+        elif not _type_matches(step.type_pattern, element_type):
+            return False
+        if step.modules and self.unit_qname.split(".", 1)[0] not in step.modules:
+            return False
+        if step.refs:
+            element_id = object_id(element)
+            if not all(element_id in self.ref_subtrees.get(ref, ()) for ref in step.refs):
+                return False
+        return all(_predicate_holds(p, element) for p in step.predicates)
+
+    def path_matches(self, path: list, types: list) -> bool:
+        steps = self.selector.steps
+        combinators = self.selector.combinators
+        memo = {}
+
+        def matches(step_index, position):
+            key = (step_index, position)
+            if key not in memo:
+                memo[key] = self.step_matches(steps[step_index], path[position], types[position])
+            return memo[key]
+
+        def match_from(step_index, position):
+            if step_index == 0:
+                return True
+            if combinators[step_index - 1] == ">":
+                return position > 0 and matches(step_index - 1, position - 1) and match_from(step_index - 1, position - 1)
+            for ancestor in range(position - 1, -1, -1):
+                if matches(step_index - 1, ancestor) and match_from(step_index - 1, ancestor):
+                    return True
+            return False
+
+        last = len(steps) - 1
+        return matches(last, len(path) - 1) and match_from(last, len(path) - 1)
+
+    def walk(self, unit, leaf_only_units: bool) -> List[QueryMatch]:
+        self.unit_id = object_id(unit)
+        if self.ref_ids:
+            self._mark_ref_subtrees(unit)
+        last = self.selector.steps[-1]
+        matches = []
+        visited = set()
+        path, types = [], []
+        stack = [(unit, 0)]
+        while stack:
+            element, depth = stack.pop()
+            element_id = object_id(element)
+            if element_id in visited:
+                continue
+            visited.add(element_id)
+            del path[depth:]
+            del types[depth:]
+            element_type = element.Type
+            path.append(element)
+            types.append(element_type)
+
+            if (last.scope is not None or _type_matches(last.type_pattern, element_type)) \
+                    and self.path_matches(path, types):
+                matches.append(self._to_match(element, element_type, element_id, last))
+            if leaf_only_units:
+                break
+
+            for child in reversed(_children(element)):
+                stack.append((child, depth + 1))
+        return matches
+
+    def _to_match(self, element, element_type, element_id, step: Step) -> QueryMatch:
+        try:
+            name = element.Name
+        except AttributeError:
+            name = None
+        if name is None:
+            prop = element.GetProperty("name")
+            name = prop.Value if prop is not None and not prop.IsList else None
+        details = tuple((".".join(p.path), ", ".join(_as_text(v) for v in _property_values(element, p.path)))
+                        for p in step.predicates)
+        return QueryMatch(self.unit_qname, element_type, element_id or "", name if isinstance(name, str) else None,
+                          details)
+
+
+def _candidate_units(selector: Selector, index, ref_ids: Dict[str, Set[str]]) -> Set[str]:
+    candidates: Optional[Set[str]] = None
+
+    def narrow(units):
+        nonlocal candidates
+        candidates = set(units) if candidates is None else candidates & set(units)
+
+    for step in selector.steps:
+        if step.scope is not None:
+            name = index.resolve_name(step.scope)
+            narrow([name] if name in index.units else [])
+        elif step.type_pattern != "*":
+            units = set()
+            for element_type, type_units in index.units_by_type.items():
+                if _type_matches(step.type_pattern, element_type):
+                    units |= type_units
+            narrow(units)
+        for ref in step.refs:
+            name = index.resolve_name(ref)
+            narrow(rec.source_unit for rec in index.by_target.get(name, ()) if name)
+        if step.modules:
+            narrow(u for u in index.units if u.split(".", 1)[0] in step.modules)
+    return set(index.units) if candidates is None else candidates
+
+
+def evaluate(selector: Selector, index) -> Tuple[List[QueryMatch], int]:
+    """All matches of a parsed selector (sorted by unit), plus the number of units walked."""
+    ref_ids: Dict[str, Set[str]] = {}
+    for step in selector.steps:
+        for ref in step.refs:
+            name = index.resolve_name(ref)
+            ref_ids[ref] = {rec.source_id for rec in index.by_target.get(name, ())} if name else set()
+
+    last = selector.steps[-1]
+    last_types = {t for t in index.units_by_type if last.scope is None and _type_matches(last.type_pattern, t)}
+    # Only unit types can match: no need to descend into the units' element trees
+    leaf_only_units = last.scope is not None or (last_types and last_types <= index.unit_types)
+    if len(selector.steps) > 1:
+        leaf_only_units = False
+
+    matches: List[QueryMatch] = []
+    units = sorted(_candidate_units(selector, index, ref_ids))
+    for unit_qname in units:
+        evaluator = _Evaluator(selector, index, unit_qname, ref_ids)
+        matches.extend(evaluator.walk(index.units[unit_qname], bool(leaf_only_units)))
+    return matches, len(units)
+
+
+def page_results(selector_text: str, matches: List[QueryMatch], units_walked: int, units_total: int,
+                 offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> QueryPage:
+    offset = max(0, offset)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return QueryPage(selector_text, len(matches), offset, limit, matches[offset:offset + limit],
+                     units_walked, units_total)
+
+
+def format_query_page(page: QueryPage) -> str:
+    end = page.offset + len(page.matches)
+    lines = [f"# Query: {page.selector}",
+             f"{page.total} {'match' if page.total == 1 else 'matches'}" + (f" (showing {page.offset + 1}-{end})" if page.matches else "")]
+    for match in page.matches:
+        label = f" {match.name}" if match.name else ""
+        details = "".join(f" {key}={value!r}" for key, value in match.details)
+        lines.append(f"- [{match.type.split('$')[-1]}]{label} in {match.unit} (id: {match.id}){details}")
+    if end < page.total:
+        lines.append(f"... more results: use offset={end}")
+    lines.append("")
+    lines.append(f"Walked {page.units_walked} of {page.units_total} units")
+    return "\n".join(lines)
@@ -0,0 +1,238 @@
+"""
+Reverse-reference index ("who uses this?") over the Untyped Model.
+
+The index is built in one pass over every unit of every module and records
+each qualified-name reference it meets: microflow/nanoflow calls, entity,
+attribute and association references, page and snippet calls, event
+handlers, and qualified names embedded in expressions or XPath constraints.
+After that, "which microflows call X" or "which retrieves use association Y"
+is a dict lookup.
+
+Read-only: does NOT use TransactionManager.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from pymx.model.untyped_walk import (
+    QNAME_PATTERN,
+    is_model_object,
+    iter_module_units,
+    object_id,
+    unit_qualified_name,
+)
+
+# Unit type -> kind of reference target
+UNIT_TARGET_KINDS = {
+    "Microflows$Microflow": "microflow",
+    "Microflows$Nanoflow": "nanoflow",
+    "Pages$Page": "page",
+    "Pages$Snippet": "snippet",
+    "Pages$Layout": "layout",
+    "Workflows$Workflow": "workflow",
+    "Enumerations$Enumeration": "enumeration",
+    "Constants$Constant": "constant",
+    "JavaActions$JavaAction": "java_action",
+}
+
+# Units whose own properties carry no references worth walking
+_SKIPPED_UNIT_TYPES = {"Projects$Folder", "Projects$Module"}
+
+
+class ReferenceRecord(NamedTuple):
+    """One place in the model that references a qualified name."""
+    target: str            # referenced qualified name
+    target_kind: str       # microflow / entity / attribute / association / page / ...
+    usage: str             # call / event_handler / page_call / snippet_call / expression / reference
+    source_unit: str       # qualified name of the document containing the reference
+    source_unit_type: str  # e.g. Microflows$Microflow
+    source_type: str       # type of the referencing element, e.g. Microflows$RetrieveAction
+    source_id: str         # ID of the referencing element
+    property: str          # property holding the reference
+
+
+def _classify_usage(target_kind: str, source_type: str, in_expression: bool) -> str:
+    if "EventHandler" in source_type:
+        return "event_handler"
+    if in_expression:
+        return "expression"
+    if target_kind == "page":
+        return "page_call"
+    if target_kind == "snippet":
+        return "snippet_call"
+    if target_kind in ("microflow", "nanoflow", "workflow", "java_action") and (
+            "Call" in source_type or "Action" in source_type):
+        return "call"
+    return "reference"
+
+
+class ReferenceIndex:
+    """Qualified name -> list of ReferenceRecord, built by build_reference_index()."""
+
+    def __init__(self):
+        self.targets: Dict[str, str] = {}  # known qualified name -> target kind
+        self.by_target: Dict[str, List[ReferenceRecord]] = defaultdict(list)
+        # Side tables collected during the same walk (used by pymx.model.query to prune)
+        self.units: Dict[str, object] = {}                           # unit qualified name -> raw unit
+        self.units_by_type: Dict[str, Set[str]] = defaultdict(set)  # element type -> unit qualified names
+        self.unit_types: Set[str] = set()                           # types of the walked units
+        self.unit_count = 0
+        self.element_count = 0
+        self.build_seconds = 0.0
+        self._targets_ci: Optional[Dict[str, str]] = None
+
+    def resolve_name(self, qname: str) -> Optional[str]:
+        """Canonical spelling of a known qualified name (case-insensitive fallback)."""
+        if qname in self.targets:
+            return qname
+        if self._targets_ci is None:
+            self._targets_ci = {}
+            for name in self.targets:
+                self._targets_ci.setdefault(name.lower(), name)
+        return self._targets_ci.get(qname.lower())
+
+    def find(self, qname: str) -> List[ReferenceRecord]:
+        name = self.resolve_name(qname)
+        if name is None:
+            return []
+        return list(self.by_target.get(name, ()))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "targets": len(self.targets),
+            "referenced_targets": len(self.by_target),
+            "references": sum(len(v) for v in self.by_target.values()),
+            "units": self.unit_count,
+            "elements": self.element_count,
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+def _collect_targets(index: ReferenceIndex, module_units) -> Dict[str, str]:
+    """Register every referenceable qualified name; returns entity ID -> qualified name."""
+    entity_ids = {}
+    for module_name, units in module_units:
+        index.targets[module_name] = "module"
+        for unit in units:
+            unit_type = unit.Type
+            kind = UNIT_TARGET_KINDS.get(unit_type)
+            if kind:
+                index.targets[unit_qualified_name(module_name, unit)] = kind
+                continue
+            if unit_type != "DomainModels$DomainModel":
+                continue
+
+            entities_prop = unit.GetProperty("entities")
+            for entity in (entities_prop.GetValues() if entities_prop else ()):
+                entity_qname = f"{module_name}.{entity.GetProperty('name').Value}"
+                index.targets[entity_qname] = "entity"
+                entity_ids[object_id(entity)] = entity_qname
+                attrs_prop = entity.GetProperty("attributes")
+                for attr in (attrs_prop.GetValues() if attrs_prop else ()):
+                    index.targets[f"{entity_qname}.{attr.GetProperty('name').Value}"] = "attribute"
+
+            for prop_name in ("associations", "crossAssociations"):
+                assocs_prop = unit.GetProperty(prop_name)
+                for assoc in (assocs_prop.GetValues() if assocs_prop else ()):
+                    index.targets[f"{module_name}.{assoc.GetProperty('name').Value}"] = "association"
+    return entity_ids
+
+
+def build_reference_index(root) -> ReferenceIndex:
+    """Walk all units once and record every qualified-name reference."""
+    started = time.perf_counter()
+    index = ReferenceIndex()
+
+    module_units = []
+    for module in root.GetUnitsOfType("Projects$Module"):
+        module_units.append((module.Name, list(iter_module_units(module))))
+
+    entity_ids = _collect_targets(index, module_units)
+    targets = index.targets
+    visited = set()
+
+    for module_name, units in module_units:
+        for unit in units:
+            unit_type = unit.Type
+            if unit_type in _SKIPPED_UNIT_TYPES:
+                continue
+            index.unit_count += 1
+            source_unit = unit_qualified_name(module_name, unit)
+            index.units[source_unit] = unit
+            index.unit_types.add(unit_type)
+            units_by_type = index.units_by_type
+
+            def record(target, source, source_type, prop_name, in_expression=False):
+                kind = targets[target]
+                index.by_target[target].append(ReferenceRecord(
+                    target, kind, _classify_usage(kind, source_type, in_expression),
+                    source_unit, unit_type, source_type, object_id(source) or "", prop_name))
+
+            def check_string(value, source, source_type, prop_name):
+                if value in targets:
+                    record(value, source, source_type, prop_name)
+                elif "." in value:
+                    for candidate in set(QNAME_PATTERN.findall(value)):
+                        if candidate in targets:
+                            record(candidate, source, source_type, prop_name, in_expression=True)
+
+            stack = [unit]
+            while stack:
+                element = stack.pop()
+                element_id = object_id(element)
+                if element_id in visited:
+                    continue
+                visited.add(element_id)
+                index.element_count += 1
+                element_type = element.Type
+                units_by_type[element_type].add(source_unit)
+
+                for prop in element.GetProperties():
+                    prop_name = prop.Name
+                    if prop.IsList:
+                        for value in prop.GetValues():
+                            if isinstance(value, str):
+                                check_string(value, element, element_type, prop_name)
+                            elif is_model_object(value):
+                                stack.append(value)
+                        continue
+
+                    value = prop.Value
+                    if isinstance(value, str):
+                        if value:
+                            check_string(value, element, element_type, prop_name)
+                    elif is_model_object(value):
+                        entity_qname = entity_ids.get(object_id(value))
+                        if entity_qname is not None:
+                            # Single-valued entity object (association parent/child) is a reference, not containment
+                            record(entity_qname, element, element_type, prop_name)
+                        else:
+                            stack.append(value)
+
+    index.build_seconds = time.perf_counter() - started
+    return index
+
+
+def format_references(qname: str, index: ReferenceIndex, records: List[ReferenceRecord]) -> str:
+    """Human-readable report of find_references() results, grouped by source document."""
+    name = index.resolve_name(qname)
+    if name is None:
+        return f"'{qname}' is not a known qualified name in this app."
+
+    lines = [f"# References to {name} ({index.targets[name]}): {len(records)}"]
+    by_unit = defaultdict(list)
+    for rec in records:
+        by_unit[(rec.source_unit, rec.source_unit_type)].append(rec)
+    for (source_unit, source_unit_type), recs in sorted(by_unit.items()):
+        lines.append(f"## {source_unit} [{source_unit_type.split('$')[-1]}]")
+        for rec in recs:
+            lines.append(f"- {rec.usage}: {rec.source_type.split('$')[-1]}.{rec.property} (id: {rec.source_id})")
+    if not records:
+        lines.append("(no references found)")
+
+    stats = index.stats()
+    lines.append("")
+    lines.append(f"Index: {stats['units']} units, {stats['elements']} elements, "
+                 f"{stats['references']} references, built in {stats['build_seconds']}s")
+    return "\n".join(lines)
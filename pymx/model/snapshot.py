@@ -0,0 +1,425 @@
+"""
+Materialized, pure-Python snapshot of the Untyped Model.
+
+build_snapshot() walks the live untyped model once (through pythonnet) and
+produces immutable records: one NodeRecord per unit/element with its ID,
+type, name, owning unit, container and properties. Element-valued properties
+(containment and references alike) are stored as node indexes, and all
+identifiers are interned strings.
+
+The snapshot exposes the same duck-typed surface as the untyped API
+(Type, ID.ToString(), Name, Container, GetProperty/GetProperties,
+GetUnits/GetUnitsOfType, IsList/Value/GetValues), so the DSL analyzers, the
+element wrapper and the index builders run unchanged against either the live
+model or a snapshot. This module does not import clr and works without
+Studio Pro.
+"""
+
+import hashlib
+import sys
+import time
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pymx.model.untyped_walk import is_model_object, iter_module_units, object_id
+
+# Property value kinds
+KIND_NONE = "none"
+KIND_PRIMITIVE = "primitive"
+KIND_ELEMENT = "element"          # value: node index
+KIND_ELEMENTS = "elements"        # value: tuple of node indexes
+KIND_PRIMITIVES = "primitives"    # value: tuple of primitive values
+
+NO_NODE = -1
+
+
+class Point(NamedTuple):
+    """Snapshot form of diagram locations (keeps .X/.Y access working)."""
+    X: int
+    Y: int
+
+
+class PropertyRecord(NamedTuple):
+    name: str
+    is_list: bool
+    kind: str
+    value: object
+
+
+class NodeRecord(NamedTuple):
+    index: int
+    id: str
+    type: str
+    name: Optional[str]
+    is_unit: bool
+    unit: int                   # index of the owning unit (itself for units)
+    container: int              # index of the containing unit/element, NO_NODE for modules
+    units: Tuple[int, ...]      # direct child units (units only)
+    properties: Tuple[PropertyRecord, ...]
+
+
+def _to_primitive(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= 256 else value
+    if hasattr(value, "X") and hasattr(value, "Y"):
+        try:
+            return Point(int(value.X), int(value.Y))
+        except (TypeError, ValueError):
+            pass
+    return sys.intern(str(value))
+
+
+# ==========================================
+# Builder
+# ==========================================
+
+
+class _Builder:
+    def __init__(self):
+        self.index_of: Dict[str, int] = {}
+        self.raw: List[object] = []
+        self.ids: List[str] = []
+        self.meta: List[list] = []   # [container, unit, is_unit]
+        self.records: List[Optional[NodeRecord]] = []
+        self.child_units: Dict[int, List[int]] = {}
+
+    def node_index(self, obj, container: int, unit: int, is_unit: bool = False) -> int:
+        obj_id = object_id(obj)
+        if obj_id is not None and obj_id in self.index_of:
+            return self.index_of[obj_id]
+        index = len(self.raw)
+        if obj_id is None:
+            obj_id = f"#{index}"
+        self.index_of[sys.intern(obj_id)] = index
+        self.raw.append(obj)
+        self.ids.append(sys.intern(obj_id))
+        self.meta.append([container, index if is_unit else unit, is_unit])
+        self.records.append(None)
+        return index
+
+    def materialize(self, index: int, queue: deque):
+        obj = self.raw[index]
+        container, unit, is_unit = self.meta[index]
+        properties = []
+        for prop in obj.GetProperties():
+            name = sys.intern(prop.Name)
+            if prop.IsList:
+                values = list(prop.GetValues())
+                if values and all(is_model_object(v) for v in values):
+                    children = []
+                    for value in values:
+                        child = self.node_index(value, index, unit)
+                        children.append(child)
+                        queue.append(child)
+                    properties.append(PropertyRecord(name, True, KIND_ELEMENTS, tuple(children)))
+                else:
+                    properties.append(PropertyRecord(
+                        name, True, KIND_PRIMITIVES, tuple(_to_primitive(v) for v in values)))
+                continue
+
+            value = prop.Value
+            if value is None:
+                properties.append(PropertyRecord(name, False, KIND_NONE, None))
+            elif is_model_object(value):
+                child = self.node_index(value, index, unit)
+                queue.append(child)
+                properties.append(PropertyRecord(name, False, KIND_ELEMENT, child))
+            else:
+                properties.append(PropertyRecord(name, False, KIND_PRIMITIVE, _to_primitive(value)))
+
+        try:
+            name = obj.Name
+        except AttributeError:
+            name = None
+        self.records[index] = NodeRecord(
+            index, self.ids[index], sys.intern(obj.Type),
+            sys.intern(name) if isinstance(name, str) else None,
+            is_unit, unit, container,
+            tuple(self.child_units.get(index, ())) if is_unit else (),
+            tuple(properties),
+        )
+
+
+def build_snapshot(root, fingerprint: str = "") -> "ModelSnapshot":
+    """Walk the untyped model once and return an immutable ModelSnapshot."""
+    started = time.perf_counter()
+    builder = _Builder()
+    modules = []
+
+    # 1. Units: modules and every unit below them (nested folders included)
+    for module in root.GetUnitsOfType("Projects$Module"):
+        module_index = builder.node_index(module, NO_NODE, NO_NODE, is_unit=True)
+        modules.append(module_index)
+        module_id = object_id(module)
+        units = list(iter_module_units(module))
+        for unit in units:
+            builder.node_index(unit, NO_NODE, NO_NODE, is_unit=True)
+        for unit in units:
+            unit_index = builder.index_of[object_id(unit)]
+            try:
+                parent_id = object_id(unit.Container)
+            except AttributeError:
+                parent_id = module_id
+            parent = builder.index_of.get(parent_id, module_index)
+            builder.meta[unit_index][0] = parent
+            builder.child_units.setdefault(parent, []).append(unit_index)
+
+    # 2. Elements: breadth-first over every unit's property tree
+    queue = deque(range(len(builder.raw)))
+    while queue:
+        index = queue.popleft()
+        if builder.records[index] is None:
+            builder.materialize(index, queue)
+
+    return ModelSnapshot(builder.records, tuple(modules), fingerprint,
+                         build_seconds=time.perf_counter() - started)
+
+
+# ==========================================
+# Snapshot + untyped-API views
+# ==========================================
+
+
+class SnapshotId(str):
+    """String ID that also answers .ToString(), like the untyped API's ID objects."""
+    __slots__ = ()
+
+    def ToString(self):
+        return str.__str__(self)
+
+
+class SnapshotProperty:
+    __slots__ = ("_snapshot", "_record")
+
+    def __init__(self, snapshot: "ModelSnapshot", record: PropertyRecord):
+        self._snapshot = snapshot
+        self._record = record
+
+    @property
+    def Name(self):
+        return self._record.name
+
+    @property
+    def IsList(self):
+        return self._record.is_list
+
+    @property
+    def Value(self):
+        record = self._record
+        if record.kind == KIND_ELEMENT:
+            return self._snapshot.view(record.value)
+        if record.kind == KIND_PRIMITIVE:
+            return record.value
+        if record.kind == KIND_ELEMENTS:
+            return [self._snapshot.view(i) for i in record.value]
+        if record.kind == KIND_PRIMITIVES:
+            return list(record.value)
+        return None
+
+    def GetValues(self):
+        record = self._record
+        if record.kind == KIND_ELEMENTS:
+            return [self._snapshot.view(i) for i in record.value]
+        if record.kind == KIND_PRIMITIVES:
+            return list(record.value)
+        return []
+
+
+class SnapshotObject:
+    """Read-only view over a NodeRecord that mimics an untyped unit/element."""
+
+    __slots__ = ("_snapshot", "_record", "_props")
+
+    def __init__(self, snapshot: "ModelSnapshot", record: NodeRecord):
+        self._snapshot = snapshot
+        self._record = record
+        self._props = None
+
+    @property
+    def record(self) -> NodeRecord:
+        return self._record
+
+    @property
+    def Type(self):
+        return self._record.type
+
+    @property
+    def ID(self):
+        return SnapshotId(self._record.id)
+
+    @property
+    def Name(self):
+        return self._record.name
+
+    @property
+    def Container(self):
+        container = self._record.container
+        return self._snapshot.view(container) if container != NO_NODE else None
+
+    def _prop_map(self):
+        if self._props is None:
+            self._props = {p.name: p for p in self._record.properties}
+        return self._props
+
+    def GetProperty(self, name):
+        record = self._prop_map().get(name)
+        return SnapshotProperty(self._snapshot, record) if record is not None else None
+
+    def GetProperties(self):
+        return [SnapshotProperty(self._snapshot, p) for p in self._record.properties]
+
+    def GetUnits(self):
+        return [self._snapshot.view(i) for i in self._record.units]
+
+    def GetUnitsOfType(self, unit_type):
+        return [self._snapshot.view(i) for i in self._snapshot.descendant_units(self._record.index)
+                if self._snapshot.node(i).type == unit_type]
+
+    def __eq__(self, other):
+        return isinstance(other, SnapshotObject) and other._record.index == self._record.index
+
+    def __hash__(self):
+        return hash(self._record.index)
+
+    def __repr__(self):
+        return f"<{self._record.type} {self._record.name or self._record.id}>"
+
+
+class _SnapshotRoot:
+    """Model root of a snapshot: exposes the modules like the untyped model root."""
+
+    __slots__ = ("_snapshot",)
+
+    Type = "Projects$Project"
+    Name = None
+    Container = None
+
+    def __init__(self, snapshot: "ModelSnapshot"):
+        self._snapshot = snapshot
+
+    @property
+    def ID(self):
+        return SnapshotId("#root")
+
+    def GetProperty(self, name):
+        return None
+
+    def GetProperties(self):
+        return []
+
+    def GetUnits(self):
+        return [self._snapshot.view(i) for i in self._snapshot.modules]
+
+    def GetUnitsOfType(self, unit_type):
+        if unit_type == "Projects$Module":
+            return self.GetUnits()
+        return [self._snapshot.view(i) for m in self._snapshot.modules
+                for i in self._snapshot.descendant_units(m) if self._snapshot.node(i).type == unit_type]
+
+
+class ModelSnapshot:
+    """Immutable node table plus untyped-API views; see module docstring."""
+
+    def __init__(self, nodes: Sequence[NodeRecord], modules: Tuple[int, ...], fingerprint: str = "",
+                 build_seconds: float = 0.0):
+        self._nodes = nodes
+        self.modules = modules
+        self.fingerprint = fingerprint
+        self.build_seconds = build_seconds
+        self._by_id: Optional[Dict[str, int]] = None
+        self._ids: Optional[List[str]] = None
+        self._unit_hashes: Optional[Dict[int, str]] = None
+        self._root = _SnapshotRoot(self)
+        self._context = None
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def node(self, index: int) -> NodeRecord:
+        return self._nodes[index]
+
+    def nodes(self) -> Iterable[NodeRecord]:
+        for index in range(len(self._nodes)):
+            yield self._nodes[index]
+
+    def view(self, index: int) -> SnapshotObject:
+        return SnapshotObject(self, self._nodes[index])
+
+    @property
+    def root(self):
+        """Untyped-API compatible model root (GetUnitsOfType("Projects$Module"), ...)."""
+        return self._root
+
+    def node_ids(self) -> List[str]:
+        """ID of every node, by node index."""
+        if self._ids is None:
+            ids = getattr(self._nodes, "ids", None)
+            self._ids = list(ids()) if ids is not None else [self._nodes[i].id for i in range(len(self._nodes))]
+        return self._ids
+
+    def find_by_id(self, node_id: str) -> Optional[SnapshotObject]:
+        if self._by_id is None:
+            self._by_id = {node_id: i for i, node_id in enumerate(self.node_ids())}
+        index = self._by_id.get(node_id)
+        return self.view(index) if index is not None else None
+
+    def descendant_units(self, index: int) -> List[int]:
+        result = []
+        stack = list(self._nodes[index].units)
+        while stack:
+            unit = stack.pop()
+            result.append(unit)
+            stack.extend(self._nodes[unit].units)
+        return result
+
+    def unit_hashes(self) -> Dict[int, str]:
+        """Content digest per unit (unit node index -> hex), over the unit's own elements.
+
+        Element references are hashed by target ID rather than node index, so
+        an unchanged unit has the same digest in every snapshot of the model.
+        The unit's position (container) is not part of its digest.
+        """
+        if self._unit_hashes is None:
+            ids = self.node_ids()
+            hashers = {}
+            for record in self.nodes():
+                hasher = hashers.get(record.unit)
+                if hasher is None:
+                    hasher = hashers[record.unit] = hashlib.blake2b(digest_size=16)
+                parts = [record.id, record.type, record.name or ""]
+                for prop in record.properties:
+                    value = prop.value
+                    if prop.kind == KIND_ELEMENT:
+                        value = ids[value] if value != NO_NODE else None
+                    elif prop.kind == KIND_ELEMENTS:
+                        value = tuple(ids[i] for i in value)
+                    parts.append(f"{prop.name}={value!r}")
+                hasher.update("\x1f".join(parts).encode("utf-8", "surrogatepass"))
+                hasher.update(b"\x1e")
+            self._unit_hashes = {unit: hasher.hexdigest() for unit, hasher in hashers.items()}
+        return self._unit_hashes
+
+    def get_context(self):
+        """MendixContext (wrapping, name index, references) over this snapshot instead of the live model."""
+        if self._context is None:
+            from pymx.model.untyped_model_wrapper import MendixContext
+            self._context = MendixContext(None, self.root, track_generations=False)
+        return self._context
+
+    def close(self):
+        """Release the backing file mapping of a loaded snapshot (no-op for in-memory snapshots)."""
+        close = getattr(self._nodes, "close", None)
+        if close is not None:
+            close()
+
+    def stats(self) -> Dict[str, object]:
+        units = sum(1 for i in range(len(self._nodes)) if self._nodes[i].is_unit)
+        return {
+            "nodes": len(self._nodes),
+            "units": units,
+            "elements": len(self._nodes) - units,
+            "modules": len(self.modules),
+            "build_seconds": round(self.build_seconds, 3),
+        }
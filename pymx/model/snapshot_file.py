@@ -0,0 +1,402 @@
+"""
+Persistent, memory-mapped storage for ModelSnapshot.
+
+Snapshots are written to `<project dir>/.mendix-cache/model-snapshot/` as one
+binary file per model fingerprint. The fingerprint is derived from the
+.mpr file(s) and `mprcontents/` on disk, so a snapshot whose model has
+changed is never picked up again: it is rebuilt and the stale file removed.
+Once the live model has changed in this process (a generation bump, see
+pymx.model.generations) the files on disk no longer describe it, so
+session_fingerprint() keys such snapshots to the process and generation.
+
+File layout (little-endian):
+
+    header       HEADER
+    strings      u64 offset table (count + 1 entries) + UTF-8 blob
+    node table   u64 offset per node
+    modules      u32 node index per module
+    nodes        NODE, u32 child-unit indexes, then per property PROP + value
+
+Loading maps the file read-only and decodes nodes and strings on first
+access, so opening a large snapshot costs a header read and the pages are
+shared between processes that map the same file.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+from pymx.model.snapshot import (
+    KIND_ELEMENT,
+    KIND_ELEMENTS,
+    KIND_NONE,
+    KIND_PRIMITIVE,
+    KIND_PRIMITIVES,
+    ModelSnapshot,
+    NodeRecord,
+    Point,
+    PropertyRecord,
+    build_snapshot,
+)
+
+MAGIC = b"PMXSNAP\0"
+FORMAT_VERSION = 1
+CACHE_SUBDIR = Path(".mendix-cache") / "model-snapshot"
+FILE_PREFIX = "model-"
+FILE_SUFFIX = ".snap"
+
+# magic, version, node count, string count, module count, fingerprint string id,
+# string table offset, node table offset, modules offset
+HEADER = struct.Struct("<8sIIIIIQQQ")
+# id sid, type sid, name sid (-1 = None), is_unit, unit, container, child unit count, property count
+NODE = struct.Struct("<IIiBiiII")
+# name sid, is_list, kind code
+PROP = struct.Struct("<IBB")
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+POINT = struct.Struct("<ii")
+
+_KIND_CODES = {KIND_NONE: 0, KIND_PRIMITIVE: 1, KIND_ELEMENT: 2, KIND_ELEMENTS: 3, KIND_PRIMITIVES: 4}
+_KIND_NAMES = {code: kind for kind, code in _KIND_CODES.items()}
+
+# Primitive value tags
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_POINT, _T_BIGINT = range(8)
+
+
+class SnapshotFormatError(Exception):
+    """The file is not a readable snapshot of this format version."""
+
+
+# ==========================================
+# Fingerprint / locations
+# ==========================================
+
+
+def project_directory(app) -> Optional[Path]:
+    """Directory of the app's .mpr, or None when Studio Pro does not expose it."""
+    try:
+        directory = app.Root.DirectoryPath
+    except AttributeError:
+        return None
+    return Path(str(directory)) if directory else None
+
+
+def model_fingerprint(project_dir: Path) -> str:
+    """Hash of the on-disk model state (.mpr files and mprcontents/) plus the format version."""
+    digest = hashlib.sha1(f"pymx-snapshot:{FORMAT_VERSION}".encode())
+    project_dir = Path(project_dir)
+    for mpr in sorted(project_dir.glob("*.mpr")):
+        stat = mpr.stat()
+        digest.update(f"{mpr.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    contents = project_dir / "mprcontents"
+    if contents.is_dir():
+        count = total = latest = 0
+        for dirpath, _dirnames, filenames in os.walk(contents):
+            for filename in filenames:
+                try:
+                    stat = os.stat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                count += 1
+                total += stat.st_size
+                latest = max(latest, stat.st_mtime_ns)
+        digest.update(f"mprcontents:{count}:{total}:{latest}".encode())
+    return digest.hexdigest()
+
+
+def session_fingerprint(fingerprint: str, generation: int) -> str:
+    """Fingerprint of a live model edited in this process: never matches a file of another session."""
+    return hashlib.sha1(f"{fingerprint}:{os.getpid()}:{generation}".encode()).hexdigest()
+
+
+def snapshot_path(project_dir: Path, fingerprint: str) -> Path:
+    return Path(project_dir) / CACHE_SUBDIR / f"{FILE_PREFIX}{fingerprint[:20]}{FILE_SUFFIX}"
+
+
+# ==========================================
+# Writer
+# ==========================================
+
+
+def write_snapshot(snapshot: ModelSnapshot, path: Path) -> Path:
+    """Serialize a snapshot to `path` (written to a temp file, then atomically renamed)."""
+    strings = {}
+
+    def sid(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    def write_value(out: bytearray, value):
+        if value is None:
+            out.append(_T_NONE)
+        elif value is True:
+            out.append(_T_TRUE)
+        elif value is False:
+            out.append(_T_FALSE)
+        elif isinstance(value, Point):
+            out.append(_T_POINT)
+            out += POINT.pack(value.X, value.Y)
+        elif isinstance(value, int):
+            if -(1 << 63) <= value < (1 << 63):
+                out.append(_T_INT)
+                out += I64.pack(value)
+            else:
+                out.append(_T_BIGINT)
+                out += U32.pack(sid(str(value)))
+        elif isinstance(value, float):
+            out.append(_T_FLOAT)
+            out += F64.pack(value)
+        else:
+            out.append(_T_STR)
+            out += U32.pack(sid(str(value)))
+
+    fingerprint_sid = sid(snapshot.fingerprint)
+    body = bytearray()
+    node_offsets = []
+    for record in snapshot.nodes():
+        node_offsets.append(len(body))
+        body += NODE.pack(sid(record.id), sid(record.type),
+                          sid(record.name) if record.name is not None else -1,
+                          1 if record.is_unit else 0, record.unit, record.container,
+                          len(record.units), len(record.properties))
+        if record.units:
+            body += struct.pack(f"<{len(record.units)}I", *record.units)
+        for prop in record.properties:
+            kind = prop.kind
+            body += PROP.pack(sid(prop.name), 1 if prop.is_list else 0, _KIND_CODES[kind])
+            if kind == KIND_PRIMITIVE:
+                write_value(body, prop.value)
+            elif kind == KIND_ELEMENT:
+                body += U32.pack(prop.value)
+            elif kind == KIND_ELEMENTS:
+                body += U32.pack(len(prop.value))
+                body += struct.pack(f"<{len(prop.value)}I", *prop.value)
+            elif kind == KIND_PRIMITIVES:
+                body += U32.pack(len(prop.value))
+                for value in prop.value:
+                    write_value(body, value)
+
+    encoded = [s.encode("utf-8") for s in strings]  # dict preserves insertion (= sid) order
+    string_table_offset = HEADER.size
+    blob_offset = string_table_offset + U64.size * (len(encoded) + 1)
+    string_offsets = []
+    position = blob_offset
+    for data in encoded:
+        string_offsets.append(position)
+        position += len(data)
+    string_offsets.append(position)
+
+    node_table_offset = position
+    modules_offset = node_table_offset + U64.size * len(node_offsets)
+    body_offset = modules_offset + U32.size * len(snapshot.modules)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(node_offsets), len(encoded), len(snapshot.modules),
+                                fingerprint_sid, string_table_offset, node_table_offset, modules_offset))
+            f.write(struct.pack(f"<{len(string_offsets)}Q", *string_offsets))
+            for data in encoded:
+                f.write(data)
+            f.write(struct.pack(f"<{len(node_offsets)}Q", *(body_offset + o for o in node_offsets)))
+            f.write(struct.pack(f"<{len(snapshot.modules)}I", *snapshot.modules))
+            f.write(body)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    return path
+
+
+# ==========================================
+# Memory-mapped reader
+# ==========================================
+
+
+class _MappedStrings:
+    __slots__ = ("_buf", "_offsets_pos", "_cache")
+
+    def __init__(self, buf, offsets_pos: int, count: int):
+        self._buf = buf
+        self._offsets_pos = offsets_pos
+        self._cache = [None] * count
+
+    def __getitem__(self, index: int) -> str:
+        value = self._cache[index]
+        if value is None:
+            start, end = struct.unpack_from("<2Q", self._buf, self._offsets_pos + index * U64.size)
+            value = self._cache[index] = self._buf[start:end].decode("utf-8")
+        return value
+
+
+class _MappedNodeTable(Sequence):
+    """Read-only node sequence decoding NodeRecords from the mapped file on first access."""
+
+    __slots__ = ("_buf", "_strings", "_table_pos", "_records")
+
+    def __init__(self, buf, strings: _MappedStrings, table_pos: int, count: int):
+        self._buf = buf
+        self._strings = strings
+        self._table_pos = table_pos
+        self._records = [None] * count
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise TypeError("snapshot node tables only support integer indexes")
+        if index < 0:
+            index += len(self._records)
+        record = self._records[index]
+        if record is None:
+            record = self._records[index] = self._decode(index)
+        return record
+
+    def _offset(self, index: int) -> int:
+        return U64.unpack_from(self._buf, self._table_pos + index * U64.size)[0]
+
+    def ids(self):
+        """All node IDs in index order, without decoding the nodes' properties."""
+        buf, strings = self._buf, self._strings
+        return [strings[U32.unpack_from(buf, self._offset(i))[0]] for i in range(len(self._records))]
+
+    def _read_value(self, offset: int):
+        buf = self._buf
+        tag = buf[offset]
+        offset += 1
+        if tag == _T_NONE:
+            return None, offset
+        if tag == _T_TRUE:
+            return True, offset
+        if tag == _T_FALSE:
+            return False, offset
+        if tag == _T_INT:
+            return I64.unpack_from(buf, offset)[0], offset + I64.size
+        if tag == _T_FLOAT:
+            return F64.unpack_from(buf, offset)[0], offset + F64.size
+        if tag == _T_STR:
+            return self._strings[U32.unpack_from(buf, offset)[0]], offset + U32.size
+        if tag == _T_POINT:
+            return Point(*POINT.unpack_from(buf, offset)), offset + POINT.size
+        if tag == _T_BIGINT:
+            return int(self._strings[U32.unpack_from(buf, offset)[0]]), offset + U32.size
+        raise SnapshotFormatError(f"Unknown value tag {tag} at offset {offset - 1}")
+
+    def _decode(self, index: int) -> NodeRecord:
+        buf, strings = self._buf, self._strings
+        offset = self._offset(index)
+        id_sid, type_sid, name_sid, is_unit, unit, container, unit_count, prop_count = NODE.unpack_from(buf, offset)
+        offset += NODE.size
+        units = struct.unpack_from(f"<{unit_count}I", buf, offset) if unit_count else ()
+        offset += U32.size * unit_count
+
+        properties = []
+        for _ in range(prop_count):
+            prop_sid, is_list, kind_code = PROP.unpack_from(buf, offset)
+            offset += PROP.size
+            kind = _KIND_NAMES[kind_code]
+            value = None
+            if kind == KIND_PRIMITIVE:
+                value, offset = self._read_value(offset)
+            elif kind == KIND_ELEMENT:
+                value = U32.unpack_from(buf, offset)[0]
+                offset += U32.size
+            elif kind == KIND_ELEMENTS:
+                count = U32.unpack_from(buf, offset)[0]
+                value = struct.unpack_from(f"<{count}I", buf, offset + U32.size)
+                offset += U32.size * (count + 1)
+            elif kind == KIND_PRIMITIVES:
+                count = U32.unpack_from(buf, offset)[0]
+                offset += U32.size
+                values = []
+                for _ in range(count):
+                    item, offset = self._read_value(offset)
+                    values.append(item)
+                value = tuple(values)
+            properties.append(PropertyRecord(strings[prop_sid], bool(is_list), kind, value))
+
+        return NodeRecord(index, strings[id_sid], strings[type_sid],
+                          strings[name_sid] if name_sid >= 0 else None,
+                          bool(is_unit), unit, container, tuple(units), tuple(properties))
+
+    def close(self):
+        self._buf.close()
+
+
+def load_snapshot(path: Path, expected_fingerprint: Optional[str] = None) -> ModelSnapshot:
+    """Memory-map a snapshot file. Raises SnapshotFormatError for foreign, outdated or stale files."""
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if len(buf) < HEADER.size:
+            raise SnapshotFormatError(f"{path}: truncated header")
+        (magic, version, node_count, string_count, module_count, fingerprint_sid,
+         string_table_offset, node_table_offset, modules_offset) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise SnapshotFormatError(f"{path}: not a model snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotFormatError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+
+        strings = _MappedStrings(buf, string_table_offset, string_count)
+        fingerprint = strings[fingerprint_sid]
+        if expected_fingerprint is not None and fingerprint != expected_fingerprint:
+            raise SnapshotFormatError(f"{path}: stale snapshot (fingerprint mismatch)")
+        modules = struct.unpack_from(f"<{module_count}I", buf, modules_offset) if module_count else ()
+        nodes = _MappedNodeTable(buf, strings, node_table_offset, node_count)
+    except (SnapshotFormatError, struct.error, UnicodeDecodeError, IndexError) as e:
+        buf.close()
+        if isinstance(e, SnapshotFormatError):
+            raise
+        raise SnapshotFormatError(f"{path}: corrupt snapshot ({e})") from e
+    return ModelSnapshot(nodes, tuple(modules), fingerprint)
+
+
+def _remove_stale_files(directory: Path, keep: Path):
+    for stale in directory.glob(f"{FILE_PREFIX}*{FILE_SUFFIX}*"):
+        if stale != keep:
+            try:
+                stale.unlink()
+            except OSError:
+                # Still mapped by another process (Windows); retried on the next rebuild
+                pass
+
+
+def get_or_build_snapshot(project_dir: Optional[Path], root, rebuild: bool = False,
+                          fingerprint: Optional[str] = None) -> ModelSnapshot:
+    """Load the snapshot for the current on-disk model, building and persisting it when missing or stale.
+
+    Without a project directory the snapshot is built in memory only.
+    """
+    if project_dir is None:
+        return build_snapshot(root)
+
+    fingerprint = fingerprint or model_fingerprint(project_dir)
+    path = snapshot_path(project_dir, fingerprint)
+    if not rebuild and path.exists():
+        try:
+            return load_snapshot(path, fingerprint)
+        except (SnapshotFormatError, OSError, ValueError):
+            pass  # corrupt or foreign file: rebuild below
+
+    snapshot = build_snapshot(root, fingerprint)
+    try:
+        write_snapshot(snapshot, path)
+    except OSError:
+        return snapshot  # target still mapped elsewhere (Windows): serve the in-memory copy
+    _remove_stale_files(path.parent, path)
+    return load_snapshot(path, fingerprint)
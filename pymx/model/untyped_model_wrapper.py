@@ -1,9 +1,19 @@
-import clr
 import traceback
-from System import Exception as SystemException
+import weakref
+from collections.abc import Sequence
 
-clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
-from Mendix.StudioPro.ExtensionsAPI.Model.UntypedModel import PropertyType
+try:
+    import clr
+    from System import Exception as SystemException
+
+    clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
+    from Mendix.StudioPro.ExtensionsAPI.Model.UntypedModel import PropertyType
+except Exception:
+    # 脱离 Studio Pro 运行 (例如基于 pymx.model.snapshot 的模型快照做离线分析、导出的 spawn 工作进程) 时不依赖 pythonnet；
+    # 装有 pythonnet 但找不到 Mendix 程序集时 clr.AddReference 抛出的并非 ImportError
+    clr = None
+
+from pymx.model import generations
 
 # @CORE:UntypedModelWrapper - 核心动态代理框架，提供对 Mendix Untyped Model 的 Pythonic 访问。
 # This module provides a dynamic proxy framework for interacting with Mendix's Untyped Model API.
@@ -39,22 +49,168 @@ def MendixMap(mendix_type_str):
 
     def decorator(cls):
         _MENDIX_TYPE_REGISTRY[mendix_type_str] = cls
+        _DISPATCH_TABLE.clear()  # 注册表变化后派发结果需重新计算
         return cls
 
     return decorator
 
 
+# ==============================================================================
+# 类型派发：类型字符串 -> 最具体的已注册封装类
+# ==============================================================================
+# Untyped API 不暴露元模型的继承关系，这里声明派发需要的部分 (子类型 -> 父类型)。
+# 未注册的子类型沿父链找到最近的已注册祖先，而不是退化为裸 MendixElement。
+
+_PAGE_BUTTONS = ("ActionButton", "DropDownButton", "LinkButton", "LoginButton", "SidebarToggleButton")
+_PAGE_INPUTS = ("TextBox", "TextArea", "DatePicker", "DropDown", "CheckBox", "RadioButtonGroup",
+                "ReferenceSelector", "ReferenceSetSelector", "InputReferenceSetSelector",
+                "LoginIdTextBox", "PasswordTextBox", "FileManager", "ImageUploader")
+_PAGE_GRIDS = ("DataGrid", "TemplateGrid", "ReferenceSetSelectorGrid")
+_PAGE_WIDGETS = ("DataView", "ListView", "GroupBox", "TabContainer", "ScrollContainer", "Table",
+                 "DivContainer", "LayoutGrid", "SnippetCallWidget", "CustomWidget", "Label", "Title",
+                 "Text", "DynamicText", "DynamicImageViewer", "StaticImageViewer", "NavigationTree",
+                 "NavigationList", "MenuBar", "SimpleMenuBar", "Header", "ValidationMessage",
+                 "Placeholder", "ListViewSearch", "SearchBar")
+
+_TYPE_PARENTS = {
+    "Pages$Button": "Pages$Widget",
+    "Pages$InputWidget": "Pages$Widget",
+    "Pages$Grid": "Pages$Widget",
+    **{f"Pages${name}": "Pages$Button" for name in _PAGE_BUTTONS},
+    **{f"Pages${name}": "Pages$InputWidget" for name in _PAGE_INPUTS},
+    **{f"Pages${name}": "Pages$Grid" for name in _PAGE_GRIDS},
+    **{f"Pages${name}": "Pages$Widget" for name in _PAGE_WIDGETS},
+    "Pages$GlyphIcon": "Pages$Icon",
+    "Pages$ImageIcon": "Pages$Icon",
+    # 旧版本 Mendix 中的类型名
+    "Workflows$UserTask": "Workflows$SingleUserTaskActivity",
+    "Workflows$SystemTask": "Workflows$CallMicroflowTask",
+}
+
+# 命名约定兜底：(类型前缀, 名称后缀, 基类型)，覆盖表中未声明的新类型 (如新增的 Widget / ClientAction)
+_SUFFIX_BASES = (
+    ("Pages$", "ClientAction", "Pages$ClientAction"),
+    ("Pages$", "DesignPropertyValue", "Pages$DesignPropertyValue"),
+    ("Pages$", "Icon", "Pages$Icon"),
+    ("Pages$", "Button", "Pages$Button"),
+    ("Pages$", "Widget", "Pages$Widget"),
+)
+
+_DISPATCH_TABLE = {}
+
+
+def _parent_type(full_type):
+    parent = _TYPE_PARENTS.get(full_type)
+    if parent is not None:
+        return parent
+    for prefix, suffix, base in _SUFFIX_BASES:
+        if full_type != base and full_type.startswith(prefix) and full_type.endswith(suffix):
+            return base
+    return None
+
+
+def resolve_wrapper_class(full_type):
+    """类型字符串对应的封装类 (精确注册 > 最近的已注册祖先 > MendixElement)，每个类型只计算一次"""
+    cls = _DISPATCH_TABLE.get(full_type)
+    if cls is None:
+        cls = MendixElement
+        seen = set()
+        current = full_type
+        while current is not None and current not in seen:
+            seen.add(current)
+            registered = _MENDIX_TYPE_REGISTRY.get(current)
+            if registered is not None:
+                cls = registered
+                break
+            current = _parent_type(current)
+        _DISPATCH_TABLE[full_type] = cls
+    return cls
+
+
+# 全名索引覆盖的文档类型 (模块本身单独索引)
+_INDEXED_UNIT_TYPES = (
+    "Microflows$Microflow",
+    "Microflows$Nanoflow",
+    "Pages$Page",
+    "Pages$Snippet",
+    "Workflows$Workflow",
+    "Enumerations$Enumeration",
+    "Constants$Constant",
+    "JavaActions$JavaAction",
+)
+
+# 每个上下文保留的选择器查询结果数
+_QUERY_CACHE_SIZE = 16
+_CFG_CACHE_SIZE = 256
+
+
 class MendixContext:
     """运行上下文：负责日志管理、全局搜索缓存和 Unit 查找"""
 
-    def __init__(self, model, root_node):
+    def __init__(self, model, root_node, track_generations=True):
         self.root = root_node
         self.model = model
         self.log_buffer = []
         self._entity_qname_cache = {}
         self._is_initialized = False
+        # 身份映射：同一 ID 的原始对象只封装一次，属性缓存在所有访问路径间共享
+        # 弱引用值：封装对象不再被引用时自动回收，不延长模型对象生命周期
+        self._identity_map = weakref.WeakValueDictionary()
+        self.identity_hits = 0
+        self.identity_misses = 0
+        # 元素 ID -> 类型字符串：跨身份映射重置保留，模型变更时随其他缓存清空 (删除的元素不再常驻)
+        self._type_cache = {}
+        # 统一全名索引：qname -> 原始 Unit (含文件夹限定名)，以及小写形式的回退索引
+        self._unit_index = None
+        self._unit_index_ci = None
+        # 本代数内是否已因未命中/失效重建过索引 (每代至多一次)，以及未命中的全名 (小写) 负缓存
+        self._unit_index_refreshed = False
+        self._unit_misses = set()
+        # 反向引用索引 (pymx.model.reference_index.ReferenceIndex)，首次查询时构建
+        self._reference_index = None
+        # 选择器查询结果缓存 (规范化选择器 -> 全部匹配)，供翻页复用
+        self._query_cache = {}
+        # 微流控制流图缓存 (Unit ID -> pymx.model.microflow_cfg.ControlFlowGraph)
+        self._cfg_cache = {}
+        # 模块文件夹树缓存 (模块 ID -> pymx.model.module_tree.ModuleTree)
+        self._module_trees = {}
+        # 全应用继承索引 (pymx.model.generalization_index.GeneralizationIndex)，首次查询时构建
+        self._generalization_index = None
+        # 全应用实体关系图 (pymx.model.domain_graph.DomainGraph)，首次查询时构建
+        self._domain_graph = None
+        # 类型对象 ID -> DSL 类型字符串 (Java 操作参数/返回类型)，随模型变更清空
+        self._type_strings = {}
+        # 模型代数：所有缓存按此校验，模型变更 (事务提交/模型事件) 后整体失效
+        # 不可变的数据源 (如模型快照) 无需跟踪
+        self._track_generations = track_generations
+        self._generation = generations.global_generation()
+
+    def _sync_generation(self):
+        """模型代数变化时丢弃全部缓存 (实体表、全名索引、反向引用索引、继承索引、类型缓存、身份映射)"""
+        if not self._track_generations:
+            return
+        current = generations.global_generation()
+        if current == self._generation:
+            return
+        self._generation = current
+        self._entity_qname_cache = {}
+        self._is_initialized = False
+        self._unit_index = None
+        self._unit_index_ci = None
+        self._unit_index_refreshed = False
+        self._unit_misses = set()
+        self._reference_index = None
+        self._query_cache = {}
+        self._cfg_cache = {}
+        self._module_trees = {}
+        self._generalization_index = None
+        self._domain_graph = None
+        self._type_strings = {}
+        self._type_cache = {}
+        self._identity_map.clear()
 
     def _ensure_initialized(self):
+        self._sync_generation()
         if self._is_initialized:
             return
         # 预扫描所有模块和实体，建立 O(1) 查询表
@@ -76,16 +232,270 @@ class MendixContext:
     def flush_logs(self):
         return "\n".join(self.log_buffer)
 
-    def find_module(self, module_name):
-        modules = list(self.root.GetUnitsOfType("Projects$Module"))
-        raw = next((m for m in modules if m.Name == module_name), None)
+    def _build_unit_index(self):
+        """一次遍历建立 模块/文档 全名 -> 原始 Unit 的 O(1) 查询表"""
+        index = {}
+        for mod in self.root.GetUnitsOfType("Projects$Module"):
+            mod_name = mod.Name
+            index[mod_name] = mod
+
+            # 文件夹 ID -> (名称, 父容器 ID)，用于拼出文件夹限定名
+            folders = {}
+            for folder in mod.GetUnitsOfType("Projects$Folder"):
+                folders[folder.ID.ToString()] = (folder.Name, folder.Container.ID.ToString())
+
+            for unit_type in _INDEXED_UNIT_TYPES:
+                try:
+                    units = mod.GetUnitsOfType(unit_type)
+                except Exception:
+                    continue  # 旧版本 Mendix 不支持的类型 (如 Workflows)
+                for unit in units:
+                    name = unit.Name
+                    index[f"{mod_name}.{name}"] = unit
+                    if folders:
+                        path = []
+                        parent_id = unit.Container.ID.ToString()
+                        while parent_id in folders:
+                            folder_name, parent_id = folders[parent_id]
+                            path.append(folder_name)
+                        if path:
+                            path.reverse()
+                            index[f"{mod_name}.{'.'.join(path)}.{name}"] = unit
+
+        index_ci = {}
+        for qname, unit in index.items():
+            index_ci.setdefault(qname.lower(), unit)
+        self._unit_index = index
+        self._unit_index_ci = index_ci
+
+    @staticmethod
+    def _is_unit_current(unit, qname):
+        """自校验：沿容器链拼出 Unit 当前的全名 (模块、文件夹路径、名称)，重命名/移动/删除后不再匹配 qname"""
+        try:
+            if unit.Type == "Projects$Module":
+                return unit.Name.lower() == qname.lower()
+            folders = []
+            container = unit.Container
+            while container.Type == "Projects$Folder":
+                folders.append(container.Name)
+                container = container.Container
+            module_name = container.Name
+            names = {f"{module_name}.{unit.Name}".lower(),
+                     ".".join([module_name, *reversed(folders), unit.Name]).lower()}
+        except Exception:
+            return False
+        return qname.lower() in names
+
+    def _lookup_unit(self, qname):
+        unit = self._unit_index.get(qname)
+        if unit is None:
+            unit = self._unit_index_ci.get(qname.lower())
+        return unit
+
+    def get_unit(self, qname, unit_type=None):
+        """按全名查找原始 Unit (模块名、Module.Doc 或 Module.Folder.Doc)，大小写不敏感回退
+
+        未命中或命中已失效的 Unit 时重建索引以反映模型的新增/重命名/删除，每个模型代数至多重建一次；
+        此后仍未命中的全名记入负缓存，直到模型代数变化。
+        """
+        if not qname:
+            return None
+        self._sync_generation()
+        key = qname.lower()
+        if key in self._unit_misses:
+            return None
+        if self._unit_index is None:
+            self._build_unit_index()
+        unit = self._lookup_unit(qname)
+        if (unit is None or not self._is_unit_current(unit, qname)) and not self._unit_index_refreshed:
+            self._unit_index_refreshed = True
+            self._build_unit_index()
+            unit = self._lookup_unit(qname)
+        if unit is not None and not self._is_unit_current(unit, qname):
+            unit = None
+        if unit is None:
+            self._unit_misses.add(key)
+            return None
+        if unit_type and unit.Type != unit_type:
+            return None
+        return unit
+
+    def find_unit(self, qname, unit_type=None):
+        raw = self.get_unit(qname, unit_type)
         return ElementFactory.create(raw, self) if raw else None
 
+    def find_module(self, module_name):
+        return self.find_unit(module_name, "Projects$Module")
+
     def find_entity_by_qname(self, qname):
         self._ensure_initialized()
         raw = self._entity_qname_cache.get(qname)
         return ElementFactory.create(raw, self) if raw else None
 
+    def get_reference_index(self, rebuild=False):
+        self._sync_generation()
+        if self._reference_index is None or rebuild:
+            from pymx.model import reference_index
+            self._reference_index = reference_index.build_reference_index(self.root)
+            self._query_cache = {}
+        return self._reference_index
+
+    def find_references(self, qname, rebuild=False):
+        """反向引用查询：返回所有引用 qname 的位置 (ReferenceRecord 列表)"""
+        return self.get_reference_index(rebuild).find(qname)
+
+    def query(self, selector, offset=0, limit=None, rebuild=False):
+        """选择器查询 (语法见 pymx.model.query)：借助类型/反向引用索引裁剪候选 Unit，分页返回 QueryPage"""
+        from pymx.model import query as model_query
+        index = self.get_reference_index(rebuild)
+        parsed = model_query.parse_selector(selector)
+        cached = self._query_cache.get(parsed.text)
+        if cached is None:
+            cached = model_query.evaluate(parsed, index)
+            if len(self._query_cache) >= _QUERY_CACHE_SIZE:
+                self._query_cache.pop(next(iter(self._query_cache)))
+            self._query_cache[parsed.text] = cached
+        matches, units_walked = cached
+        return model_query.page_results(parsed.text, matches, units_walked, len(index.units),
+                                        offset, limit or model_query.DEFAULT_PAGE_SIZE)
+
+    def get_microflow_cfg(self, microflow):
+        """微流 (原始 Unit 或封装对象) 的控制流图，按 Unit ID 缓存至模型变更，供 DSL 与其他分析复用"""
+        from pymx.model import microflow_cfg
+        self._sync_generation()
+        raw = getattr(microflow, "_raw", microflow)
+        key = raw.ID.ToString()
+        cfg = self._cfg_cache.get(key)
+        if cfg is None:
+            if len(self._cfg_cache) >= _CFG_CACHE_SIZE:
+                self._cfg_cache.pop(next(iter(self._cfg_cache)))
+            cfg = self._cfg_cache[key] = microflow_cfg.build_microflow_cfg(raw)
+        return cfg
+
+    def get_module_tree(self, module):
+        """模块 (原始 Unit 或封装对象) 的文件夹/文档树：一次 GetUnits() 建立父 -> 子映射，按模块缓存至模型变更"""
+        from pymx.model import module_tree
+        self._sync_generation()
+        raw = getattr(module, "_raw", module)
+        key = raw.ID.ToString()
+        tree = self._module_trees.get(key)
+        if tree is None:
+            tree = self._module_trees[key] = module_tree.build_module_tree(raw)
+        return tree
+
+    def get_generalization_index(self):
+        """全应用实体继承索引：父类链、根实体的持久化属性与继承深度，一次构建，缓存至模型变更"""
+        from pymx.model import generalization_index
+        self._sync_generation()
+        if self._generalization_index is None:
+            self._generalization_index = generalization_index.build_generalization_index(self.root)
+        return self._generalization_index
+
+    def get_domain_graph(self):
+        """全应用实体关系图：全局实体 ID -> 全名映射一次建立，关联两端跨模块解析，缓存至模型变更"""
+        from pymx.model import domain_graph
+        self._sync_generation()
+        if self._domain_graph is None:
+            self._domain_graph = domain_graph.build_domain_graph(self.root, self.get_generalization_index())
+        return self._domain_graph
+
+    def type_string_memo(self):
+        """类型对象 ID -> DSL 类型字符串的备忘表，供 DSL 在多次调用间复用类型解析结果"""
+        self._sync_generation()
+        return self._type_strings
+
+    def lookup_element(self, element_id):
+        """按元素/Unit ID 查找已封装的对象，未命中返回 None"""
+        self._sync_generation()
+        elem = self._identity_map.get(element_id)
+        if elem is None:
+            self.identity_misses += 1
+        else:
+            self.identity_hits += 1
+        return elem
+
+    def register_element(self, element_id, elem):
+        self._identity_map[element_id] = elem
+
+    def reset_element_cache(self):
+        """清空身份映射，丢弃所有已封装对象的共享属性缓存"""
+        self._identity_map.clear()
+
+    def identity_stats(self):
+        """身份映射统计：当前存活的封装对象数与命中/未命中次数"""
+        return {
+            "size": len(self._identity_map),
+            "hits": self.identity_hits,
+            "misses": self.identity_misses,
+        }
+
+
+# 属性访问表：按 Mendix 类型缓存属性解析结果 (full_type -> {snake_name: _PropertyAccessor | None})
+# 命名转换和类型探测每个类型只做一次，之后同类型的所有实例直接复用
+_ACCESSOR_TABLES = {}
+
+_KIND_PRIMITIVE = "primitive"
+_KIND_ELEMENT = "element"
+_KIND_LIST = "list"
+
+
+class _PropertyAccessor:
+    """已解析的属性访问信息：SDK 属性名、IsList 标记与结果类别"""
+
+    __slots__ = ("prop_name", "is_list", "kind")
+
+    def __init__(self, prop_name, is_list, kind):
+        self.prop_name = prop_name
+        self.is_list = is_list
+        self.kind = kind  # 单值属性在首次遇到非空值前为 None
+
+
+# 批量预取：单值子元素继续预取的默认层数 (ActionActivity -> Action -> MicroflowCall/RetrieveSource)
+PREFETCH_DEPTH = 2
+
+# 属性布局表：full_type -> {SDK 属性名: 在 GetProperties() 中的位置}
+# 同一类型所有实例的属性顺序一致，每个类型只读取一次属性名
+_PROPERTY_LAYOUTS = {}
+
+_UNRESOLVED = object()
+
+
+def _property_layout(full_type, props):
+    layout = _PROPERTY_LAYOUTS.get(full_type)
+    if layout is None or len(layout) != len(props):
+        layout = {prop.Name: position for position, prop in enumerate(props)}
+        if full_type:
+            _PROPERTY_LAYOUTS[full_type] = layout
+    return layout
+
+
+def _to_camel(name):
+    # cross_associations -> crossAssociations
+    parts = name.split("_")
+    return parts[0] + "".join(x.title() for x in parts[1:])
+
+
+def _resolve_accessor(raw_obj, full_type, name):
+    """返回 (accessor, prop)；prop 仅在本次新解析时非空，避免首个实例重复 GetProperty"""
+    table = _ACCESSOR_TABLES.get(full_type) if full_type else None
+    if table is not None and name in table:
+        return table[name], None
+
+    prop_name = _to_camel(name)
+    prop = raw_obj.GetProperty(prop_name)
+    if prop is None:
+        prop_name = name  # 备用尝试原始名
+        prop = raw_obj.GetProperty(name)
+
+    accessor = None
+    if prop is not None:
+        is_list = prop.IsList
+        accessor = _PropertyAccessor(prop_name, is_list, _KIND_LIST if is_list else None)
+
+    if full_type:
+        _ACCESSOR_TABLES.setdefault(full_type, {})[name] = accessor
+    return accessor, prop
+
 
 class ElementFactory:
     """工厂类：负责对象的动态封装"""
@@ -99,22 +509,117 @@ class ElementFactory:
         if isinstance(raw_obj, (str, int, float, bool)):
             return raw_obj
 
-        try:
-            full_type = raw_obj.Type
-        except AttributeError:
-            return MendixElement(raw_obj, context)
+        # 身份映射：同一原始对象只封装一次
+        element_id = None
+        if isinstance(context, MendixContext):
+            try:
+                element_id = raw_obj.ID.ToString()
+            except AttributeError:
+                element_id = None
+            if element_id is not None:
+                cached = context.lookup_element(element_id)
+                if cached is not None:
+                    return cached
+
+        # 类型字符串按元素 ID 缓存：身份映射重置后再次封装同一元素无需重新读取 Type
+        full_type = context._type_cache.get(element_id) if element_id is not None else None
+        if full_type is None:
+            try:
+                full_type = raw_obj.Type
+            except AttributeError:
+                return MendixElement(raw_obj, context)
+            if element_id is not None:
+                context._type_cache[element_id] = full_type
+
+        target_cls = resolve_wrapper_class(full_type)
+        elem = target_cls(raw_obj, context, full_type)
+        if element_id is not None:
+            context.register_element(element_id, elem)
+        return elem
+
+
+_UNMATERIALIZED = object()
+
+
+class LazyElementList(Sequence):
+    """惰性列表代理：IsList 属性的值按需封装，已封装的元素会被缓存
+
+    只有真正被访问到的元素才会经过 ElementFactory，适用于只取 [0]、长度或首个匹配项的场景。
+    """
+
+    __slots__ = ("_prop", "_ctx", "_raw_values", "_items")
+
+    def __init__(self, prop, context):
+        self._prop = prop
+        self._ctx = context
+        self._raw_values = None  # 首次使用时才调用 GetValues()
+        self._items = None
+
+    def _ensure_raw(self):
+        if self._raw_values is None:
+            self._raw_values = list(self._prop.GetValues())
+            self._items = [_UNMATERIALIZED] * len(self._raw_values)
+            self._prop = None
+        return self._raw_values
+
+    def _item(self, index):
+        item = self._items[index]
+        if item is _UNMATERIALIZED:
+            item = self._items[index] = ElementFactory.create(self._raw_values[index], self._ctx)
+        return item
+
+    def __len__(self):
+        return len(self._ensure_raw())
+
+    def __getitem__(self, index):
+        size = len(self._ensure_raw())
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("list index out of range")
+        return self._item(index)
+
+    def __iter__(self):
+        for index in range(len(self._ensure_raw())):
+            yield self._item(index)
+
+    @property
+    def materialized_count(self):
+        """已封装的元素数量"""
+        if self._items is None:
+            return 0
+        return sum(1 for item in self._items if item is not _UNMATERIALIZED)
 
-        target_cls = _MENDIX_TYPE_REGISTRY.get(full_type, MendixElement)
-        return target_cls(raw_obj, context)
+    def __repr__(self):
+        if self._raw_values is None:
+            return "LazyElementList(<not loaded>)"
+        return f"LazyElementList({len(self._raw_values)} items, {self.materialized_count} materialized)"
 
 
-class MendixElement:
+class _SlottedElementMeta(type):
+    """为所有封装子类自动补上空 __slots__，避免 @MendixMap 子类重新引入 __dict__"""
+
+    def __new__(mcs, name, bases, namespace):
+        namespace.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class MendixElement(metaclass=_SlottedElementMeta):
     """动态代理基类：支持属性缓存、多态摘要和 snake_case 自动转换"""
 
-    def __init__(self, raw_obj, context):
+    # 紧凑布局：整个封装层次都不带 __dict__；__weakref__ 供身份映射使用
+    __slots__ = ("_raw", "ctx", "_full_type", "_cache", "__weakref__")
+
+    # 批量预取集合 (snake_case 属性名)：子类声明后，首次访问其中任一属性时整组一次取回
+    _prefetch_ = ()
+
+    def __init__(self, raw_obj, context, full_type=None):
         self._raw = raw_obj
         self.ctx = context
-        self._cache = {}  # 性能优化：缓存属性结果
+        self._full_type = full_type  # 由 ElementFactory 传入，避免重复读取 raw.Type
+        self._cache = None  # 性能优化：属性结果缓存，首次写入时才分配
 
     @property
     def is_valid(self):
@@ -124,49 +629,120 @@ class MendixElement:
     def id(self):
         return self._raw.ID.ToString() if self.is_valid else "0"
 
+    @property
+    def full_type(self):
+        if not self.is_valid:
+            return None
+        if self._full_type is None:
+            self._full_type = self._raw.Type
+        return self._full_type
+
     @property
     def type_name(self):
         if not self.is_valid:
             return "Null"
-        return self._raw.Type.split("$")[-1]
+        return self.full_type.split("$")[-1]
 
     def __getattr__(self, name):
         """核心魔法：映射 snake_case 到 CamelCase 并自动封装结果"""
+        if name.startswith("__"):
+            # Python 协议探测 (如 __dict__/__len__) 不是模型属性，不跨越到 SDK
+            raise AttributeError(name)
         if not self.is_valid:
             return None
-        if name in self._cache:
-            return self._cache[name]
-
-        # 1. 转换命名: cross_associations -> crossAssociations
-        parts = name.split("_")
-        camel_name = parts[0] + "".join(x.title() for x in parts[1:])
+        cache = self._cache
+        if cache is not None and name in cache:
+            return cache[name]
+        if cache is None and name in type(self)._prefetch_:
+            # 首次访问预取集合中的属性：整组一次取回
+            cache = self.prefetch()._cache
+            if name in cache:
+                return cache[name]
+
+        # 1. 查属性访问表（每个类型只做一次命名转换和属性探测）
+        accessor, prop = _resolve_accessor(self._raw, self._full_type, name)
+        if accessor is None:
+            raise AttributeError(f"'{self.type_name}' has no property '{name}'")
 
         # 2. 从 SDK 获取
-        prop = self._raw.GetProperty(camel_name)
         if prop is None:
-            prop = self._raw.GetProperty(name)  # 备用尝试原始名
-
-        if prop is None:
-            raise AttributeError(f"'{self.type_name}' has no property '{name}'")
+            prop = self._raw.GetProperty(accessor.prop_name)
 
         # 3. 处理并缓存结果
-        if prop.IsList:
-            result = [ElementFactory.create(v, self.ctx) for v in prop.GetValues()]
+        result = self._load_property(name, accessor, prop)
+        if cache is None:
+            cache = self._cache = {}
+        cache[name] = result
+        return result
+
+    def _load_property(self, name, accessor, prop):
+        """读取属性值并转换为 Python 结果 (列表 -> LazyElementList，元素 -> 封装对象，字符串清理)"""
+        if accessor.is_list:
+            result = LazyElementList(prop, self.ctx)
         else:
             val = prop.Value
-            if hasattr(val, "Type") or hasattr(val, "ID"):
+            kind = accessor.kind
+            if kind is None and val is not None:
+                kind = _KIND_ELEMENT if (hasattr(val, "Type") or hasattr(val, "ID")) else _KIND_PRIMITIVE
+                accessor.kind = kind
+            if val is None:
+                result = None
+            elif kind == _KIND_ELEMENT:
                 result = ElementFactory.create(val, self.ctx)
             elif isinstance(val, str):
                 result = val.replace("\r\n", "\\n").strip()
             else:
                 result = val
 
-        if name=='documentation':
+        if name == 'documentation' and result:
             if len(result) > 30:
                 result = result[:30] + "..."
-        self._cache[name] = result
         return result
 
+    def prefetch(self, depth=None):
+        """按类声明的 _prefetch_ 一次 GetProperties() 取回属性并填充缓存
+
+        depth: 单值子元素继续预取其自身 _prefetch_ 的层数，默认 PREFETCH_DEPTH。
+        """
+        if not self.is_valid:
+            return self
+        names = type(self)._prefetch_
+        if depth is None:
+            depth = PREFETCH_DEPTH
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        pending = [n for n in names if n not in cache]
+        if pending:
+            full_type = self.full_type
+            props = list(self._raw.GetProperties())
+            layout = _property_layout(full_type, props)
+            table = _ACCESSOR_TABLES.setdefault(full_type, {})
+            for name in pending:
+                accessor = table.get(name, _UNRESOLVED)
+                if accessor is _UNRESOLVED:
+                    prop_name = _to_camel(name)
+                    if prop_name not in layout:
+                        prop_name = name  # 备用尝试原始名
+                    position = layout.get(prop_name)
+                    if position is None:
+                        table[name] = None  # 与 __getattr__ 一致：后续访问抛 AttributeError
+                        continue
+                    is_list = props[position].IsList
+                    accessor = table[name] = _PropertyAccessor(prop_name, is_list, _KIND_LIST if is_list else None)
+                elif accessor is None:
+                    continue
+                position = layout.get(accessor.prop_name)
+                if position is not None:
+                    cache[name] = self._load_property(name, accessor, props[position])
+
+        if depth > 0:
+            for name in names:
+                value = cache.get(name)
+                if isinstance(value, MendixElement) and value.is_valid and type(value)._prefetch_:
+                    value.prefetch(depth - 1)
+        return self
+
     def get_summary(self):
         """[多态方法] 默认摘要实现"""
         name_val = ""
@@ -191,25 +767,11 @@ class Projects_Module(MendixElement):
         return ElementFactory.create(raw_dm, self.ctx)
 
     def find_microflow(self, mf_name):
-        raw_mf = next(
-            (
-                m
-                for m in self._raw.GetUnitsOfType("Microflows$Microflow")
-                if m.Name == mf_name
-            ),
-            None,
-        )
+        raw_mf = self.ctx.get_unit(f"{self.name}.{mf_name}", "Microflows$Microflow")
         return ElementFactory.create(raw_mf, self.ctx)
 
     def find_workflow(self, workflow_name):
-        raw_wf = next(
-            (
-                w
-                for w in self._raw.GetUnitsOfType("Workflows$Workflow")
-                if w.Name == workflow_name
-            ),
-            None,
-        )
+        raw_wf = self.ctx.get_unit(f"{self.name}.{workflow_name}", "Workflows$Workflow")
         return ElementFactory.create(raw_wf, self.ctx)
 
 @MendixMap("Projects$Folder")
@@ -221,21 +783,21 @@ class Projects_Folder(MendixElement):
 # region 2.1 DomainModels
 @MendixMap("DomainModels$Entity")
 class DomainModels_Entity(MendixElement):
+    _prefetch_ = ("name", "generalization", "documentation")
+
     def is_persistable(self):
-        gen = self.generalization
-        if not gen.is_valid:
-            return True  # 默认持久化
-        # 如果是 NoGeneralization，看其自身的 persistable 属性
-        if gen.type_name == "NoGeneralization":
-            return gen.persistable
-        # 如果是继承，递归看父类
-        parent_qname = gen.generalization
-        parent = self.ctx.find_entity_by_qname(parent_qname)
-        return parent.is_persistable() if parent and parent.is_valid else True
+        # 继承链的根实体决定持久化属性；父类缺失时默认持久化
+        return self.ctx.get_generalization_index().is_persistable(self._raw)
+
+    def inheritance_depth(self):
+        """父类链长度 (无继承为 0)"""
+        return self.ctx.get_generalization_index().depth(self._raw)
 
 
 @MendixMap("DomainModels$Association")
 class DomainModels_Association(MendixElement):
+    _prefetch_ = ("name", "parent", "child", "type", "owner")
+
     def get_info(self, lookup):
         p_name = lookup.get(str(self.parent), "Unknown")
         c_name = lookup.get(str(self.child), "Unknown")
@@ -245,6 +807,8 @@ class DomainModels_Association(MendixElement):
 
 @MendixMap("DomainModels$CrossAssociation")
 class DomainModels_CrossAssociation(MendixElement):
+    _prefetch_ = ("name", "parent", "child", "type", "owner")
+
     def get_info(self, lookup):
         p_name = lookup.get(str(self.parent), "Unknown")
         # CrossAssociation 的 child 属性通常已经是字符串全名
@@ -266,6 +830,8 @@ class DomainModels_AssociationCapabilities(MendixElement):
 # --- 属性类型定义 (Attribute Types) ---
 @MendixMap("DomainModels$Attribute")
 class DomainModels_Attribute(MendixElement):
+    _prefetch_ = ("name", "type", "documentation")
+
     def get_summary(self):
         doc = f" // {self.documentation}" if self.documentation else ""
         return f"- {self.name}: {self.type}{doc}"
@@ -273,6 +839,8 @@ class DomainModels_Attribute(MendixElement):
 
 @MendixMap("DomainModels$EnumerationAttributeType")
 class DomainModels_EnumerationAttributeType(MendixElement):
+    _prefetch_ = ("enumeration",)
+
     def __str__(self):
         # enumeration 是属性，返回枚举的全名
         return f"Enum({self.enumeration})"
@@ -280,6 +848,8 @@ class DomainModels_EnumerationAttributeType(MendixElement):
 
 @MendixMap("DomainModels$StringAttributeType")
 class DomainModels_StringAttributeType(MendixElement):
+    _prefetch_ = ("length",)
+
     def __str__(self):
         return f"String({self.length if self.length > 0 else 'Unlimited'})"
 
@@ -318,6 +888,8 @@ class DomainModels_LongAttributeType(MendixElement):
 # region 2.1 Microflows
 @MendixMap("Microflows$ActionActivity")
 class Microflows_ActionActivity(MendixElement):
+    _prefetch_ = ("action",)
+
     def get_summary(self):
         # Activity 代理其内部 Action 的摘要
         return self.action.get_summary()
@@ -325,6 +897,8 @@ class Microflows_ActionActivity(MendixElement):
 
 @MendixMap("Microflows$MicroflowCallAction")
 class Microflows_MicroflowCallAction(MendixElement):
+    _prefetch_ = ("microflow_call", "output_variable_name", "use_return_variable")
+
     def get_summary(self):
         call = self.microflow_call
         target = call.microflow if call else "Unknown"
@@ -343,6 +917,8 @@ class Microflows_MicroflowCallAction(MendixElement):
 
 @MendixMap("Microflows$RetrieveAction")
 class Microflows_RetrieveAction(MendixElement):
+    _prefetch_ = ("retrieve_source", "output_variable_name")
+
     def get_summary(self):
         src = self.retrieve_source
         entity = getattr(src, "entity", "Unknown")
@@ -351,8 +927,15 @@ class Microflows_RetrieveAction(MendixElement):
         return f"🔍 Retrieve: {entity}{xpath_str} -> ${self.output_variable_name}"
 
 
+@MendixMap("Microflows$DatabaseRetrieveSource")
+class Microflows_DatabaseRetrieveSource(MendixElement):
+    _prefetch_ = ("entity", "x_path_constraint")
+
+
 @MendixMap("Microflows$CreateVariableAction")
 class Microflows_CreateVariableAction(MendixElement):
+    _prefetch_ = ("variable_name", "variable_type", "initial_value")
+
     def get_summary(self):
         value_format = self.initial_value.replace("\n", "\\n")
         return (
@@ -362,12 +945,16 @@ class Microflows_CreateVariableAction(MendixElement):
 
 @MendixMap("Microflows$ChangeVariableAction")
 class Microflows_ChangeVariableAction(MendixElement):
+    _prefetch_ = ("variable_name", "value")
+
     def get_summary(self):
         return f"📝 Change: ${self.variable_name} = {self.value}"
 
 
 @MendixMap("Microflows$ExclusiveSplit")
 class Microflows_ExclusiveSplit(MendixElement):
+    _prefetch_ = ("split_condition", "caption")
+
     def get_summary(self):
         expr = self.split_condition.expression
         caption = f" [{self.caption}]" if self.caption and self.caption != expr else ""
@@ -376,6 +963,8 @@ class Microflows_ExclusiveSplit(MendixElement):
 
 @MendixMap("Microflows$EndEvent")
 class Microflows_EndEvent(MendixElement):
+    _prefetch_ = ("return_value",)
+
     def get_summary(self):
         ret = f" (Return: {self.return_value})" if self.return_value else ""
         return f"🛑 End{ret}"
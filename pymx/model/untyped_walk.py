@@ -0,0 +1,57 @@
+"""
+Traversal helpers for the raw Untyped Model.
+
+These helpers only rely on the duck-typed untyped API (GetUnits, GetProperties,
+ID.ToString(), Type, Name), so they work on live Studio Pro objects as well as
+on anything that mimics that surface.
+"""
+
+import re
+
+# Candidate qualified names inside free text (expressions, XPath constraints):
+# Module.Name, Module.Entity.Attribute, ...
+QNAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)+")
+
+
+def is_model_object(value) -> bool:
+    """True for untyped elements/units (anything exposing GetProperties)."""
+    return value is not None and not isinstance(value, (str, int, float, bool)) and hasattr(value, "GetProperties")
+
+
+def object_id(obj):
+    """Element/unit ID as string, or None for objects without an ID."""
+    try:
+        return obj.ID.ToString()
+    except AttributeError:
+        return None
+
+
+def iter_module_units(module):
+    """Yield every unit below a module (documents in nested folders included), each once."""
+    seen = set()
+    stack = [module]
+    while stack:
+        container = stack.pop()
+        try:
+            units = list(container.GetUnits())
+        except Exception:
+            continue
+        for unit in units:
+            unit_id = object_id(unit)
+            if unit_id in seen:
+                continue
+            seen.add(unit_id)
+            yield unit
+            if unit.Type == "Projects$Folder":
+                stack.append(unit)
+
+
+def unit_qualified_name(module_name: str, unit) -> str:
+    """Module-qualified name of a unit; unnamed units (DomainModel, ...) use their type name."""
+    try:
+        name = unit.Name
+    except AttributeError:
+        name = None
+    if not name:
+        name = unit.Type.split("$")[-1]
+    return f"{module_name}.{name}"
@@ -1,23 +1,86 @@
+from typing import NamedTuple
+
+from pymx.model import generations
+
+
+class Document(NamedTuple):
+    """事务修改的文档 (或模块本身)：全名 "Module.Doc" 或路径 "Module/Folder/Doc"，仅模块名时指模块 Unit"""
+    name: str
+
+
+class DomainModel(NamedTuple):
+    """事务修改的模块领域模型 (实体、关联所在的 Unit)"""
+    module: str
+
+
 class TransactionManager:
-    """with TransactionManager(current_app, f"your transaction name"):"""
+    """with TransactionManager(current_app, f"your transaction name"):
 
-    def __init__(self, app, transaction_name):
+    提交成功后递增模型代数 (pymx.model.generations)，使各级缓存失效。
+    units 为本事务修改的 Unit 列表，可在事务内逐步追加：untyped Unit、Unit ID、
+    Document(全名) 或 DomainModel(模块名)；提交后解析为 Unit ID，只使这些 Unit 的缓存失效。
+    未指定 (None) 或无法解析时视为全部 Unit 可能变更；提交时列表为空表示未写入任何内容，不递增代数。
+    read_only=True 用于只读操作 (如 Create 辅助对象做类型转换)：结束时回滚，不递增代数。
+    """
+
+    def __init__(self, app, transaction_name, units=None, read_only=False):
         self.app = app
         self.name = transaction_name
         self.transaction = None
+        self.units = units
+        self.read_only = read_only
 
     def __enter__(self):
         self.transaction = self.app.StartTransaction(self.name)
         return self.transaction
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if exc_type is None:
+        if exc_type is None and not self.read_only:
             self.transaction.Commit()
+            if self.units is None or len(self.units) > 0:
+                generations.bump(self._touched_unit_ids())
         else:
             self.transaction.Rollback()
         self.transaction.Dispose()
         return False  # 允许异常继续传播
 
+    def _touched_unit_ids(self):
+        """Document / DomainModel 解析为 untyped Unit ID；任一无法解析时返回 None (全部失效)"""
+        if self.units is None:
+            return None
+        try:
+            return _resolve_units(self.app, self.units)
+        except Exception:
+            return None
+
+
+def _resolve_units(app, units):
+    from pymx.mcp import mendix_context as ctx
+    from pymx.model import module_tree
+    modules = None
+    resolved = []
+    for unit in units:
+        if not isinstance(unit, (Document, DomainModel)):
+            resolved.append(unit)
+            continue
+        if modules is None:
+            root = ctx.untypedModelAccessService.GetUntypedModel(app)
+            modules = {m.Name: m for m in root.GetUnitsOfType("Projects$Module")}
+        if isinstance(unit, DomainModel):
+            module = modules.get(unit.module)
+            found = list(module.GetUnitsOfType("DomainModels$DomainModel")) if module is not None else []
+        else:
+            parts = [part for part in unit.name.replace("/", ".").split(".") if part]
+            module = modules.get(parts[0]) if parts else None
+            if module is not None and len(parts) == 1:
+                found = [module]
+            else:
+                found = module_tree.build_module_tree(module).find(parts[-1]) if module is not None else []
+        if not found:
+            return None
+        resolved.extend(found)
+    return resolved
+
 
 def callAsType(model, obj, type, methodName, params=None):
     """
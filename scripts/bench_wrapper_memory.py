@@ -0,0 +1,112 @@
+import asyncio
+import httpx
+import json
+from typing import Optional
+from pathlib import Path
+
+# Base URL for the MCP server
+MCP_BASE_URL = "http://127.0.0.1:8008/a/mcp"  # Default Mendix port is 8008
+CODE_FILE_PATH = Path(__file__).parent / "bench_wrapper_memory_code.py"
+# A full-app walk on a large model can take minutes
+TIMEOUT_SECONDS = 600.0
+
+
+async def initialize_mcp_session() -> Optional[str]:
+    """Initializes a session with the MCP server and returns the session ID."""
+    headers = {
+        "accept": "application/json, text/event-stream",
+        "content-type": "application/json",
+    }
+
+    init_payload = {
+        "jsonrpc": "2.0",
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "python-bench-client", "version": "1.0.0"},
+        },
+        "id": 1,
+    }
+
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(
+                MCP_BASE_URL, headers=headers, json=init_payload
+            )
+            response.raise_for_status()
+
+            session_id = response.headers.get("mcp-session-id")
+            if not session_id:
+                print("Error: Did not receive session ID from MCP server.")
+                return None
+
+            headers["Mcp-Session-Id"] = session_id
+            init_complete_payload = {
+                "jsonrpc": "2.0",
+                "method": "notifications/initialized",
+            }
+            await client.post(MCP_BASE_URL, headers=headers, json=init_complete_payload)
+            return session_id
+
+    except httpx.HTTPError as e:
+        print(f"HTTP error during initialization: {e}")
+        return None
+
+
+async def run_benchmark(session_id: str):
+    """Sends the benchmark payload to the execute_python tool and prints the report."""
+    headers = {
+        "accept": "application/json, text/event-stream",
+        "content-type": "application/json",
+        "Mcp-Session-Id": session_id,
+    }
+
+    python_code = CODE_FILE_PATH.read_text(encoding="utf-8")
+    payload = {
+        "jsonrpc": "2.0",
+        "method": "tools/call",
+        "params": {
+            "name": "execute_python",
+            "arguments": {"code": python_code},
+        },
+        "id": 2,
+    }
+
+    async with httpx.AsyncClient(timeout=TIMEOUT_SECONDS) as client:
+        response = await client.post(MCP_BASE_URL, headers=headers, json=payload)
+        response.raise_for_status()
+
+    data_line = next(
+        (line for line in response.text.splitlines() if line.startswith("data: ")),
+        None,
+    )
+    if not data_line:
+        print(f"Raw response: {response.text}")
+        return
+
+    data = json.loads(data_line[len("data: "):])
+    content = data.get("result", {}).get("content", [])
+    text = content[0]["text"] if content else json.dumps(data, indent=2)
+    print("--- Wrapper memory benchmark ---")
+    print(text)
+
+
+async def main():
+    print(f"Running wrapper memory benchmark on {MCP_BASE_URL}")
+
+    session_id = await initialize_mcp_session()
+    if not session_id:
+        print("Failed to initialize MCP session. Exiting.")
+        return
+
+    await run_benchmark(session_id)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except httpx.ConnectError:
+        print(
+            f"Error: Could not connect to MCP server at {MCP_BASE_URL}. Please ensure it is running."
+        )
@@ -0,0 +1,112 @@
+# This script is for the execute_python tool in Mendix Studio Pro.
+# It is sent by bench_wrapper_memory.py; you can also paste it into the tool directly.
+
+def bench_wrapper_memory():
+    """
+    Walks every unit of the app through the untyped model wrapper and reports
+    the memory footprint of the wrapped elements (bytes per element) together
+    with the peak RSS of the Studio Pro process.
+    """
+    import gc
+    import json
+    import sys
+    import time
+    import tracemalloc
+
+    from pymx.mcp import mendix_context as ctx
+    from pymx.model import untyped_model_wrapper as w
+
+    def peak_rss_bytes():
+        # Windows (Studio Pro): PeakWorkingSetSize via psapi
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+        except Exception:
+            pass
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return None
+
+    root = ctx.untypedModelAccessService.GetUntypedModel(ctx.CurrentApp)
+    context = w.MendixContext(ctx.CurrentApp, root)
+
+    gc.collect()
+    tracemalloc.start()
+    start_traced, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+
+    # Full-app walk: every unit of every module, every property through the wrapper.
+    keep_alive = []
+    visited = set()
+    stack = []
+    for module in root.GetUnitsOfType("Projects$Module"):
+        stack.append(w.ElementFactory.create(module, context))
+        for unit in module.GetUnits():
+            stack.append(w.ElementFactory.create(unit, context))
+
+    while stack:
+        elem = stack.pop()
+        if not isinstance(elem, w.MendixElement) or not elem.is_valid:
+            continue
+        if elem.id in visited:
+            continue
+        visited.add(elem.id)
+        keep_alive.append(elem)
+        try:
+            props = list(elem._raw.GetProperties())
+        except Exception:
+            continue
+        for prop in props:
+            try:
+                value = getattr(elem, prop.Name)
+            except Exception:
+                continue
+            if isinstance(value, w.MendixElement):
+                stack.append(value)
+            elif isinstance(value, (list, w.LazyElementList)):
+                stack.extend(v for v in value if isinstance(v, w.MendixElement))
+
+    elapsed = time.perf_counter() - started
+    traced, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(keep_alive)
+    shallow = sum(sys.getsizeof(e) for e in keep_alive)
+    caches = sum(sys.getsizeof(e._cache) for e in keep_alive if e._cache is not None)
+    report = {
+        "wrapped_elements": count,
+        "walk_seconds": round(elapsed, 3),
+        "bytes_per_element_shallow": round(shallow / count, 1) if count else 0,
+        "bytes_per_element_with_cache": round((shallow + caches) / count, 1) if count else 0,
+        "bytes_per_element_traced": round((traced - start_traced) / count, 1) if count else 0,
+        "traced_peak_bytes": traced_peak,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "identity_map": context.identity_stats(),
+        "has_instance_dict": any(hasattr(e, "__dict__") for e in keep_alive[:100]),
+    }
+    return json.dumps(report, indent=2)
+
+
+result = bench_wrapper_memory()
@@ -0,0 +1,113 @@
+"""
+Duck-typed stand-in for the Mendix untyped model (Extensions API), enough for
+pymx code that only calls GetProperty / GetProperties / GetUnits /
+GetUnitsOfType and reads ID, Type, Name and Container.
+"""
+
+import itertools
+
+_ids = itertools.count(1)
+
+
+class FakeId:
+    def __init__(self, value: str):
+        self.value = value
+
+    def ToString(self):
+        return self.value
+
+
+class FakeProperty:
+    def __init__(self, name, value):
+        self.Name = name
+        self._value = value
+        self.IsList = isinstance(value, list)
+
+    @property
+    def Value(self):
+        return None if self.IsList else self._value
+
+    def GetValues(self):
+        return list(self._value)
+
+
+class FakeElement:
+    """An element or unit. Keyword arguments become properties; `name` also sets Name."""
+
+    def __init__(self, type_name, **properties):
+        self.Type = type_name
+        self.ID = FakeId(f"id-{next(_ids)}")
+        self.Name = properties.get("name")
+        self.Container = None
+        self._properties = {key: FakeProperty(key, value) for key, value in properties.items()}
+        self._units = []
+
+    def set(self, name, value):
+        self._properties[name] = FakeProperty(name, value)
+
+    def add_unit(self, unit):
+        unit.Container = self
+        self._units.append(unit)
+        return unit
+
+    def GetProperty(self, name):
+        return self._properties.get(name)
+
+    def GetProperties(self):
+        return list(self._properties.values())
+
+    def GetUnits(self):
+        return list(self._units)
+
+    def GetUnitsOfType(self, type_name):
+        """Units of the type anywhere below this one (nested folders included), like the untyped model."""
+        found, stack = [], list(self._units)
+        while stack:
+            unit = stack.pop(0)
+            if unit.Type == type_name:
+                found.append(unit)
+            stack.extend(unit._units)
+        return found
+
+
+class FakeRoot(FakeElement):
+    def __init__(self):
+        super().__init__("Projects$Project")
+
+
+def build_app():
+    """Module Sales: a domain model (Customer <- Order), folder Flows with ACT_Save, a page and ACT_Caller."""
+    root = FakeRoot()
+    sales = root.add_unit(FakeElement("Projects$Module", name="Sales"))
+
+    customer = FakeElement(
+        "DomainModels$Entity", name="Customer",
+        attributes=[FakeElement("DomainModels$Attribute", name="Name")],
+        generalization=FakeElement("DomainModels$NoGeneralization", persistable=True))
+    order = FakeElement(
+        "DomainModels$Entity", name="Order", attributes=[],
+        generalization=FakeElement("DomainModels$Generalization", generalization="Sales.Customer"))
+    association = FakeElement("DomainModels$Association", name="Order_Customer", parent=order, child=customer)
+    domain_model = sales.add_unit(FakeElement(
+        "DomainModels$DomainModel", entities=[customer, order], associations=[association], crossAssociations=[]))
+
+    flows = sales.add_unit(FakeElement("Projects$Folder", name="Flows"))
+    save = flows.add_unit(FakeElement(
+        "Microflows$Microflow", name="ACT_Save",
+        objectCollection=FakeElement("Microflows$MicroflowObjectCollection", objects=[])))
+    sales.add_unit(FakeElement("Pages$Page", name="Home"))
+
+    call = FakeElement("Microflows$MicroflowCallAction", microflowCall=FakeElement(
+        "Microflows$MicroflowCall", microflow="Sales.ACT_Save"))
+    retrieve = FakeElement("Microflows$RetrieveAction", retrieveSource=FakeElement(
+        "Microflows$DatabaseRetrieveSource", entity="Sales.Order", xPathConstraint=""))
+    caller = sales.add_unit(FakeElement(
+        "Microflows$Microflow", name="ACT_Caller",
+        objectCollection=FakeElement("Microflows$MicroflowObjectCollection", objects=[
+            FakeElement("Microflows$ActionActivity", action=call),
+            FakeElement("Microflows$ActionActivity", action=retrieve),
+        ])))
+    return {
+        "root": root, "module": sales, "domain_model": domain_model, "folder": flows,
+        "save": save, "caller": caller, "customer": customer, "order": order,
+    }
@@ -0,0 +1,56 @@
+import pytest
+
+from pymx.model import dsl, dsl_records, snapshot
+from pymx.model.dto import type_dsl
+
+from fake_model import FakeElement, build_app
+
+
+def test_type_string_memo_covers_nested_types():
+    concrete = FakeElement("CodeActions$ConcreteEntityType", entity="Sales.Order")
+    parameter_type = FakeElement("JavaActions$EntityJavaActionParameterType", type=concrete)
+    memo = {}
+
+    assert dsl._get_type_as_string(parameter_type, memo) == "Object(Sales.Order)"
+    assert memo == {parameter_type.ID.ToString(): "Object(Sales.Order)",
+                    concrete.ID.ToString(): "Object(Sales.Order)"}
+
+    other_parameter = FakeElement("JavaActions$EntityJavaActionParameterType", type=concrete)
+    concrete.set("entity", "Sales.Changed")  # resolved from the memo: not read again
+    assert dsl._get_type_as_string(other_parameter, memo) == "Object(Sales.Order)"
+
+
+def test_type_string_without_memo():
+    assert dsl._get_type_as_string(None) == "Void"
+    assert dsl._get_type_as_string(FakeElement("DataTypes$StringType")) == "String"
+    assert dsl._get_type_as_string(FakeElement("CodeActions$ListType", entity="Sales.Order")) == "List(Sales.Order)"
+
+
+def test_msgpack_encoder_names_the_extra(monkeypatch):
+    monkeypatch.setattr(dsl_records, "msgpack", None)
+    with pytest.raises(RuntimeError, match=r"pymx\[msgpack\]"):
+        dsl_records.encoder(dsl_records.MSGPACK)
+    assert dsl_records.encoder(dsl_records.JSONL)({"a": 1}) == '{"a":1}'
+
+
+def _domain_input(output_format):
+    return type_dsl.DomainModelDSLInput(ModuleName="Sales",
+                                        FormatOptions=type_dsl.DSLFormatOptions(OutputFormat=output_format))
+
+
+def test_msgpack_without_package_returns_error_result(monkeypatch):
+    monkeypatch.setattr(dsl_records, "msgpack", None)
+    snap = snapshot.build_snapshot(build_app()["root"], "fp")
+    data = _domain_input(dsl_records.MSGPACK)
+
+    result = dsl.generate_domain_model_dsl(None, data, snap)
+    assert result.startswith("Error: OutputFormat 'msgpack' requires")
+
+    lines = list(dsl.iter_domain_model_dsl(None, data, snap))  # direct consumers get a text error line
+    assert len(lines) == 1 and "pymx[msgpack]" in lines[0]
+
+
+def test_jsonl_domain_model_records():
+    snap = snapshot.build_snapshot(build_app()["root"], "fp")
+    result = dsl.generate_domain_model_dsl(None, _domain_input(dsl_records.JSONL), snap)
+    assert '"kind":"entity"' in result
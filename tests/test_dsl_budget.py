@@ -0,0 +1,64 @@
+import pytest
+
+from pymx.model import dsl, dsl_budget
+from pymx.model.dto import type_dsl
+from pymx.model.untyped_model_wrapper import MendixContext
+
+from fake_model import build_app
+
+_CURSOR = "continue with Cursor="
+
+
+def _next_cursor(lines):
+    marker = lines[-1] if lines else ""
+    if _CURSOR not in marker:
+        return None
+    return dsl_budget.parse_cursor(marker.split(_CURSOR, 1)[1].strip('")'))
+
+
+def test_bounded_emits_first_line_of_page_below_marker_reserve():
+    lines = ["line a", "line b", "line c"]
+    page = list(dsl_budget.bounded(iter(lines), dsl_budget.Budget(10), "names", 0))
+    assert page[0] == "line a"
+    assert _next_cursor(page) == dsl_budget.Cursor("names", 1)
+
+
+def test_following_cursors_terminates_on_tiny_budget():
+    lines = [f"line {i}" for i in range(5)]
+    start, seen = 0, []
+    for _ in range(len(lines) + 1):
+        page = list(dsl_budget.bounded(iter(lines), dsl_budget.Budget(1), "names", start))
+        cursor = _next_cursor(page)
+        seen += page[:-1] if cursor else page
+        if cursor is None:
+            break
+        assert cursor.offset > start
+        start = cursor.offset
+    assert seen == lines
+
+
+@pytest.fixture
+def analyzer():
+    app = build_app()
+    context = MendixContext(None, app["root"], track_generations=False)
+    return dsl.DomainModelAnalyzer(None, app["module"], type_dsl.DSLFormatOptions(), context)
+
+
+def test_domain_model_header_respects_budget(analyzer):
+    page = list(analyzer.iter_lines(budget=dsl_budget.Budget(60)))
+    assert not any(line.startswith("# Domain Model DSL") for line in page)
+    assert page[0].startswith("## Entity: Customer")
+    assert _next_cursor(page) == dsl_budget.Cursor("standard", 1)
+
+
+def test_domain_model_pages_advance_on_tiny_budget(analyzer):
+    start, pages = 0, 0
+    while True:
+        page = list(analyzer.iter_lines(budget=dsl_budget.Budget(1), start=start))
+        pages += 1
+        cursor = _next_cursor(page)
+        if cursor is None:
+            break
+        assert cursor.offset > start
+        start = cursor.offset
+    assert pages == 3  # two entities, one association
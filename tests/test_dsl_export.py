@@ -0,0 +1,48 @@
+from pymx.model import dsl_export, snapshot, snapshot_file
+
+from fake_model import build_app
+
+# pythonnet present, but the Mendix assemblies are not: AddReference fails with a non-ImportError
+_STUB_CLR = "def AddReference(name):\n    raise RuntimeError(f'Unable to find assembly {name!r}')\n"
+_STUB_SYSTEM = "Exception = Exception\n"
+
+
+def test_spawned_workers_import_without_mendix_assemblies(tmp_path, monkeypatch):
+    stubs = tmp_path / "stubs"
+    stubs.mkdir()
+    (stubs / "clr.py").write_text(_STUB_CLR)
+    (stubs / "System.py").write_text(_STUB_SYSTEM)
+    monkeypatch.syspath_prepend(str(stubs))  # spawned workers inherit sys.path
+
+    snap = snapshot.build_snapshot(build_app()["root"], "fp-test")
+    path = snapshot_file.write_snapshot(snap, tmp_path / "model.snap")
+    output_dir = tmp_path / "out"
+    options = dsl_export.type_dsl.DSLFormatOptions()
+
+    entries = dsl_export._render_parallel(path, "fp-test", {"Sales": None}, output_dir,
+                                          dsl_export.ALL_KINDS, options, workers=1)
+
+    assert [entry["module"] for entry in entries] == ["Sales"]
+    assert entries[0]["errors"] == []
+    assert "Sales/microflow/Sales.ACT_Save.mfmicroflow.txt" in entries[0]["files"]
+    assert (output_dir / "Sales" / "domain" / "Sales.mxdomain.txt").is_file()
+
+
+def test_export_serial_and_incremental(tmp_path):
+    snap = snapshot.build_snapshot(build_app()["root"], "fp-test")
+    output_dir = tmp_path / "out"
+
+    first = dsl_export.export_app_dsl(snap, output_dir, workers=1)
+    second = dsl_export.export_app_dsl(snap, output_dir, workers=1, incremental=True)
+
+    assert first["added"] == first["documents"] > 0
+    assert second["incremental"] is True
+    assert second["documents"] == 0
+
+
+def test_renderer_stamp_covers_renderer_dependencies():
+    names = {path.name for path in dsl_export._renderer_sources()}
+    for module in ("dsl.py", "dsl_export.py", "microflow_cfg.py", "module_tree.py", "dsl_budget.py",
+                   "dsl_records.py", "domain_graph.py", "generalization_index.py", "untyped_model_wrapper.py",
+                   "type_dsl.py"):
+        assert module in names
@@ -0,0 +1,68 @@
+import pytest
+
+from pymx.mcp import mendix_context as ctx
+from pymx.model import generations, snapshot_file
+
+from fake_model import build_app
+
+
+class _Root:
+    def __init__(self, directory):
+        self.DirectoryPath = str(directory)
+
+
+class _App:
+    def __init__(self, directory):
+        self.Root = _Root(directory)
+
+
+class _ModelAccess:
+    def __init__(self, root):
+        self.root = root
+        self.calls = 0
+
+    def GetUntypedModel(self, app):
+        self.calls += 1
+        return self.root
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "App.mpr").write_bytes(b"mpr")
+    access = _ModelAccess(build_app()["root"])
+    monkeypatch.setattr(ctx, "CurrentApp", _App(tmp_path))
+    monkeypatch.setattr(ctx, "untypedModelAccessService", access)
+    monkeypatch.setattr(ctx, "_model_snapshot", None)
+    monkeypatch.setattr(ctx, "_model_snapshot_generation", None)
+    yield access
+    if ctx._model_snapshot is not None:
+        ctx._model_snapshot.close()
+
+
+def test_snapshot_rebuilt_after_generation_moves(project, monkeypatch):
+    monkeypatch.setattr(generations, "_attached_events", ["ModelChanged"])
+    first = ctx.get_model_snapshot()
+
+    def no_disk_access(project_dir):
+        raise AssertionError("fingerprint computed although the model did not change")
+
+    with monkeypatch.context() as m:
+        m.setattr(snapshot_file, "model_fingerprint", no_disk_access)
+        assert ctx.get_model_snapshot() is first
+
+    generations.bump()
+    second = ctx.get_model_snapshot()
+    assert second is not first
+    assert second.fingerprint != first.fingerprint
+    assert project.calls == 2
+
+
+def test_snapshot_without_events_follows_disk_fingerprint(project, monkeypatch):
+    monkeypatch.setattr(generations, "_attached_events", [])
+    first = ctx.get_model_snapshot()
+    generations.bump()
+    assert ctx.get_model_snapshot() is first
+
+    project_dir = snapshot_file.project_directory(ctx.CurrentApp)
+    (project_dir / "App.mpr").write_bytes(b"mpr, saved")
+    assert ctx.get_model_snapshot() is not first
@@ -0,0 +1,100 @@
+from pymx.model import microflow_cfg
+
+from fake_model import FakeElement
+
+
+def _object(type_name, caption):
+    return FakeElement(f"Microflows${type_name}", caption=caption)
+
+
+def _flow(origin, destination, case=None, error=False):
+    if case is None:
+        case_value = FakeElement("Microflows$NoCase")
+    else:
+        case_value = FakeElement("Microflows$EnumerationCase", value=case)
+    return FakeElement("Microflows$SequenceFlow", origin=origin, destination=destination,
+                       caseValue=case_value, isErrorHandler=error)
+
+
+def _microflow(objects, flows):
+    return FakeElement("Microflows$Microflow", name="MF", flows=flows,
+                       objectCollection=FakeElement("Microflows$MicroflowObjectCollection", objects=objects))
+
+
+def _render(cfg):
+    return list(microflow_cfg.iter_structured(cfg, lambda node: node.raw.GetProperty("caption").Value))
+
+
+def _index(cfg, obj):
+    return cfg.node_by_id(obj.ID.ToString()).index
+
+
+def test_diamond():
+    start, split, a, b = _object("StartEvent", "start"), _object("ExclusiveSplit", "split"), \
+        _object("ActionActivity", "A"), _object("ActionActivity", "B")
+    merge, end = _object("ExclusiveMerge", "merge"), _object("EndEvent", "end")
+    cfg = microflow_cfg.build_microflow_cfg(_microflow(
+        [start, split, a, b, merge, end],
+        [_flow(start, split), _flow(split, a, "true"), _flow(split, b, "false"),
+         _flow(a, merge), _flow(b, merge), _flow(merge, end)]))
+
+    assert cfg.merge_point(_index(cfg, split)) == _index(cfg, merge)
+    assert cfg.idom[_index(cfg, merge)] == _index(cfg, split)
+    assert not cfg.back_edges
+    assert _render(cfg) == ["start", "split", "if true:", "  A", "else:", "  B", "end if", "end"]
+
+
+def test_loop_through_merge():
+    start, merge, a = _object("StartEvent", "start"), _object("ExclusiveMerge", "merge"), \
+        _object("ActionActivity", "A")
+    split, end = _object("ExclusiveSplit", "split"), _object("EndEvent", "end")
+    cfg = microflow_cfg.build_microflow_cfg(_microflow(
+        [start, merge, a, split, end],
+        [_flow(start, merge), _flow(merge, a), _flow(a, split), _flow(split, merge, "true"),
+         _flow(split, end, "false")]))
+
+    assert [(e.source, e.target) for e in cfg.back_edges] == [(_index(cfg, split), _index(cfg, merge))]
+    assert _render(cfg) == ["start", "#1 Merge", "A", "split", "if true:", "  goto #1", "end if", "end"]
+
+
+def test_error_handler():
+    start, a, end = _object("StartEvent", "start"), _object("ActionActivity", "A"), _object("EndEvent", "end1")
+    log, error_end = _object("ActionActivity", "log"), _object("EndEvent", "end2")
+    cfg = microflow_cfg.build_microflow_cfg(_microflow(
+        [start, a, end, log, error_end],
+        [_flow(start, a), _flow(a, end), _flow(a, log, error=True), _flow(log, error_end)]))
+
+    error_edges = [e for e in cfg.out_edges[_index(cfg, a)] if e.is_error]
+    assert [(e.target, e.case) for e in error_edges] == [(_index(cfg, log), microflow_cfg.ERROR_CASE)]
+    assert _render(cfg) == ["start", "A", "on error:", "  log", "  end2", "end on error", "end1"]
+
+
+def test_split_with_two_ends():
+    start, split = _object("StartEvent", "start"), _object("ExclusiveSplit", "split")
+    end_true, end_false = _object("EndEvent", "end1"), _object("EndEvent", "end2")
+    cfg = microflow_cfg.build_microflow_cfg(_microflow(
+        [start, split, end_true, end_false],
+        [_flow(start, split), _flow(split, end_true, "true"), _flow(split, end_false, "false")]))
+
+    assert cfg.merge_point(_index(cfg, split)) is None
+    assert _render(cfg) == ["start", "split", "if true:", "  end1", "else:", "  end2", "end if"]
+
+
+def test_goto_into_other_branch_and_unreachable_objects():
+    start, split1, a = _object("StartEvent", "start"), _object("ExclusiveSplit", "split1"), \
+        _object("ActionActivity", "A")
+    end1, split2, end2 = _object("EndEvent", "end1"), _object("ExclusiveSplit", "split2"), _object("EndEvent", "end2")
+    orphan = _object("ActionActivity", "orphan")
+    cfg = microflow_cfg.build_microflow_cfg(_microflow(
+        [start, split1, a, end1, split2, end2, orphan],
+        [_flow(start, split1), _flow(split1, a, "true"), _flow(a, end1), _flow(split1, split2, "false"),
+         _flow(split2, a, "true"), _flow(split2, end2, "false")]))
+
+    assert cfg.idom[_index(cfg, orphan)] == microflow_cfg.NO_NODE
+    assert _render(cfg) == [
+        "start", "split1",
+        "if true:", "  A", "  end1",
+        "else:", "  split2", "  if true:", "    goto: A", "  else:", "    end2", "  end if",
+        "end if",
+        "(1 unreachable object)",
+    ]
@@ -0,0 +1,44 @@
+import pytest
+
+from pymx.model import query
+from pymx.model.untyped_model_wrapper import MendixContext
+
+from fake_model import build_app
+
+
+@pytest.fixture
+def app():
+    return build_app()
+
+
+@pytest.fixture
+def context(app):
+    return MendixContext(None, app["root"], track_generations=False)
+
+
+def test_refs_matches_ancestor_of_referencing_element(app, context):
+    page = context.query("Microflow > MicroflowObjectCollection ActionActivity:refs(Sales.ACT_Save)")
+
+    assert page.total == 1
+    match = page.matches[0]
+    assert match.unit == "Sales.ACT_Caller"
+    assert match.type == "Microflows$ActionActivity"
+    call_activity = app["caller"].GetProperty("objectCollection").Value.GetProperty("objects").GetValues()[0]
+    assert match.id == call_activity.ID.ToString()
+
+
+def test_refs_matches_the_referencing_element_itself(context):
+    page = context.query("MicroflowCall:refs(Sales.ACT_Save)")
+    assert [m.type for m in page.matches] == ["Microflows$MicroflowCall"]
+
+
+def test_refs_excludes_elements_without_reference_below(context):
+    page = context.query("ActionActivity:refs(Sales.ACT_Save)")
+    assert page.total == 1  # the retrieve activity does not reference ACT_Save
+
+    assert context.query("ActionActivity:refs(Sales.Missing)").total == 0
+
+
+def test_parse_rejects_unknown_pseudo_class():
+    with pytest.raises(query.QuerySyntaxError):
+        query.parse_selector("ActionActivity:calls(Sales.ACT_Save)")
@@ -0,0 +1,104 @@
+import pytest
+
+from pymx.model import snapshot, snapshot_file
+
+from fake_model import FakeElement, build_app
+
+
+@pytest.fixture
+def app():
+    return build_app()
+
+
+def _by_name(snap, name):
+    return next(record for record in snap.nodes() if record.name == name)
+
+
+def test_build_snapshot_mirrors_units_and_elements(app):
+    snap = snapshot.build_snapshot(app["root"], "fp")
+
+    assert snap.fingerprint == "fp"
+    assert [snap.node(i).name for i in snap.modules] == ["Sales"]
+    module = snap.root.GetUnitsOfType("Projects$Module")[0]
+    assert module.ID.ToString() == app["module"].ID.ToString()
+    assert sorted(u.Name for u in module.GetUnitsOfType("Microflows$Microflow")) == ["ACT_Caller", "ACT_Save"]
+
+    save = snap.find_by_id(app["save"].ID.ToString())
+    assert save.Container.Name == "Flows"
+    assert save.Container.Container.Name == "Sales"
+
+    customer = snap.find_by_id(app["customer"].ID.ToString())
+    assert customer.GetProperty("generalization").Value.GetProperty("persistable").Value is True
+    association = snap.find_by_id(app["domain_model"].GetProperty("associations").GetValues()[0].ID.ToString())
+    assert association.GetProperty("parent").Value == snap.find_by_id(app["order"].ID.ToString())
+
+
+def test_unit_hashes_stable_across_builds(app):
+    first = snapshot.build_snapshot(app["root"]).unit_hashes()
+    second = snapshot.build_snapshot(app["root"]).unit_hashes()
+    assert first == second
+
+
+def test_unit_hashes_change_only_for_edited_unit(app):
+    before = snapshot.build_snapshot(app["root"])
+    app["customer"].set("documentation", "changed")
+    after = snapshot.build_snapshot(app["root"])
+
+    def hashes(snap):
+        return {snap.node(index).id: digest for index, digest in snap.unit_hashes().items()}
+
+    old, new = hashes(before), hashes(after)
+    changed = {unit_id for unit_id in old if old[unit_id] != new[unit_id]}
+    assert changed == {app["domain_model"].ID.ToString()}
+
+
+def test_unit_hash_ignores_container(app):
+    before = snapshot.build_snapshot(app["root"])
+    app["folder"]._units.remove(app["save"])
+    app["module"].add_unit(app["save"])
+    after = snapshot.build_snapshot(app["root"])
+
+    save_id = app["save"].ID.ToString()
+    digest = {snap: next(d for i, d in snap.unit_hashes().items() if snap.node(i).id == save_id)
+              for snap in (before, after)}
+    assert digest[before] == digest[after]
+
+
+def test_snapshot_file_round_trip(app, tmp_path):
+    app["save"].set("documentation", "Ünïcode ✓")
+    app["save"].set("returnCount", 2 ** 40)
+    app["save"].set("tags", ["a", "b"])
+    built = snapshot.build_snapshot(app["root"], "fp-round-trip")
+    path = snapshot_file.write_snapshot(built, tmp_path / "model.snap")
+
+    loaded = snapshot_file.load_snapshot(path, "fp-round-trip")
+    try:
+        assert loaded.fingerprint == built.fingerprint
+        assert loaded.modules == built.modules
+        assert [loaded.node(i) for i in range(len(loaded))] == [built.node(i) for i in range(len(built))]
+        assert loaded.unit_hashes() == built.unit_hashes()
+
+        save = loaded.find_by_id(app["save"].ID.ToString())
+        assert save.GetProperty("documentation").Value == "Ünïcode ✓"
+        assert save.GetProperty("returnCount").Value == 2 ** 40
+        assert save.GetProperty("tags").GetValues() == ["a", "b"]
+    finally:
+        loaded.close()
+
+
+def test_load_snapshot_rejects_other_fingerprint(app, tmp_path):
+    path = snapshot_file.write_snapshot(snapshot.build_snapshot(app["root"], "fp-a"), tmp_path / "model.snap")
+    with pytest.raises(snapshot_file.SnapshotFormatError):
+        snapshot_file.load_snapshot(path, "fp-b")
+
+
+def test_get_or_build_snapshot_reuses_file(app, tmp_path):
+    first = snapshot_file.get_or_build_snapshot(tmp_path, app["root"], fingerprint="fp")
+    first.close()
+    app["module"].add_unit(FakeElement("Pages$Page", name="Added"))  # not seen: same fingerprint
+    second = snapshot_file.get_or_build_snapshot(tmp_path, app["root"], fingerprint="fp")
+    try:
+        assert len(second) == len(first)
+        assert _by_name(second, "ACT_Save").type == "Microflows$Microflow"
+    finally:
+        second.close()
@@ -0,0 +1,58 @@
+import pytest
+
+from pymx.model import generations
+from pymx.model.untyped_model_wrapper import ElementFactory, MendixContext
+
+from fake_model import build_app
+
+
+@pytest.fixture
+def app():
+    return build_app()
+
+
+@pytest.fixture
+def context(app):
+    return MendixContext(None, app["root"])
+
+
+def test_type_cache_cleared_on_model_change(app, context):
+    ElementFactory.create(app["save"], context)
+    assert app["save"].ID.ToString() in context._type_cache
+
+    generations.bump()
+    context._sync_generation()
+    assert context._type_cache == {}
+
+
+def test_get_unit_by_module_folder_and_plain_name(app, context):
+    assert context.get_unit("Sales") is app["module"]
+    assert context.get_unit("Sales.ACT_Save") is app["save"]
+    assert context.get_unit("sales.flows.act_save", "Microflows$Microflow") is app["save"]
+    assert context.get_unit("Sales.ACT_Save", "Pages$Page") is None
+
+
+def test_get_unit_misses_rebuild_once_per_generation(context, monkeypatch):
+    builds = []
+    build = context._build_unit_index
+    monkeypatch.setattr(context, "_build_unit_index", lambda: builds.append(1) or build())
+
+    assert context.get_unit("Sales.Missing") is None
+    assert context.get_unit("Sales.Missing") is None
+    assert context.get_unit("Sales.Other") is None
+    assert len(builds) == 2  # initial build + one refresh
+
+    generations.bump()
+    assert context.get_unit("Sales.Missing") is None
+    assert len(builds) == 4
+
+
+def test_get_unit_rejects_unit_moved_to_another_module(app, context):
+    assert context.get_unit("Sales.Flows.ACT_Save") is app["save"]
+
+    other = app["root"].add_unit(type(app["module"])("Projects$Module", name="Other"))
+    app["folder"]._units.remove(app["save"])
+    other.add_unit(app["save"])  # same name, different module: the index entry is stale
+
+    assert context.get_unit("Sales.Flows.ACT_Save") is None
+    assert context.get_unit("Other.ACT_Save") is app["save"]